@@ -1,11 +1,29 @@
 """
 Pacote principal do Simulador de Esfera com Subdivisão de Loop.
 Contém os módulos de núcleo, visualização e utilitários.
+Visualizador e métricas são carregados no primeiro acesso (o núcleo não depende do Matplotlib).
 """
 
+from importlib import import_module
+
 from .nucleo.malha import Malha
 from .nucleo.subdivisao_loop import SubdivisaoLoopEsfera
-from .visualizacao.renderizador import Visualizador
-from .utilitarios.metricas import obter_metricas_malha
 
 __version__ = "1.0.0"
+
+_PREGUICOSOS = {
+    "Visualizador": ".visualizacao.renderizador",
+    "obter_metricas_malha": ".utilitarios.metricas",
+}
+
+
+def __getattr__(nome):
+    if nome not in _PREGUICOSOS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(import_module(_PREGUICOSOS[nome], __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_PREGUICOSOS))
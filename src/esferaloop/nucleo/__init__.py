@@ -4,3 +4,9 @@ Módulo de Núcleo - Estruturas de dados e algoritmos principais (Malha e Subdiv
 
 from .malha import Malha
 from .subdivisao_loop import SubdivisaoLoopEsfera
+from .topologia import TopologiaMalha
+from .operador import OperadorSubdivisao, CacheOperadores
+from .icosfera import gerar_icosfera
+from .limite import projetar_no_limite, normais_no_limite, avaliar_limite
+from .adaptativo import subdividir_adaptativo
+from .instrumentacao import Instrumentacao
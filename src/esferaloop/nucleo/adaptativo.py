@@ -0,0 +1,163 @@
+import numpy as np # Importa NumPy para o refinamento adaptativo vetorizado
+from esferaloop.nucleo.malha import Malha # Estrutura de entrada e saída
+from esferaloop.nucleo import limite # Superfície limite de Loop (alvo quando não há normalização)
+#
+CRITERIOS = ("raio", "tela") # Medidas de erro aceitas
+_BASE_CHAVE = np.int64(1) << 32 # Chave de aresta: menor * 2^32 + maior
+
+def _chaves(a, b) -> np.ndarray: # Chave única de uma aresta não orientada
+    a, b = np.asarray(a, dtype=np.int64), np.asarray(b, dtype=np.int64) # Índices em 64 bits
+    return np.minimum(a, b) * _BASE_CHAVE + np.maximum(a, b) # Independe da ordem
+
+class _Registro: # Registro de nós pendurados: aresta dividida -> vértice do ponto médio
+    """Arrays ordenados de chaves de aresta e dos vértices de seus pontos médios (consulta por busca binária).""" # Docstring
+    def __init__(self): # Registro vazio
+        self.chaves = np.empty(0, dtype=np.int64) # Arestas já divididas
+        self.meios = np.empty(0, dtype=np.int64) # Ponto médio de cada uma
+
+    def contem(self, chaves) -> np.ndarray: # Quais arestas já foram divididas
+        return np.isin(chaves, self.chaves) # Pertinência vetorizada
+
+    def meio(self, chaves) -> np.ndarray: # Ponto médio de arestas já divididas
+        return self.meios[np.searchsorted(self.chaves, chaves)] # Busca binária
+
+    def inserir(self, chaves, meios): # Novas arestas divididas
+        todas = np.concatenate([self.chaves, chaves]) # Junta
+        ordem = np.argsort(todas) # Mantém ordenado
+        self.chaves, self.meios = todas[ordem], np.concatenate([self.meios, meios])[ordem] # Atualiza
+
+def subdividir_adaptativo(malha_base: Malha, tolerancia, criterio="raio", max_niveis=8, esfera=True, raio_alvo=1.0, camera=None): # Refinamento guiado pelo erro
+    """ # Início da docstring
+    Refina apenas as faces cujo erro passa da tolerância, com transições vermelho-verde (sem junções em T). # Objetivo principal
+    - Alvo: com 'esfera', todos os vértices são projetados na esfera de raio 'raio_alvo' (como normalizar_cada_passo); # Superfície alvo
+      sem, ficam na superfície limite de Loop da malha base ('projetar_no_limite' e 'avaliar_limite'), que só é avaliada # Alternativa
+      em malhas fechadas e sem vincos: bordas ou vincos com esfera=False geram ValueError antes de qualquer refinamento. # Limitação
+    - Erro 'raio': desvio do centroide de cada face em relação ao alvo (o mesmo desvio de raio de 'obter_metricas_malha'). # Critério geométrico
+      Erro 'tela': maior aresta projetada em pixels pela 'camera' (um 'Rasterizador'). # Critério de tela
+    - Vermelho: faces marcadas viram 4 (mesma ordem de 'refinar_faces'); o fechamento 2:1 marca vizinhos mais grossos # Regras
+      e faces com 2 ou 3 arestas divididas. Verde: na saída, faces com uma aresta dividida viram 2 triângulos. # Transições
+    Retorna (malha, relatorio) com número de faces, erro máximo atingido e nível máximo usado. # Saída
+    """ # Fim da docstring
+    if criterio not in CRITERIOS: # Critério desconhecido
+        raise ValueError(f"Critério inválido: {criterio!r}. Use um de {CRITERIOS}.") # Erro explícito
+    if not esfera: # Alvo na superfície limite: as máscaras de 'limite' supõem vértices internos e suaves
+        if (malha_base.topologia.num_faces_aresta != 2).any() or len(malha_base.vincos): # Bordas, não-variedade ou vincos
+            raise ValueError("subdividir_adaptativo com esfera=False usa a superfície limite de Loop, avaliada apenas em malhas " # Erro explícito
+                             "fechadas, manifold e sem vincos; para malhas com bordas ou vincos use a subdivisão uniforme.") # Alternativa
+    if criterio == "tela" and camera is None: # Precisa de uma projeção
+        from esferaloop.visualizacao.rasterizador import Rasterizador # Importação local: só este critério usa a câmera
+        camera = Rasterizador() # Câmera padrão (1024 x 1024)
+
+    base_vertices = np.asarray(malha_base.vertices, dtype=np.float64) # Geometria de referência
+    base_faces = np.asarray(malha_base.faces, dtype=np.int64) # Cada face guarda a face base e as baricêntricas dos cantos
+
+    def alvo(face_base, baricentricas): # Ponto da superfície alvo
+        if esfera: # Projeção radial do ponto da face base
+            pontos = np.einsum('qj,qjd->qd', baricentricas, base_vertices[base_faces[face_base]]) # Ponto plano
+            return raio_alvo * pontos / np.linalg.norm(pontos, axis=1, keepdims=True) # Na esfera
+        return limite.avaliar_limite(malha_base, face_base, baricentricas)[0].astype(np.float64) # Na superfície limite
+
+    def erros(vertices, faces, face_base, baricentricas): # Erro geométrico e erro do critério de cada face
+        centroides = vertices[faces].mean(axis=1) # Centroide de cada face
+        if esfera: # Desvio de raio
+            geometrico = np.abs(np.linalg.norm(centroides, axis=1) - raio_alvo) # Mesmo desvio de 'obter_metricas_malha'
+        else: # Distância à superfície limite no mesmo parâmetro
+            geometrico = np.linalg.norm(centroides - alvo(face_base, baricentricas.mean(axis=1)), axis=1) # Erro de aproximação
+        if criterio == "raio": # Critério geométrico
+            return geometrico, geometrico # Mesma medida
+        tela, _ = camera.projetar(vertices[faces].reshape(-1, 3)) # Cantos em pixels
+        tela = tela.reshape(-1, 3, 2) # (F, 3, 2)
+        return geometrico, np.linalg.norm(tela - tela[:, [1, 2, 0]], axis=2).max(axis=1) # Maior aresta na tela
+
+    if esfera: # Vértices base na esfera alvo
+        vertices = raio_alvo * base_vertices / np.linalg.norm(base_vertices, axis=1, keepdims=True) # Projeção radial
+    else: # Vértices base na superfície limite
+        vertices = np.asarray(limite.projetar_no_limite(malha_base).vertices, dtype=np.float64) # Máscaras de limite
+    faces = base_faces.copy() # Faces vermelhas atuais
+    nivel = np.zeros(len(faces), dtype=np.int64) # Nível de cada face
+    face_base = np.arange(len(faces)) # Face base que contém cada face
+    baricentricas = np.broadcast_to(np.eye(3), (len(faces), 3, 3)).copy() # Cantos em coordenadas da face base
+    pai = np.full((len(vertices), 2), -1, dtype=np.int64) # Aresta de origem de cada ponto médio (-1 nos vértices base)
+    registro = _Registro() # Nós pendurados
+
+    while True: # Uma passada de refinamento por iteração
+        _, medida = erros(vertices, faces, face_base, baricentricas) # Erro de cada face
+        marcadas = (medida > tolerancia) & (nivel < max_niveis) # Faces que precisam ser refinadas
+        if not marcadas.any(): # Nada a refinar
+            break # Malha final
+
+        chaves = _chaves(faces, faces[:, [1, 2, 0]]) # (F, 3) arestas de cada face
+        _, inversa, contagem = np.unique(chaves, return_inverse=True, return_counts=True) # Arestas e multiplicidade
+        sem_gemea = (contagem[inversa.reshape(-1)] == 1).reshape(-1, 3) # Aresta sem face vizinha do mesmo tamanho
+        dividida = registro.contem(chaves) # Aresta já tem ponto médio (lado mais grosso)
+        ordem_chaves = np.argsort(chaves.reshape(-1)) # Aresta -> face, por busca binária
+        chaves_ordenadas = chaves.reshape(-1)[ordem_chaves] # Chaves ordenadas
+        while True: # Fechamento: repete até estabilizar
+            novas = marcadas.copy() # Marcas desta rodada
+            # 2:1 -- aresta de face marcada que é metade da aresta de uma face mais grossa
+            face, lado = np.nonzero(marcadas[:, np.newaxis] & sem_gemea & ~dividida) # Arestas de faces marcadas sem gêmea
+            a, b = faces[face, lado], faces[face, (lado + 1) % 3] # Extremidades
+            grossa = np.where((pai[b] == a[:, np.newaxis]).any(axis=1), _chaves(*pai[b].T), _chaves(*pai[a].T)) # Aresta mais grossa
+            posicao = np.minimum(np.searchsorted(chaves_ordenadas, grossa), len(chaves_ordenadas) - 1) # Face que a contém
+            novas[ordem_chaves[posicao[chaves_ordenadas[posicao] == grossa]] // 3] = True # Marca a vizinha grossa
+            # Vermelho-verde -- faces com 2 ou 3 arestas divididas também viram 4
+            divididas = dividida | np.isin(chaves, chaves[novas]) # Arestas divididas após esta passada
+            novas |= divididas.sum(axis=1) >= 2 # Mais de um nó pendurado
+            if (novas == marcadas).all(): # Estável
+                break # Fecho completo
+            marcadas = novas # Próxima rodada
+
+        # Pontos médios das arestas divididas nesta passada (cada aresta uma única vez)
+        ids = np.flatnonzero(marcadas) # Faces refinadas
+        chaves_marcadas = chaves[ids] # (R, 3)
+        novas_chaves, primeira = np.unique(chaves_marcadas.reshape(-1), return_index=True) # Arestas das faces refinadas
+        faltam = ~registro.contem(novas_chaves) # Ainda sem ponto médio
+        novas_chaves, primeira = novas_chaves[faltam], primeira[faltam] # Só as novas
+        face, lado = ids[primeira // 3], primeira % 3 # Uma face de cada aresta nova
+        meio_bari = (baricentricas[face, lado] + baricentricas[face, (lado + 1) % 3]) / 2 # Ponto médio exato em baricêntricas
+        novos_ids = len(vertices) + np.arange(len(novas_chaves)) # Índices dos novos vértices
+        vertices = np.concatenate([vertices, alvo(face_base[face], meio_bari)]) # Posições na superfície alvo
+        pai = np.concatenate([pai, np.stack([faces[face, lado], faces[face, (lado + 1) % 3]], axis=1)]) # Aresta de origem
+        registro.inserir(novas_chaves, novos_ids) # Registra os nós pendurados
+
+        # Filhos (v1,a,c), (v2,b,a), (v3,c,b), (a,b,c), como em 'refinar_faces'
+        v1, v2, v3 = faces[ids].T # Cantos
+        a, b, c = (registro.meio(chaves_marcadas[:, j]) for j in range(3)) # Pontos médios
+        filhos = np.stack([np.stack([v1, a, c], 1), np.stack([v2, b, a], 1), np.stack([v3, c, b], 1), np.stack([a, b, c], 1)], 1).reshape(-1, 3) # (4R, 3)
+        p1, p2, p3 = baricentricas[ids, 0], baricentricas[ids, 1], baricentricas[ids, 2] # Cantos em baricêntricas
+        pa, pb, pc = (p1 + p2) / 2, (p2 + p3) / 2, (p3 + p1) / 2 # Pontos médios em baricêntricas
+        bari_filhos = np.stack([np.stack([p1, pa, pc], 1), np.stack([p2, pb, pa], 1), np.stack([p3, pc, pb], 1), np.stack([pa, pb, pc], 1)], 1).reshape(-1, 3, 3) # (4R, 3, 3)
+        mantidas = ~marcadas # Faces que continuam como estão
+        faces = np.concatenate([faces[mantidas], filhos]) # Novas faces vermelhas
+        baricentricas = np.concatenate([baricentricas[mantidas], bari_filhos]) # Idem
+        face_base = np.concatenate([face_base[mantidas], np.repeat(face_base[ids], 4)]) # Face base herdada
+        nivel = np.concatenate([nivel[mantidas], np.repeat(nivel[ids] + 1, 4)]) # Um nível a mais
+
+    # Verde: faces com exatamente uma aresta dividida viram dois triângulos ligados ao ponto médio
+    chaves = _chaves(faces, faces[:, [1, 2, 0]]) # Arestas de cada face
+    dividida = registro.contem(chaves) # Nós pendurados restantes
+    verdes = np.flatnonzero(dividida.sum(axis=1) == 1) # O fechamento garante no máximo um por face
+    lado = np.argmax(dividida[verdes], axis=1) # Aresta dividida de cada face verde
+    p, q, r = (faces[verdes, (lado + k) % 3] for k in range(3)) # Aresta (p, q) e vértice oposto r
+    m = registro.meio(chaves[verdes, lado]) # Ponto médio da aresta
+    bp, bq, br = (baricentricas[verdes, (lado + k) % 3] for k in range(3)) # Mesmos cantos em baricêntricas
+    bm = (bp + bq) / 2 # Ponto médio em baricêntricas
+    mantidas = np.ones(len(faces), dtype=bool) # Faces vermelhas que não mudam
+    mantidas[verdes] = False # Substituídas pelos pares verdes
+    faces = np.concatenate([faces[mantidas], np.stack([p, m, r], 1), np.stack([m, q, r], 1)]) # Mesma orientação
+    baricentricas = np.concatenate([baricentricas[mantidas], np.stack([bp, bm, br], 1), np.stack([bm, bq, br], 1)]) # Idem
+    face_base = np.concatenate([face_base[mantidas], face_base[verdes], face_base[verdes]]) # Idem
+    niveis_finais = np.concatenate([nivel[mantidas], nivel[verdes], nivel[verdes]]) # Idem
+
+    geometrico, medida = erros(vertices, faces, face_base, baricentricas) # Erro atingido
+    relatorio = { # Resumo para comparar custo e precisão por objeto
+        "num_faces": len(faces), # Faces geradas
+        "num_vertices": len(vertices), # Vértices gerados
+        "erro_max": float(medida.max(initial=0.0)), # Erro máximo no critério escolhido
+        "erro_geometrico_max": float(geometrico.max(initial=0.0)), # Desvio geométrico máximo
+        "criterio": criterio, # Critério usado
+        "tolerancia": tolerancia, # Tolerância pedida
+        "nivel_max": int(niveis_finais.max(initial=0)), # Nível mais fino usado
+        "faces_verdes": 2 * len(verdes), # Triângulos de transição
+    } # Fim do relatório
+    return Malha(vertices, faces, precisao=malha_base.precisao), relatorio # Malha única + relatório
@@ -0,0 +1,97 @@
+import numpy as np # Importa NumPy para montar a icosfera de forma vetorizada
+from esferaloop.nucleo.malha import Malha, PRECISOES # Estrutura de saída e precisões suportadas
+from esferaloop.nucleo.topologia import TopologiaMalha # Arestas do icosaedro base (numeração dos pontos de aresta)
+#
+def _padrao_faces(nivel) -> np.ndarray: # Faces de um triângulo base em coordenadas baricêntricas inteiras
+    """ # Início da docstring
+    Retorna (4^nivel, 3, 2) com as coordenadas (b, c) dos cantos de cada face filha de um triângulo base # Formato
+    com frequência n = 2^nivel (o peso do primeiro vértice é a = n - b - c). # Convenção
+    A recursão é a mesma de 'refinar_faces': (v1,a,c), (v2,b,a), (v3,c,b), (a,b,c), então a ordem das faces coincide. # Ordem
+    """ # Fim da docstring
+    n = 1 << nivel # Frequência da grade
+    cantos = np.array([[[0, 0], [n, 0], [0, n]]], dtype=np.int64) # Triângulo base: v1, v2, v3
+    for _ in range(nivel): # Uma divisão 1 -> 4 por nível, só com inteiros
+        v1, v2, v3 = cantos[:, 0], cantos[:, 1], cantos[:, 2] # Cantos de cada face
+        a, b, c = (v1 + v2) // 2, (v2 + v3) // 2, (v3 + v1) // 2 # Pontos médios (sempre inteiros)
+        cantos = np.stack([np.stack([v1, a, c], axis=1), np.stack([v2, b, a], axis=1), # Cantos v1 e v2
+                           np.stack([v3, c, b], axis=1), np.stack([a, b, c], axis=1)], axis=1).reshape(-1, 3, 2) # Canto v3 e central
+    return cantos # Padrão compartilhado pelas 20 faces
+
+def gerar_icosfera(nivel, precisao="float64") -> Malha: # Icosfera geodésica do nível pedido, sem iterar a subdivisão
+    """ # Início da docstring
+    Monta diretamente a icosfera geodésica de frequência 2^nivel a partir das 20 faces de 'Malha.gerar_icosaedro'. # Objetivo principal
+    - Faces e vértices seguem a numeração do caminho iterativo (subdividir + normalizar): os vértices de cada nível # Equivalência
+      mantêm seus índices e o ponto da aresta e recebe N + e, com as arestas na ordem de primeira aparição; # Numeração
+      as faces são exatamente as de 'refinar_faces' aplicada nivel vezes. # Faces
+    - Posições: cada ponto da grade baricêntrica é projetado na esfera. As regras de Loop deslocam os pontos antes # Geometria
+      de cada normalização, então a partir do nível 2 as posições diferem das do caminho iterativo (distribuição geodésica). # Diferença
+    Os pontos são deduplicados por uma numeração canônica (cantos, arestas base, interiores), depois renumerados # Método
+    nível a nível só com contagens (sem ordenação). Memória proporcional ao tamanho final e nenhum laço por vértice ou face. # Custo
+    """ # Fim da docstring
+    if precisao not in PRECISOES: # Valida a precisão pedida
+        raise ValueError(f"Precisão inválida: {precisao!r}. Use um de {tuple(PRECISOES)}.") # Erro explícito
+    if nivel < 0: # Não existe nível negativo
+        raise ValueError(f"Nível inválido: {nivel}.") # Erro explícito
+    base = Malha.gerar_icosaedro() # 12 vértices e 20 faces
+    n = 1 << nivel # Pontos por aresta base: n + 1
+    topologia = TopologiaMalha(base.faces, len(base.vertices)) # 30 arestas na ordem de primeira aparição
+    inicio_arestas = len(base.vertices) # Primeiro índice dos pontos internos de arestas
+    inicio_faces = inicio_arestas + topologia.num_arestas * (n - 1) # Primeiro índice dos pontos internos de faces
+    internos_por_face = (n - 1) * (n - 2) // 2 # Pontos estritamente dentro de cada face base
+
+    # --- Índices globais dos cantos do padrão, para as 20 faces de uma vez ---
+    padrao = _padrao_faces(nivel) # (4^nivel, 3, 2)
+    v1, v2, v3 = (base.faces[:, j, np.newaxis] for j in range(3)) # (20, 1) vértices de cada face base
+    e12, e23, e31 = (topologia.face_arestas[:, j, np.newaxis].astype(np.int64) for j in range(3)) # Arestas de cada face base
+
+    def ponto_de_aresta(aresta, p, q, peso_q): # Índice do ponto a 'peso_q' passos de p, sobre a aresta (p, q)
+        passos = np.where(p < q, peso_q, n - peso_q) # Contados a partir do vértice de menor índice
+        return inicio_arestas + aresta * (n - 1) + passos - 1 # Bloco da aresta + posição
+
+    def indice_canonico(b, c): # Índice canônico do ponto (b, c) da grade (pesos de v2 e v3) em cada face base: (20, ...)
+        a = n - b - c # Peso de v1
+        linha = np.maximum(b - 1, 0) # Linha do ponto interno (b = 1 .. n-2)
+        posto = linha * (n - 1) - linha * (linha + 1) // 2 + (c - 1) # Posição do ponto interno dentro da face
+        indices = inicio_faces + np.arange(20).reshape((20,) + (1,) * b.ndim) * internos_por_face + posto # Pontos internos
+        for borda, aresta, p, q, peso in ((b == 0, e31, v3, v1, a), (a == 0, e23, v2, v3, c), (c == 0, e12, v1, v2, b)): # Bordas
+            indices[:, borda] = ponto_de_aresta(aresta, p, q, peso[borda]) # Só os pontos da borda (mesmos em todas as faces)
+        for canto, vertice in ((c == n, v3), (b == n, v2), (a == n, v1)): # Cantos por último: valem sobre as bordas
+            indices[:, canto] = vertice # Vértices do icosaedro
+        return indices # (20, ...) índices canônicos
+
+    faces = indice_canonico(padrao[..., 0], padrao[..., 1]).reshape(-1, 3) # (20 * 4^nivel, 3) na numeração canônica
+
+    # --- Numeração do caminho iterativo: nível a nível, cada aresta ganha N + (ordem da primeira aparição) ---
+    total = inicio_faces + 20 * internos_por_face # Vértices do nível final
+    iterativo = np.empty(total, dtype=np.int64) # Índice canônico -> índice do caminho iterativo
+    iterativo[:inicio_arestas] = np.arange(inicio_arestas) # Os 12 cantos não mudam
+    primeira = np.empty(total, dtype=np.int64) # Primeira semi-aresta de cada ponto médio (cada ponto surge em um só nível)
+    num_vertices = inicio_arestas # Vértices do nível atual
+    for k in range(nivel): # Nível k -> k+1
+        cantos = _padrao_faces(k) << (nivel - k) # Faces do nível k na grade final: (4^k, 3, 2)
+        meios = (cantos + cantos[:, [1, 2, 0]]) // 2 # Ponto médio de (v1,v2), (v2,v3), (v3,v1)
+        chaves = indice_canonico(meios[..., 0], meios[..., 1]).reshape(-1) # Aresta de cada semi-aresta h = 3f + j
+        semi = np.arange(len(chaves)) # Índice global de cada semi-aresta
+        primeira[chaves] = len(chaves) # Maior que qualquer semi-aresta
+        np.minimum.at(primeira, chaves, semi) # Primeira aparição de cada aresta
+        inicia = primeira[chaves] == semi # Semi-aresta que introduz a sua aresta
+        id_aresta = np.cumsum(inicia) - 1 # Arestas numeradas na ordem de primeira aparição
+        iterativo[chaves] = num_vertices + id_aresta[primeira[chaves]] # Ponto ímpar: N + e
+        num_vertices += int(inicia.sum()) # Vértices do nível k+1
+    faces = iterativo[faces] # Faces na numeração do caminho iterativo
+
+    # --- Posições: grade baricêntrica de cada aresta e de cada face, projetada na esfera ---
+    passos = np.arange(1, n) / n # Frações ao longo de cada aresta
+    p, q = base.vertices[topologia.arestas[:, 0]], base.vertices[topologia.arestas[:, 1]] # Extremidades (menor índice primeiro)
+    pontos_aresta = (p[:, np.newaxis] * (1 - passos)[:, np.newaxis] + q[:, np.newaxis] * passos[:, np.newaxis]).reshape(-1, 3) # (30*(n-1), 3)
+    linhas_internas, colunas_internas = np.meshgrid(np.arange(1, n - 1), np.arange(1, n - 1), indexing='ij') # Grade (b, c)
+    dentro = linhas_internas + colunas_internas <= n - 1 # Apenas pontos com a >= 1
+    linhas_internas, colunas_internas = linhas_internas[dentro], colunas_internas[dentro] # Ordem por b e depois c, a mesma de 'posto'
+    pesos = np.stack([n - linhas_internas - colunas_internas, linhas_internas, colunas_internas], axis=1) / n # (Q, 3) baricêntricas
+    pontos_face = np.einsum('qj,fjk->fqk', pesos, base.vertices[base.faces]).reshape(-1, 3) # (20*Q, 3)
+    canonicos = np.concatenate([base.vertices, pontos_aresta, pontos_face]) # Numeração canônica
+    vertices = np.empty_like(canonicos) # Numeração do caminho iterativo
+    vertices[iterativo] = canonicos / np.linalg.norm(canonicos, axis=1)[:, np.newaxis] # Projeção na esfera unitária
+
+    tipo_vertices, tipo_indices = PRECISOES[precisao] # dtypes da precisão pedida
+    return Malha.de_arrays(vertices.astype(tipo_vertices, copy=False), faces.astype(tipo_indices, copy=False)) # Sem cópias extras
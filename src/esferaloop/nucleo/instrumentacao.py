@@ -0,0 +1,112 @@
+import cProfile # Captura opcional de perfil por função
+import io # Texto do relatório do perfil
+import pstats # Formatação do perfil
+import time # Relógio de parede
+import tracemalloc # Bytes alocados em cada estágio
+from contextlib import contextmanager, nullcontext # Estágios como blocos 'with'
+#
+ESTAGIOS = ( # Estágios emitidos pelos motores
+    "arestas", # Extração da topologia (arestas, faces adjacentes, vizinhança)
+    "impares", # Vértices ímpares (novos pontos nas arestas)
+    "pares", # Atualização dos vértices pares (originais)
+    "vertices", # Ímpares e pares juntos (motores 'esparso' e 'paralelo', que calculam os dois de uma vez)
+    "faces", # Reconstrução das faces 1 -> 4
+    "normalizacao", # Projeção na esfera
+    "metricas", # Métricas de qualidade
+)
+
+class Instrumentacao: # Eventos estruturados por estágio da subdivisão
+    """ # Início da docstring da classe
+    Mede cada estágio e entrega um evento (dict) a cada ouvinte registrado: # Objetivo principal
+    {'estagio', 'nivel', 'tempo_s', 'bytes_alocados', 'pico_bytes', 'contagens'}. # Formato do evento
+    - memoria: mede com tracemalloc os bytes que ficam alocados e o pico acima do início do estágio (desligada por padrão: # Memória
+      o tracemalloc deixa cada alocação mais lenta; sem ela, 'bytes_alocados' e 'pico_bytes' são None). # Custo
+    - perfil: acumula um cProfile apenas durante os estágios ('relatorio_perfil' e 'salvar_perfil'). # Perfil
+    - silencioso: suprime as mensagens de progresso (os eventos continuam sendo emitidos). # Modo silencioso
+    - guardar_eventos: mantém os eventos em 'self.eventos' (desligue em execuções longas e use ouvintes). # Histórico
+    """ # Fim da docstring
+    def __init__(self, ouvintes=None, memoria=False, perfil=False, silencioso=False, guardar_eventos=True): # Configuração
+        self.ouvintes = list(ouvintes or []) # Funções chamadas com cada evento
+        self.memoria = memoria # Mede bytes com tracemalloc
+        self.perfil = cProfile.Profile() if perfil else None # Perfil acumulado de todos os estágios
+        self.silencioso = silencioso # Sem mensagens no console
+        self.guardar_eventos = guardar_eventos # Histórico em memória
+        self.eventos = [] # Eventos emitidos (se guardados)
+        self.nivel = None # Nível sendo calculado, definido durante cada passo e copiado para cada evento (None fora deles)
+
+    def adicionar_ouvinte(self, ouvinte): # Registra mais um destino para os eventos
+        """'ouvinte' é chamado com cada evento (dict), logo ao fim do estágio.""" # Docstring
+        self.ouvintes.append(ouvinte) # Na ordem de registro
+
+    def progresso(self, mensagem): # Mensagens de progresso legíveis
+        """Imprime a mensagem, exceto no modo silencioso.""" # Docstring
+        if not self.silencioso: # Modo normal
+            print(mensagem) # Mesma saída de sempre
+
+    @contextmanager # Uso: with instrumentacao.estagio("impares", arestas=E) as contagens: ...
+    def estagio(self, nome, **contagens): # Mede um estágio
+        """ # Início da docstring
+        Mede o bloco 'with' e emite o evento ao sair. 'contagens' (ex.: arestas=E) vão para o evento; # Contagens
+        o dict entregue pelo 'with' pode receber contagens conhecidas só no fim do estágio. # Contagens tardias
+        """ # Fim da docstring
+        ligou_rastreamento = self.memoria and not tracemalloc.is_tracing() # Liga só se ninguém mais estiver rastreando
+        if ligou_rastreamento: # Rastreamento apenas durante o estágio
+            tracemalloc.start() # Início do rastreamento
+        if self.memoria: # Base para as medidas deste estágio
+            tracemalloc.reset_peak() # O pico passa a contar daqui
+            memoria_inicial = tracemalloc.get_traced_memory()[0] # Bytes já alocados
+        if self.perfil is not None: # Perfil apenas dentro dos estágios
+            self.perfil.enable() # Liga o cProfile
+        inicio = time.perf_counter() # Relógio de parede
+        try: # O evento é emitido mesmo se o estágio falhar
+            yield contagens # O chamador pode acrescentar contagens
+        finally: # Fecha as medidas
+            tempo = time.perf_counter() - inicio # Duração
+            if self.perfil is not None: # Desliga o perfil antes de medir a memória
+                self.perfil.disable() # Pausa o cProfile
+            alocados = pico = None # Sem medida de memória
+            if self.memoria: # Bytes do estágio
+                atual, maximo = tracemalloc.get_traced_memory() # Memória atual e pico
+                alocados, pico = atual - memoria_inicial, maximo - memoria_inicial # Relativos ao início
+            if ligou_rastreamento: # Desliga o que foi ligado aqui
+                tracemalloc.stop() # Fim do rastreamento
+            self.emitir({"estagio": nome, "nivel": self.nivel, "tempo_s": tempo, # Evento estruturado
+                         "bytes_alocados": alocados, "pico_bytes": pico, "contagens": dict(contagens)}) # Memória e contagens
+
+    def emitir(self, evento): # Entrega um evento
+        """Guarda o evento (se configurado) e chama cada ouvinte.""" # Docstring
+        if self.guardar_eventos: # Histórico em memória
+            self.eventos.append(evento) # Ordem de emissão
+        for ouvinte in self.ouvintes: # Monitoramento externo
+            ouvinte(evento) # Ex.: envio para o sistema de métricas
+
+    def resumo(self) -> dict: # Totais por estágio
+        """Soma de tempo e maior pico por estágio, a partir dos eventos guardados.""" # Docstring
+        totais = {} # estagio -> totais
+        for evento in self.eventos: # Cada evento guardado
+            total = totais.setdefault(evento["estagio"], {"chamadas": 0, "tempo_s": 0.0, "pico_bytes": None}) # Acumulador
+            total["chamadas"] += 1 # Uma chamada a mais
+            total["tempo_s"] += evento["tempo_s"] # Tempo acumulado
+            if evento["pico_bytes"] is not None: # Memória medida
+                total["pico_bytes"] = max(total["pico_bytes"] or 0, evento["pico_bytes"]) # Maior pico
+        return totais # Totais por estágio
+
+    def relatorio_perfil(self, ordenar="cumulative", linhas=25) -> str: # Texto do cProfile
+        """Tabela do pstats com as 'linhas' funções mais caras (exige perfil=True).""" # Docstring
+        if self.perfil is None: # Perfil não foi pedido
+            raise ValueError("Perfil desativado: crie a Instrumentacao com perfil=True.") # Erro explícito
+        saida = io.StringIO() # Destino do texto
+        pstats.Stats(self.perfil, stream=saida).sort_stats(ordenar).print_stats(linhas) # Relatório
+        return saida.getvalue() # Texto pronto
+
+    def salvar_perfil(self, caminho): # Arquivo .prof (snakeviz, pstats)
+        """Grava o perfil acumulado no formato do cProfile (exige perfil=True).""" # Docstring
+        if self.perfil is None: # Perfil não foi pedido
+            raise ValueError("Perfil desativado: crie a Instrumentacao com perfil=True.") # Erro explícito
+        self.perfil.dump_stats(caminho) # Formato binário padrão
+
+def estagio(instrumentacao, nome, **contagens): # Atalho usado pelos motores
+    """'instrumentacao.estagio(...)' ou um bloco vazio quando 'instrumentacao' é None (sem custo de medição).""" # Docstring
+    if instrumentacao is None: # Sem instrumentação
+        return nullcontext(contagens) # Mesmo protocolo, nada medido
+    return instrumentacao.estagio(nome, **contagens) # Estágio medido
@@ -0,0 +1,230 @@
+from functools import lru_cache # A base do retalho regular é calculada uma única vez
+import numpy as np # Importa NumPy para avaliar a superfície limite de forma vetorizada
+from esferaloop.nucleo.malha import Malha # Estrutura de entrada e saída
+from esferaloop.nucleo.topologia import TopologiaMalha # Conectividade das submalhas locais
+from esferaloop.nucleo.regras_loop import pesos_beta, somar_por_indice, subdividir_arrays # Regras de Loop compartilhadas
+#
+VALENCIA_REGULAR = 6 # Vértices regulares da subdivisão de Loop
+MAX_NIVEIS_LIMITE = 30 # Subdivisões locais máximas antes de interpolar entre os cantos
+ESTENCIL_REGULAR = ((0, 0), (1, 0), (0, 1), (1, -1), (1, 1), (-1, 1), # Os 12 pontos de controle de um triângulo regular,
+                    (-1, 0), (0, -1), (2, -1), (2, 0), (0, 2), (-1, 2)) # em coordenadas da grade (triângulo = (0,0), (1,0), (0,1))
+EXPOENTES_QUARTICOS = np.array([(4 - i - j, i, j) for i in range(5) for j in range(5 - i)]) # 15 polinômios de Bernstein de grau 4
+
+def pesos_chi(valencia) -> np.ndarray: # Peso da máscara de limite de Loop
+    """Peso chi = 1 / (3 / (8 beta) + n) da máscara de posição limite; 0 para vértices isolados.""" # Docstring
+    n = np.asarray(valencia) # Aceita listas, escalares ou arrays
+    beta = pesos_beta(n) # Peso beta de Loop
+    with np.errstate(divide='ignore'): # beta = 0 só ocorre em vértices isolados, tratados abaixo
+        return np.where(beta > 0, 1 / (3 / (8 * beta) + n), 0.0) # Fórmula da máscara de limite
+
+class _Sucessores: # Consulta "próximo vizinho no sentido anti-horário" a partir das faces
+    """Para cada face (a, b, c), o vizinho de 'a' que segue 'b' no sentido anti-horário é 'c'.""" # Docstring
+    def __init__(self, faces, num_vertices): # Tabela ordenada de semi-arestas
+        faces = np.asarray(faces, dtype=np.int64) # Índices em 64 bits para as chaves
+        self.num_vertices = max(num_vertices, 1) # Base das chaves
+        chaves = (faces * self.num_vertices + faces[:, [1, 2, 0]]).reshape(-1) # Chave (a, b)
+        ordem = np.argsort(chaves) # Busca binária nas chaves
+        self.chaves = chaves[ordem] # Chaves ordenadas
+        self.valores = faces[:, [2, 0, 1]].reshape(-1)[ordem] # 'c' de cada chave
+
+    def __call__(self, centro, vizinho) -> np.ndarray: # Próximo vizinho de 'centro' depois de 'vizinho'
+        chave = np.asarray(centro, dtype=np.int64) * self.num_vertices + vizinho # Chave procurada
+        posicao = np.minimum(np.searchsorted(self.chaves, chave), len(self.chaves) - 1) # Posição na tabela
+        achou = (self.chaves[posicao] == chave) & (np.asarray(vizinho) >= 0) # Semi-aresta existe (bordas não têm sucessor)
+        return np.where(achou, self.valores[posicao], -1) # -1 quando não há sucessor
+
+def _aneis_ordenados(topologia, sucessores, indices): # Vizinhos de cada vértice em ordem anti-horária
+    """ # Início da docstring
+    Retorna (anel, dono, posicao, valencia) no formato CSR achatado: anel[k] é o vizinho de número 'posicao[k]' # Formato
+    do vértice indices[dono[k]], percorrendo a vizinhança no sentido anti-horário (visto de fora da superfície). # Ordem
+    """ # Fim da docstring
+    valencia = topologia.valencia[indices].astype(np.int64) # Número de vizinhos de cada vértice pedido
+    inicio = np.concatenate([[0], np.cumsum(valencia)[:-1]]) # Deslocamento de cada anel
+    dono = np.repeat(np.arange(len(indices)), valencia) # Vértice de cada entrada
+    posicao = np.arange(len(dono)) - inicio[dono] # Posição dentro do anel
+    anel = np.empty(len(dono), dtype=np.int64) # Vizinhos ordenados
+    atual = topologia.vizinhos[topologia.vizinhos_inicio[indices]].astype(np.int64) # Qualquer vizinho serve de início
+    for passo in range(int(valencia.max(initial=0))): # Um passo do percurso por vez, para todos os vértices
+        ativos = valencia > passo # Vértices com vizinhos restantes
+        anel[inicio[ativos] + passo] = atual[ativos] # Registra o vizinho
+        atual = sucessores(indices, atual) # Avança no sentido anti-horário
+    return anel, dono, posicao, valencia # Anéis achatados
+
+def _limite_nos_vertices(vertices, topologia, sucessores, indices, com_normais=True): # Máscaras de posição e tangentes
+    """Posições e normais limite dos vértices 'indices' (cada um precisa do anel completo); normais só para D = 3.""" # Docstring
+    anel, dono, posicao, valencia = _aneis_ordenados(topologia, sucessores, indices) # Vizinhança ordenada
+    vizinhos = vertices[anel] # Posições dos vizinhos
+    chi = pesos_chi(valencia)[:, np.newaxis] # Peso da máscara de limite
+    soma = somar_por_indice(dono, vizinhos, len(indices)) # Soma dos vizinhos
+    posicoes = (1 - valencia[:, np.newaxis] * chi) * vertices[indices] + chi * soma # (1 - n chi) v + chi * soma
+    if not com_normais: # Atributos genéricos (ex.: funções base) não têm normal
+        return posicoes, None # Só as posições
+
+    angulo = 2 * np.pi * posicao / valencia[dono] # Ângulo de cada vizinho no anel
+    tangente_1 = somar_por_indice(dono, np.cos(angulo)[:, np.newaxis] * vizinhos, len(indices)) # Máscara cosseno
+    tangente_2 = somar_por_indice(dono, np.sin(angulo)[:, np.newaxis] * vizinhos, len(indices)) # Máscara seno
+    return posicoes, _unitarios(np.cross(tangente_1, tangente_2)) # Normal = t1 x t2
+
+def _unitarios(vetores) -> np.ndarray: # Normaliza linhas, deixando zeros como estão
+    modulo = np.linalg.norm(vetores, axis=1, keepdims=True) # Comprimento de cada linha
+    with np.errstate(invalid='ignore', divide='ignore'): # Linhas nulas continuam nulas
+        return np.where(modulo > 0, vetores / modulo, 0.0) # Vetores unitários
+
+def _exigir_fechada(malha): # As máscaras usadas aqui supõem vértices internos e suaves
+    topologia = malha.topologia # Conectividade em cache
+    if len(topologia.num_faces_aresta) and (topologia.num_faces_aresta != 2).any(): # Borda ou aresta não-manifold
+        raise ValueError("A avaliação do limite exige uma malha fechada e manifold (cada aresta com 2 faces).") # Erro explícito
+    if len(malha.vincos): # As máscaras de vinco não estão implementadas
+        raise ValueError("A avaliação do limite não suporta malhas com vincos marcados.") # Erro explícito
+
+def projetar_no_limite(malha: Malha) -> Malha: # Vértices levados às posições limite
+    """ # Início da docstring
+    Retorna uma nova malha, com as mesmas faces, em que cada vértice ocupa sua posição na superfície limite de Loop: # Objetivo
+    v_lim = (1 - n chi) v + chi * soma(vizinhos), com chi = 1 / (3 / (8 beta) + n). # Máscara de limite
+    """ # Fim da docstring
+    topologia = malha.topologia # Conectividade em cache
+    _exigir_fechada(malha) # Apenas malhas fechadas
+    vertices = np.asarray(malha.vertices, dtype=np.float64) # Cálculo em float64
+    posicoes, _ = _limite_nos_vertices(vertices, topologia, _Sucessores(malha.faces, len(vertices)), np.arange(len(vertices))) # Todos os vértices
+    return Malha(posicoes, malha.faces, precisao=malha.precisao) # Mesma precisão da entrada
+
+def normais_no_limite(malha: Malha) -> np.ndarray: # Normais exatas da superfície limite nos vértices
+    """Normais unitárias (N, 3) da superfície limite em cada vértice, pelas máscaras tangentes de Loop.""" # Docstring
+    topologia = malha.topologia # Conectividade em cache
+    _exigir_fechada(malha) # Apenas malhas fechadas
+    vertices = np.asarray(malha.vertices, dtype=np.float64) # Cálculo em float64
+    _, normais = _limite_nos_vertices(vertices, topologia, _Sucessores(malha.faces, len(vertices)), np.arange(len(vertices))) # Todos os vértices
+    return normais.astype(malha.vertices.dtype, copy=False) # Mesma precisão da entrada
+
+def _bernstein(baricentricas): # Polinômios de Bernstein de grau 4 e suas derivadas
+    """Valores (Q, 15) e derivadas nas direções v0->v1 e v0->v2 dos 15 polinômios de Bernstein quárticos.""" # Docstring
+    coeficientes = 24 / np.prod([[np.prod(np.arange(1, e + 1)) for e in linha] for linha in EXPOENTES_QUARTICOS], axis=1) # 4! / (i! j! k!)
+    potencias = baricentricas[:, np.newaxis, :] ** EXPOENTES_QUARTICOS # (Q, 15, 3)
+    valores = coeficientes * np.prod(potencias, axis=2) # Valor de cada polinômio
+    derivadas = [] # Derivada parcial em relação a cada coordenada baricêntrica
+    for eixo in range(3): # lambda0, lambda1, lambda2
+        expoentes = EXPOENTES_QUARTICOS.copy() # Expoentes da derivada
+        expoentes[:, eixo] = np.maximum(expoentes[:, eixo] - 1, 0) # Grau reduzido na coordenada derivada
+        parcial = coeficientes * EXPOENTES_QUARTICOS[:, eixo] * np.prod(baricentricas[:, np.newaxis, :] ** expoentes, axis=2) # Regra da potência
+        derivadas.append(parcial) # (Q, 15)
+    return valores, derivadas[1] - derivadas[0], derivadas[2] - derivadas[0] # Derivadas direcionais ao longo das arestas
+
+@lru_cache(maxsize=None) # Calculada uma única vez por processo
+def _base_regular() -> np.ndarray: # Coeficientes de Bernstein do retalho regular de Loop
+    """ # Início da docstring
+    Matriz (15, 12): coeficientes de Bernstein quárticos de cada uma das 12 funções base de um triângulo regular. # Resultado
+    Obtida sem tabelas externas: numa grade plana regular, cada ponto de controle recebe um indicador, # Método
+    a grade é subdividida duas vezes e as máscaras de limite (exatas) dão os valores nos 15 pontos # da própria
+    da grade de frequência 4 do triângulo, que determinam o polinômio de grau 4 (box spline quártica). # subdivisão
+    """ # Fim da docstring
+    raio = 5 # Grade hexagonal grande o bastante para que a borda não alcance o triângulo central
+    x, y = np.meshgrid(np.arange(-raio, raio + 1), np.arange(-raio, raio + 1), indexing='ij') # Pontos da grade
+    x, y = x.reshape(-1), y.reshape(-1) # Achata
+    mantidos = np.abs(x + y) <= raio # Recorte hexagonal
+    indice = np.full((2 * raio + 2, 2 * raio + 2), -1) # (x, y) -> índice do vértice (-1 fora da grade)
+    indice[x[mantidos] + raio, y[mantidos] + raio] = np.arange(mantidos.sum()) # Numeração dos pontos mantidos
+    x, y = x[mantidos], y[mantidos] # Coordenadas dos vértices
+    cima = np.stack([indice[x + raio, y + raio], indice[x + 1 + raio, y + raio], indice[x + raio, y + 1 + raio]], axis=1) # Triângulos "para cima"
+    baixo = np.stack([indice[x + 1 + raio, y + raio], indice[x + 1 + raio, y + 1 + raio], indice[x + raio, y + 1 + raio]], axis=1) # "Para baixo"
+    faces = np.concatenate([cima, baixo]) # Todos os triângulos (anti-horários)
+    faces = faces[(faces >= 0).all(axis=1)] # Só triângulos inteiros dentro da grade
+
+    valores = np.zeros((len(x), 14)) # 12 indicadores + coordenadas (x, y) da grade
+    for coluna, (px, py) in enumerate(ESTENCIL_REGULAR): # Um indicador por ponto de controle
+        valores[indice[px + raio, py + raio], coluna] = 1.0 # Função base = 1 no ponto, 0 nos demais
+    valores[:, 12], valores[:, 13] = x, y # Loop reproduz funções lineares na grade regular
+    for _ in range(2): # Dois níveis: os pontos de frequência 4 do triângulo viram vértices
+        topologia = TopologiaMalha(faces, len(valores)) # Conectividade do nível
+        valores, faces = subdividir_arrays(valores, faces, topologia) # Mesmas regras do motor vetorizado
+
+    topologia = TopologiaMalha(faces, len(valores)) # Conectividade do nível 2
+    grade = np.rint(valores[:, 12:] * 4).astype(np.int64) # Coordenadas da grade em quartos
+    alvo = EXPOENTES_QUARTICOS[:, 1:] # (i, j) de cada ponto de frequência 4
+    posicao = {(int(a), int(b)): k for k, (a, b) in enumerate(grade)} # Coordenada -> vértice
+    indices = np.array([posicao[(int(i), int(j))] for i, j in alvo]) # Vértices do nível 2 sobre os 15 pontos
+    limites, _ = _limite_nos_vertices(valores, topologia, _Sucessores(faces, len(valores)), indices, com_normais=False) # Valores limite exatos
+    matriz, _, _ = _bernstein(EXPOENTES_QUARTICOS / 4.0) # Bernstein nos mesmos 15 pontos
+    return np.linalg.solve(matriz, limites[:, :12]) # Interpolação exata do polinômio quártico
+
+def _estencil_regular(sucessores, cantos) -> np.ndarray: # Os 12 pontos de controle de triângulos regulares
+    p0, p1, p2 = cantos[:, 0], cantos[:, 1], cantos[:, 2] # Cantos anti-horários: (0,0), (1,0), (0,1)
+    qa, qb, qc = sucessores(p1, p0), sucessores(p2, p1), sucessores(p0, p2) # Opostos às arestas: (1,-1), (1,1), (-1,1)
+    m1 = sucessores(p0, qc) # (-1, 0)
+    m3 = sucessores(p1, qa) # (2, -1)
+    m5 = sucessores(p2, qb) # (0, 2)
+    return np.stack([p0, p1, p2, qa, qb, qc, m1, sucessores(p0, m1), m3, sucessores(p1, m3), m5, sucessores(p2, m5)], axis=1) # Ordem de ESTENCIL_REGULAR
+
+def _podar(vertices, faces, face_atual): # Mantém apenas o 2-anel das faces consultadas
+    marcadas = np.zeros(len(faces), dtype=bool) # Faces mantidas
+    marcadas[face_atual] = True # Faces que contêm pontos consultados
+    for _ in range(2): # Dois anéis de faces em volta
+        vertices_marcados = np.zeros(len(vertices), dtype=bool) # Vértices das faces marcadas
+        vertices_marcados[faces[marcadas].reshape(-1)] = True # Marca
+        marcadas = vertices_marcados[faces].any(axis=1) # Faces que tocam esses vértices
+    mantidas = np.flatnonzero(marcadas) # Índices das faces mantidas
+    usados, novas_faces = np.unique(faces[mantidas], return_inverse=True) # Renumeração compacta dos vértices
+    nova_posicao = np.full(len(faces), -1, dtype=np.int64) # Índice antigo -> novo das faces
+    nova_posicao[mantidas] = np.arange(len(mantidas)) # Renumeração das faces
+    return vertices[usados], novas_faces.reshape(-1, 3), nova_posicao[face_atual] # Submalha local
+
+def avaliar_limite(malha: Malha, faces, baricentricas, max_niveis=MAX_NIVEIS_LIMITE): # Pontos arbitrários da superfície limite
+    """ # Início da docstring
+    Avalia posições e normais da superfície limite de Loop em pontos (face, coordenadas baricêntricas), em lote. # Objetivo principal
+    - Triângulos com os 3 cantos de valência 6 são retalhos de box spline quártica: avaliação exata pela base regular. # Caso regular
+    - Nos demais, apenas o 2-anel das faces consultadas é subdividido, e cada ponto desce para o filho que o contém, # Caso irregular
+      até cair num filho regular (a quantidade de níveis cresce só com log2 da distância ao vértice extraordinário). # Custo
+    - Pontos exatamente sobre um vértice usam as máscaras de limite e tangentes daquele vértice. # Cantos
+    'baricentricas' (Q, 3) são os pesos dos vértices (v1, v2, v3) de cada face; retorna (posicoes, normais), ambos (Q, 3). # Formato
+    """ # Fim da docstring
+    topologia = malha.topologia # Conectividade em cache
+    _exigir_fechada(malha) # Apenas malhas fechadas
+    face_atual = np.asarray(faces, dtype=np.int64).reshape(-1) # Face de cada ponto
+    pesos = np.asarray(baricentricas, dtype=np.float64).reshape(-1, 3) # Coordenadas baricêntricas
+    if len(pesos) != len(face_atual): # Uma face por ponto
+        raise ValueError("'faces' e 'baricentricas' devem ter o mesmo número de pontos.") # Erro explícito
+    if (pesos < 0).any() or not np.allclose(pesos.sum(axis=1), 1.0): # Coordenadas fora do triângulo
+        raise ValueError("Coordenadas baricêntricas devem ser não negativas e somar 1.") # Erro explícito
+    pesos = pesos / pesos.sum(axis=1, keepdims=True) # Soma exatamente 1 (a descida entre os filhos é exata em binário)
+
+    posicoes = np.empty((len(pesos), 3)) # Resultado: posições
+    normais = np.empty((len(pesos), 3)) # Resultado: normais
+    ativos = np.arange(len(pesos)) # Pontos ainda não avaliados
+    sub_vertices, sub_faces = np.asarray(malha.vertices, dtype=np.float64), np.asarray(malha.faces) # Submalha inicial: a malha inteira
+    base = _base_regular() # (15, 12) coeficientes da box spline
+    for nivel in range(max_niveis + 1): # Uma subdivisão local por iteração
+        sub_vertices, sub_faces, face_atual = _podar(sub_vertices, sub_faces, face_atual) # Só o 2-anel dos pontos ativos
+        sub_topologia = TopologiaMalha(sub_faces, len(sub_vertices)) # Conectividade local
+        sucessores = _Sucessores(sub_faces, len(sub_vertices)) # Ordem dos anéis
+        cantos = sub_faces[face_atual] # (A, 3) cantos das faces consultadas
+        regular = (sub_topologia.valencia[cantos] == VALENCIA_REGULAR).all(axis=1) # Retalho de box spline
+        finais = regular | (pesos == 1.0).any(axis=1) | (nivel == max_niveis) # Pontos resolvidos neste nível
+
+        if regular.any(): # Avaliação exata dos retalhos regulares
+            controle = sub_vertices[_estencil_regular(sucessores, cantos[regular])] # (R, 12, 3)
+            valores, derivada_s, derivada_t = _bernstein(pesos[regular]) # (R, 15)
+            posicoes[ativos[regular]] = np.einsum('rk,rkd->rd', valores @ base, controle) # Posição na box spline
+            normais[ativos[regular]] = _unitarios(np.cross(np.einsum('rk,rkd->rd', derivada_s @ base, controle), # Tangente v0 -> v1
+                                                           np.einsum('rk,rkd->rd', derivada_t @ base, controle))) # x tangente v0 -> v2
+        irregulares = finais & ~regular # Sobre um vértice extraordinário, ou limite de níveis atingido
+        if irregulares.any(): # Máscaras de limite nos cantos, combinadas pelas coordenadas
+            unicos, inversa = np.unique(cantos[irregulares], return_inverse=True) # Cantos envolvidos
+            lim_pos, lim_normais = _limite_nos_vertices(sub_vertices, sub_topologia, sucessores, unicos) # Posições e normais limite
+            inversa = inversa.reshape(-1, 3) # Canto -> linha de 'unicos'
+            posicoes[ativos[irregulares]] = np.einsum('qj,qjd->qd', pesos[irregulares], lim_pos[inversa]) # Exato sobre o vértice
+            normais[ativos[irregulares]] = _unitarios(np.einsum('qj,qjd->qd', pesos[irregulares], lim_normais[inversa])) # Idem
+
+        ativos, face_atual, pesos = ativos[~finais], face_atual[~finais], pesos[~finais] # Restam os pontos perto de vértices extraordinários
+        if not len(ativos): # Todos avaliados
+            break # Fim
+        sub_vertices, sub_faces = subdividir_arrays(sub_vertices, sub_faces, sub_topologia) # Um nível de Loop só na submalha
+
+        # Filho que contém cada ponto: (v1,a,c), (v2,b,a), (v3,c,b) ou (a,b,c), como em 'refinar_faces'
+        u, v, w = pesos.T # Pesos de v1, v2 e v3
+        filho = np.where(u >= 0.5, 0, np.where(v >= 0.5, 1, np.where(w >= 0.5, 2, 3))) # Canto mais próximo ou centro
+        pesos = np.select([filho[:, np.newaxis] == k for k in range(4)], # Coordenadas no filho (operações exatas em binário)
+                          [np.stack([2 * u - 1, 2 * v, 2 * w], axis=1), np.stack([2 * v - 1, 2 * w, 2 * u], axis=1),
+                           np.stack([2 * w - 1, 2 * u, 2 * v], axis=1), np.stack([1 - 2 * w, 1 - 2 * u, 1 - 2 * v], axis=1)])
+        face_atual = 4 * face_atual + filho # Índice do filho na submalha subdividida
+
+    tipo = malha.vertices.dtype # Resultado na precisão da malha
+    return posicoes.astype(tipo, copy=False), normais.astype(tipo, copy=False) # (Q, 3) e (Q, 3)
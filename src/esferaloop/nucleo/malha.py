@@ -1,33 +1,100 @@
 import numpy as np # Importa a biblioteca NumPy para processamento numérico de arrays e matrizes
+from esferaloop.nucleo.topologia import TopologiaMalha # Conectividade compacta (arrays int32) construída sob demanda
+
+PRECISOES = { # Precisão -> (dtype dos vértices, dtype dos índices)
+    "float64": (np.float64, np.int_), # Padrão: mesma representação de sempre
+    "float32": (np.float32, np.int32), # Metade da memória e da banda, suficiente para renderização
+}
 # 
 class Malha: # Define a classe principal para representar uma malha triangular em 3D
     """ # Início da docstring da classe
     Classe para representar uma malha triangular 3D. # Descrição: representa a estrutura de dados da malha
     Armazena vértices e faces, e fornece métodos para manipulação da topologia. # Descrição complementar sobre armazenamento e métodos
+    'vincos' (K, 2) lista arestas internas marcadas como afiadas; bordas são detectadas pela topologia. # Arestas afiadas
     """ # Fim da docstring
-    def __init__(self, vertices=None, faces=None): # Método construtor que inicializa a malha com vértices e faces
+    def __init__(self, vertices=None, faces=None, precisao="float64", vincos=None): # Método construtor que inicializa a malha com vértices e faces
+        if precisao not in PRECISOES: # Valida a precisão pedida
+            raise ValueError(f"Precisão inválida: {precisao!r}. Use um de {tuple(PRECISOES)}.") # Erro explícito
+        tipo_vertices, tipo_indices = PRECISOES[precisao] # dtypes correspondentes
         # Vertices: array numpy de formato (N, 3) # Comentário interno sobre o formato esperado dos vértices
-        self.vertices = np.array(vertices, dtype=float) if vertices is not None else np.empty((0, 3)) # Se houver vértices, converte para array float; se não, cria array vazio
+        self.vertices = np.array(vertices, dtype=tipo_vertices) if vertices is not None else np.empty((0, 3), dtype=tipo_vertices) # Se houver vértices, converte para array float; se não, cria array vazio
         # Faces: array numpy de formato (M, 3) contendo índices de vértices # Comentário interno sobre o formato esperado das faces
-        self.faces = np.array(faces, dtype=int) if faces is not None else np.empty((0, 3), dtype=int) # Se houver faces, converte para array int; se não, cria array vazio
+        self.faces = np.array(faces, dtype=tipo_indices) if faces is not None else np.empty((0, 3), dtype=tipo_indices) # Se houver faces, converte para array int; se não, cria array vazio
+        # Vincos: array numpy de formato (K, 2) com pares de vértices ligados por uma aresta afiada # Comentário interno sobre os vincos
+        self.vincos = np.array(vincos, dtype=np.int64).reshape(-1, 2) if vincos is not None else np.empty((0, 2), dtype=np.int64) # Vazio: malha suave
+
+    @property # Precisão deduzida do dtype dos vértices
+    def precisao(self) -> str: # 'float32' ou 'float64'
+        """Precisão dos vértices ('float32' ou 'float64').""" # Docstring
+        return "float32" if self.vertices.dtype == np.float32 else "float64" # Qualquer outro dtype é tratado como float64
+
+    @classmethod # Construtor alternativo, sem conversão nem cópia
+    def de_arrays(cls, vertices, faces, vincos=None, topologia=None) -> "Malha": # Envolve arrays já prontos (ex.: np.memmap)
+        """ # Início da docstring
+        Cria uma Malha que usa 'vertices' e 'faces' diretamente, preservando dtype e armazenamento. # Objetivo principal
+        'topologia' (TopologiaMalha dessas mesmas faces, ex.: lida de um arquivo) é usada sem reconstrução. # Topologia pronta
+        """ # Fim da docstring
+        malha = cls.__new__(cls) # Evita as conversões de __init__
+        malha.vertices = vertices # Array (N, 3) usado como está
+        malha.faces = faces # Array (M, 3) usado como está (também zera a topologia)
+        malha.vincos = np.asarray(vincos, dtype=np.int64).reshape(-1, 2) if vincos is not None else np.empty((0, 2), dtype=np.int64) # Vazio: sem vincos
+        malha._topologia = topologia # None: construída no primeiro acesso
+        return malha # Malha sem cópia dos dados
+
+    @property # Os vértices são expostos como propriedade para invalidar as métricas em cache
+    def vertices(self) -> np.ndarray: # Leitura dos vértices
+        return self._vertices # Array (N, 3) de coordenadas
+
+    @vertices.setter # Atribuir novos vértices descarta as métricas calculadas
+    def vertices(self, novos_vertices): # Escrita dos vértices
+        self._vertices = novos_vertices # Guarda o novo array de vértices
+        self.metricas_em_cache = {} # Métricas dependem das posições
+
+    @property # As faces são expostas como propriedade para invalidar a topologia em cache
+    def faces(self) -> np.ndarray: # Leitura das faces
+        return self._faces # Array (M, 3) de índices de vértices
+
+    @faces.setter # Atribuir novas faces descarta a conectividade calculada
+    def faces(self, novas_faces): # Escrita das faces
+        self._faces = novas_faces # Guarda o novo array de faces
+        self._topologia = None # A topologia antiga deixa de valer
+        self.metricas_em_cache = {} # Métricas também dependem das faces
+
+    @property # Conectividade construída apenas no primeiro acesso
+    def topologia(self) -> TopologiaMalha: # Acesso à estrutura compacta de arestas
+        """ # Início da docstring
+        Conectividade da malha (arestas, faces adjacentes e vizinhança) em arrays int32. # O que é retornado
+        É construída uma única vez e reaproveitada até que 'faces' seja substituído. # Política de cache
+        Se o array de faces for alterado no lugar, chame 'invalidar_topologia()'. # Cuidado com modificações in-place
+        """ # Fim da docstring
+        if self._topologia is None: # Primeiro acesso (ou cache invalidado)
+            self._topologia = TopologiaMalha(self.faces, len(self.vertices)) # Constrói as tabelas vetorizadas
+        return self._topologia # Retorna a estrutura em cache
+
+    @property # Consulta sem efeito colateral
+    def topologia_em_cache(self): # TopologiaMalha ou None
+        """Topologia já construída (ou carregada), ou None; ao contrário de 'topologia', nunca a constrói.""" # Docstring
+        return self._topologia # Sem construir
+
+    def invalidar_topologia(self): # Descarta a conectividade em cache
+        """Força a reconstrução da topologia no próximo acesso.""" # Docstring
+        self._topologia = None # Limpa o cache
+        self.metricas_em_cache = {} # Contagens de arestas e valências também mudam
+
+    def invalidar_metricas(self): # Descarta as métricas em cache
+        """Deve ser chamado após alterar 'vertices' no lugar (ex.: vertices /= normas).""" # Docstring
+        self.metricas_em_cache = {} # Limpa o cache
 
     def obter_arestas(self) -> dict: # Método para extrair e mapear todas as arestas únicas da malha
         """ # Início da docstring do método
         Extrai todas as arestas únicas da malha. # Objetivo: identificar as conexões entre vértices
         Retorna um dicionário mapeando arestas (tupla ordenada) para faces adjacentes. # Explica o formato de retorno do mapeamento
+        Prefira 'topologia' em código novo: este dicionário é montado a partir dela a cada chamada. # Formato legado
         """ # Fim da docstring
-        arestas = {} # Inicializa um dicionário vazio para armazenar as arestas
-        for idx_face, face in enumerate(self.faces): # Itera sobre cada face da malha, mantendo o índice (idx_face)
-            for i in range(3): # Cada face triangular possui 3 arestas, itera por elas
-                v1, v2 = face[i], face[(i + 1) % 3] # Pega dois vértices consecutivos para formar uma aresta (cicla 0-1, 1-2, 2-0)
-                aresta = tuple(sorted((v1, v2))) # Ordena os índices e cria uma tupla para que a aresta (1,2) seja igual a (2,1)
-                if aresta not in arestas: # Verifica se esta aresta já foi registrada no dicionário
-                    arestas[aresta] = [] # Se for nova, cria uma lista vazia para armazenar as faces que a compartilham
-                arestas[aresta].append(idx_face) # Adiciona o índice da face atual à lista de faces adjacentes a esta aresta
-        return arestas # Retorna o dicionário completo com todas as arestas e suas faces vizinhas
+        return self.topologia.como_dicionario() # Converte as tabelas em cache para o formato de dicionário
 
     @staticmethod # Decorador que define o método seguinte como estático (não depende de uma instância)
-    def gerar_icosaedro(): # Método que gera a geometria inicial de um icosaedro regular
+    def gerar_icosaedro(precisao="float64"): # Método que gera a geometria inicial de um icosaedro regular
         """ # Início da docstring
         Gera um icosaedro regular centrado na origem como malha inicial (Nível 0). # Explica que é o ponto de partida do algoritmo
         Um icosaedro possui 12 vértices e 20 faces triangulares. # Detalhes geométricos do sólido platônico
@@ -53,7 +120,16 @@ class Malha: # Define a classe principal para representar uma malha triangular e
             [4, 9, 5], [2, 4, 11], [6, 2, 10], [8, 6, 7], [9, 8, 1]  # Faces de fechamento
         ] # Fim da lista de faces
 
-        return Malha(vertices, faces) # Cria e retorna um novo objeto Malha com a geometria do icosaedro
+        return Malha(vertices, faces, precisao=precisao) # Cria e retorna um novo objeto Malha com a geometria do icosaedro
+
+    @staticmethod # Não depende de uma instância
+    def gerar_icosfera(nivel, precisao="float64"): # Icosfera geodésica montada diretamente no nível pedido
+        """ # Início da docstring
+        Atalho para 'esferaloop.nucleo.icosfera.gerar_icosfera': 20 * 4^nivel faces sem passar pelos níveis intermediários. # Objetivo
+        Faces e numeração dos vértices iguais às do caminho iterativo; as posições são as geodésicas. # Diferenças
+        """ # Fim da docstring
+        from esferaloop.nucleo.icosfera import gerar_icosfera # Importação local (icosfera depende de Malha)
+        return gerar_icosfera(nivel, precisao) # Malha pronta
 
     def estatisticas(self) -> tuple: # Método simples para obter informações básicas da malha
         """Retorna contagem de vértices e faces.""" # Docstring de linha única
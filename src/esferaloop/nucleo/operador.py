@@ -0,0 +1,220 @@
+import hashlib # Gera a chave (impressão digital) da conectividade usada no cache
+import os # Manipulação de caminhos dos arquivos de cache
+from collections import OrderedDict # Dicionário ordenado usado como fila LRU
+import numpy as np # Importa NumPy para montar os pesos das matrizes
+from esferaloop.nucleo.topologia import TopologiaMalha # Conectividade vetorizada (não depende das posições)
+from esferaloop.nucleo.regras_loop import pesos_beta, refinar_faces, arestas_afiadas, refinar_vincos # Regras de Loop compartilhadas com o motor vetorizado
+
+#
+def _exigir_scipy(): # Verificação centralizada da dependência opcional
+    """Importa 'scipy.sparse' no primeiro uso (SciPy é opcional e lento de carregar) e o retorna.""" # Docstring
+    try: # SciPy só é necessário para o modo de operador esparso
+        import scipy.sparse as sp # Matrizes esparsas CSR (importação repetida é só uma consulta a sys.modules)
+    except ImportError: # Ambiente sem SciPy
+        raise ImportError("O modo de operador esparso requer SciPy (pip install scipy).") from None # Mensagem com a solução
+    return sp # Módulo pronto para uso
+
+def construir_passo(faces, num_vertices, vincos=None): # Um passo de Loop como matriz esparsa
+    """ # Início da docstring
+    Constrói a matriz S (N + E, N) de um passo de Loop e retorna (S, faces refinadas, vincos refinados). # Objetivo principal
+    Depende apenas da conectividade e dos vincos: as novas posições são S @ V para quaisquer vértices V. # Linearidade de Loop
+    """ # Fim da docstring
+    sp = _exigir_scipy() # Falha cedo se SciPy não estiver disponível
+    faces = np.asarray(faces).reshape(-1, 3) # Garante o formato (F, 3)
+    topologia = TopologiaMalha(faces, num_vertices) # Arestas, valências e vizinhança em arrays
+    num_arestas = topologia.num_arestas # Quantidade de vértices ímpares que serão criados
+    afiada = arestas_afiadas(topologia, vincos) # Bordas e vincos (valida a variedade)
+
+    # Linhas dos vértices pares: (1 - n*beta) na diagonal e beta para cada vizinho
+    n = topologia.valencia # Valência de cada vértice
+    beta = pesos_beta(n) # Peso beta por vértice
+    linhas = [np.arange(num_vertices), np.repeat(np.arange(num_vertices), n)] # Diagonal e vizinhos (CSR)
+    colunas = [np.arange(num_vertices), topologia.vizinhos] # Colunas correspondentes
+    pesos = [1 - n * beta, np.repeat(beta, n)] # Pesos de cada entrada
+    if afiada.any(): # Vértices de vinco (3/4 e 1/8 nos vizinhos afiados) e cantos (fixos)
+        extremos = topologia.arestas[afiada] # Arestas afiadas
+        num_afiadas = np.bincount(extremos.reshape(-1), minlength=num_vertices) # Arestas afiadas por vértice
+        suave = num_afiadas < 2 # Mantêm a regra beta
+        pesos = [np.where(suave, 1 - n * beta, np.where(num_afiadas == 2, 3/4, 1.0)), np.repeat(np.where(suave, beta, 0.0), n)] # Diagonal e vizinhos
+        vinco = num_afiadas == 2 # Vértices de borda ou de vinco
+        linhas += [extremos[:, 0], extremos[:, 1]] # Cada aresta afiada nos dois sentidos
+        colunas += [extremos[:, 1], extremos[:, 0]] # b1 e b2
+        pesos += [np.where(vinco[extremos[:, 0]], 1/8, 0.0), np.where(vinco[extremos[:, 1]], 1/8, 0.0)] # 1/8 só em vértices de vinco
+
+    # Linhas dos vértices ímpares: 3/8 nas extremidades e 1/8 nos opostos (ou 1/2 e 1/2 em bordas e vincos)
+    interna = ~afiada # Arestas suaves compartilhadas por exatamente duas faces
+    linha_impar = num_vertices + np.arange(num_arestas) # Índice do novo vértice de cada aresta
+    peso_extremo = np.where(interna, 3/8, 0.5) # Peso de v1 e v2
+    linhas += [linha_impar, linha_impar] # Uma entrada por extremidade
+    colunas += [topologia.arestas[:, 0], topologia.arestas[:, 1]] # v1 e v2
+    pesos += [peso_extremo, peso_extremo] # Mesmo peso para as duas extremidades
+    id_aresta = topologia.face_arestas.reshape(-1) # Aresta de cada semi-aresta
+    oposto = faces[:, [2, 0, 1]].reshape(-1) # Vértice oposto a cada semi-aresta
+    semi_interna = interna[id_aresta] # Só arestas internas usam os vértices opostos
+    linhas.append(num_vertices + id_aresta[semi_interna]) # Linha do vértice ímpar da aresta
+    colunas.append(oposto[semi_interna]) # v3 e v4
+    pesos.append(np.full(np.count_nonzero(semi_interna), 1/8)) # Peso 1/8 para cada oposto
+
+    S = sp.csr_matrix((np.concatenate(pesos), (np.concatenate(linhas), np.concatenate(colunas))), # Entradas COO -> CSR
+                      shape=(num_vertices + num_arestas, num_vertices)) # (N + E) x N
+    S.eliminate_zeros() # Remove as entradas zeradas de vértices de vinco e de canto
+    return S, refinar_faces(faces, num_vertices, topologia.face_arestas), refinar_vincos(vincos, topologia, num_vertices) # Matriz e nova topologia
+
+class OperadorSubdivisao: # Sequência de matrizes de Loop para uma conectividade fixa
+    """ # Início da docstring da classe
+    Operador de subdivisão pré-calculado até um nível k. # O que a classe representa
+    'passos[j]' leva os vértices do nível j ao nível j+1; 'faces[j]' e 'vincos[j]' são a topologia do nível j. # Estrutura interna
+    """ # Fim da docstring
+    def __init__(self, passos, faces, num_vertices, vincos=None): # Monta o operador a partir de passos já construídos
+        self.num_vertices = num_vertices # Vértices da malha base (colunas de S_1)
+        self.passos = list(passos) # Matrizes CSR de cada passo
+        self.faces = list(faces) # Faces de cada nível (faces[0] é a malha base)
+        self.vincos = list(vincos) if vincos is not None else [np.empty((0, 2), dtype=np.int64)] * len(self.faces) # Vincos de cada nível
+        self._matriz = None # Produto S_k ... S_1, calculado sob demanda
+
+    @property # Número de passos representados
+    def nivel(self) -> int: # Nível final do operador
+        return len(self.passos) # Um passo por nível
+
+    @property # Produto de todos os passos (usado quando não há normalização)
+    def matriz(self): # Operador completo S_k
+        """Matriz única (N_k, N_0) equivalente a aplicar todos os passos em sequência.""" # Docstring
+        if self._matriz is None: # Primeiro acesso
+            sp = _exigir_scipy() # O produto também exige SciPy
+            matriz = sp.identity(self.num_vertices, format='csr') # Identidade N_0 x N_0
+            for S in self.passos: # Compõe da base para o nível final
+                matriz = S @ matriz # S_j @ ... @ S_1
+            self._matriz = matriz.tocsr() # Guarda no formato CSR
+        return self._matriz # Retorna a matriz em cache
+
+    def estender(self, passo, novas_faces, novos_vincos=None): # Cria o operador do nível seguinte reaproveitando este
+        """Retorna um novo operador com um passo a mais.""" # Docstring
+        novos_vincos = np.empty((0, 2), dtype=np.int64) if novos_vincos is None else novos_vincos # Sem vincos marcados
+        return OperadorSubdivisao(self.passos + [passo], self.faces + [novas_faces], self.num_vertices, # Compartilha as matrizes existentes
+                                  self.vincos + [novos_vincos]) # Vincos por nível
+
+    def aplicar(self, vertices, normalizar_cada_passo=False) -> np.ndarray: # Novas posições a partir de V
+        """ # Início da docstring
+        Aplica o operador a vértices (N_0, 3) ou a vários conjuntos empilhados nas colunas (N_0, 3*B). # Entradas aceitas
+        Com 'normalizar_cada_passo', reprojeta na esfera após cada passo (como 'SubdivisaoLoopEsfera.executar'). # Modo esférico
+        """ # Fim da docstring
+        vertices = np.asarray(vertices) # Aceita listas ou arrays
+        tipo = vertices.dtype if vertices.dtype.kind == 'f' else np.float64 # O resultado mantém a precisão da entrada
+        if not normalizar_cada_passo: # Caso linear: uma única multiplicação
+            return np.asarray(self.matriz.astype(tipo, copy=False) @ vertices) # S_k @ V
+        vertices = _normalizar_linhas(vertices) # Projeta a malha base, como em 'executar'
+        for S in self.passos: # Normalização é não linear: aplica passo a passo
+            vertices = _normalizar_linhas(np.asarray(S.astype(tipo, copy=False) @ vertices)) # S_j @ V seguido de projeção na esfera
+        return vertices # Posições do nível final
+
+def _normalizar_linhas(vertices): # Projeção na esfera unitária de cada grupo XYZ
+    """Normaliza cada trio de colunas (x, y, z) para raio 1, linha a linha.""" # Docstring
+    grupos = vertices.reshape(len(vertices), -1, 3) # (N, B, 3) para aceitar conjuntos empilhados
+    return (grupos / np.linalg.norm(grupos, axis=2, keepdims=True)).reshape(vertices.shape) # Divide pela norma
+
+class CacheOperadores: # Cache LRU (memória) com cópia opcional em disco
+    """ # Início da docstring da classe
+    Guarda operadores de subdivisão indexados por (conectividade, nível). # Chave do cache
+    Em memória, os menos usados são descartados acima de 'capacidade'; com 'diretorio', persiste em .npz. # Políticas
+    """ # Fim da docstring
+    def __init__(self, capacidade=16, diretorio=None): # Configura o cache
+        self.capacidade = capacidade # Número máximo de operadores mantidos em memória
+        self.diretorio = diretorio # Pasta opcional para persistir os operadores
+        self._itens = OrderedDict() # chave -> OperadorSubdivisao, do menos para o mais recente
+        if diretorio is not None: # Cria a pasta se necessário
+            os.makedirs(diretorio, exist_ok=True) # Não falha se já existir
+
+    @staticmethod # Não depende do estado do cache
+    def chave_conectividade(faces, num_vertices, vincos=None) -> str: # Impressão digital da topologia
+        """Hash estável das faces, do número de vértices e dos vincos (se houver).""" # Docstring
+        faces = np.ascontiguousarray(faces, dtype=np.int64) # Representação canônica para o hash
+        resumo = hashlib.sha1(faces.tobytes()) # Hash dos índices
+        resumo.update(str((num_vertices, faces.shape)).encode()) # Inclui o tamanho para evitar colisões triviais
+        if vincos is not None and len(vincos): # Malhas sem vincos mantêm a chave de sempre
+            resumo.update(np.ascontiguousarray(vincos, dtype=np.int64).tobytes()) # Vincos mudam as regras
+        return resumo.hexdigest() # Texto hexadecimal
+
+    def obter(self, faces, num_vertices, nivel, vincos=None) -> OperadorSubdivisao: # Busca ou constrói um operador
+        """Retorna o operador do nível pedido, reaproveitando níveis anteriores já em cache.""" # Docstring
+        faces = np.asarray(faces).reshape(-1, 3) # Garante o formato (F, 3)
+        vincos = np.empty((0, 2), dtype=np.int64) if vincos is None else np.asarray(vincos, dtype=np.int64).reshape(-1, 2) # (K, 2)
+        base = self.chave_conectividade(faces, num_vertices, vincos) # Chave da malha base
+        operador = self._buscar((base, nivel)) # Tentativa direta
+        if operador is not None: # Acerto no cache
+            return operador # Nada a calcular
+
+        # Procura o maior nível já disponível e estende a partir dele
+        inicial = OperadorSubdivisao([], [faces], num_vertices, [vincos]) # Operador nível 0 (identidade)
+        for k in range(nivel - 1, 0, -1): # Do nível mais alto para o mais baixo
+            encontrado = self._buscar((base, k)) # Nível intermediário em cache?
+            if encontrado is not None: # Encontrou um ponto de partida
+                inicial = encontrado # Reaproveita os passos já calculados
+                break # Não precisa procurar mais
+
+        operador = inicial # Operador em construção
+        for k in range(operador.nivel, nivel): # Passos que faltam
+            faces_k = operador.faces[-1] # Topologia do nível atual
+            n_k = operador.passos[-1].shape[0] if operador.passos else num_vertices # Vértices do nível atual
+            operador = operador.estender(*construir_passo(faces_k, n_k, operador.vincos[-1])) # Acrescenta um passo
+            self._guardar((base, k + 1), operador) # Cada nível intermediário também fica disponível
+        return operador # Operador do nível pedido
+
+    def limpar(self): # Esvazia o cache em memória
+        """Remove todos os operadores mantidos em memória (o disco não é alterado).""" # Docstring
+        self._itens.clear() # Limpa o dicionário
+
+    def __len__(self): # Quantidade de operadores em memória
+        return len(self._itens) # Tamanho do dicionário
+
+    def _buscar(self, chave): # Consulta memória e, em seguida, disco
+        if chave in self._itens: # Acerto em memória
+            self._itens.move_to_end(chave) # Marca como usado recentemente
+            return self._itens[chave] # Retorna o operador
+        if self.diretorio is not None: # Tenta o disco
+            caminho = self._caminho(chave) # Arquivo correspondente
+            if os.path.exists(caminho): # Operador persistido anteriormente
+                operador = self._ler(caminho) # Carrega as matrizes
+                self._guardar(chave, operador, persistir=False) # Promove para a memória
+                return operador # Retorna o operador carregado
+        return None # Não encontrado
+
+    def _guardar(self, chave, operador, persistir=True): # Insere com política LRU
+        self._itens[chave] = operador # Guarda (ou atualiza) o operador
+        self._itens.move_to_end(chave) # Mais recente no fim
+        while len(self._itens) > self.capacidade: # Excedeu a capacidade
+            self._itens.popitem(last=False) # Descarta o menos usado
+        if persistir and self.diretorio is not None: # Cópia em disco solicitada
+            self._escrever(self._caminho(chave), operador) # Grava o arquivo .npz
+
+    def _caminho(self, chave): # Nome do arquivo de um operador
+        base, nivel = chave # Conectividade e nível
+        return os.path.join(self.diretorio, f"{base}_n{nivel}.npz") # Ex.: <hash>_n3.npz
+
+    @staticmethod # Serialização independente do estado
+    def _escrever(caminho, operador): # Grava o operador de forma atômica
+        dados = {"nivel": np.array(operador.nivel), "num_vertices": np.array(operador.num_vertices)} # Metadados mínimos
+        for j, S in enumerate(operador.passos): # Cada matriz CSR vira três arrays
+            dados[f"dados_{j}"], dados[f"indices_{j}"], dados[f"ponteiros_{j}"] = S.data, S.indices, S.indptr # Conteúdo CSR
+            dados[f"forma_{j}"] = np.array(S.shape) # Dimensões da matriz
+        for j, faces in enumerate(operador.faces): # Faces de cada nível
+            dados[f"faces_{j}"] = faces # Topologia do nível j
+        for j, vincos in enumerate(operador.vincos): # Vincos de cada nível
+            dados[f"vincos_{j}"] = vincos # Arestas afiadas do nível j
+        from esferaloop.utilitarios.arquivos import _gravacao_atomica # Importação local (utilitarios depende do núcleo)
+        with _gravacao_atomica(caminho) as arquivo: # Leitores nunca veem um arquivo pela metade; sem sobras em caso de erro
+            np.savez(arquivo, **dados) # Formato .npz sem compressão (leitura rápida)
+
+    @staticmethod # Desserialização independente do estado
+    def _ler(caminho) -> OperadorSubdivisao: # Reconstrói o operador a partir do .npz
+        sp = _exigir_scipy() # As matrizes lidas são esparsas
+        with np.load(caminho) as dados: # Abre o arquivo
+            nivel = int(dados["nivel"]) # Quantidade de passos
+            num_vertices = int(dados["num_vertices"]) # Vértices da malha base
+            passos = [sp.csr_matrix((dados[f"dados_{j}"], dados[f"indices_{j}"], dados[f"ponteiros_{j}"]), # Remonta cada CSR
+                                    shape=tuple(dados[f"forma_{j}"])) for j in range(nivel)] # Com as dimensões salvas
+            faces = [dados[f"faces_{j}"] for j in range(nivel + 1)] # Faces de todos os níveis
+            vincos = [dados[f"vincos_{j}"] if f"vincos_{j}" in dados else np.empty((0, 2), dtype=np.int64) # Arquivos antigos
+                      for j in range(nivel + 1)] # não têm vincos
+        return OperadorSubdivisao(passos, faces, num_vertices, vincos) # Operador reconstruído
+
+CACHE_PADRAO = CacheOperadores() # Cache compartilhado usado quando nenhum outro é informado
@@ -0,0 +1,261 @@
+import os # Número de núcleos disponíveis
+import sys # Versão do Python (rastreamento dos blocos compartilhados)
+from concurrent.futures import ProcessPoolExecutor # Pool de processos para os blocos de trabalho
+from itertools import repeat # Mesma função e mesmos descritores para todas as tarefas de uma fase
+from multiprocessing import shared_memory # Buffers compartilhados entre processos (sem pickle)
+from multiprocessing import resource_tracker # Rastreador dos blocos, único para o principal e o pool
+import numpy as np # Importa NumPy para os cálculos por bloco
+from esferaloop.nucleo.malha import Malha # Estrutura de retorno
+from esferaloop.nucleo.instrumentacao import estagio # Medição opcional de cada estágio
+from esferaloop.nucleo.regras_loop import pesos_beta, refinar_faces, somar_por_indice, _erro_variedade, _erro_vinco, _metades_vincos # Regras compartilhadas com o motor serial
+#
+def _compartilhar(array, blocos_abertos): # Copia um array para um bloco de memória compartilhada
+    """Cria um SharedMemory com o conteúdo de 'array' e retorna o descritor (nome, forma, dtype).""" # Docstring
+    array = np.ascontiguousarray(array) # Garante layout contínuo
+    bloco = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1)) # Pelo menos 1 byte (arrays vazios)
+    blocos_abertos.append(bloco) # Guardado para liberar ao final
+    np.ndarray(array.shape, dtype=array.dtype, buffer=bloco.buf)[...] = array # Cópia única a partir do processo principal
+    return bloco.name, array.shape, array.dtype.str # Descritor leve, enviado aos processos
+
+def _reservar(forma, dtype, blocos_abertos): # Bloco compartilhado vazio, preenchido pelos processos
+    """Cria um SharedMemory zerado (o sistema entrega o segmento zerado) para um array (forma, dtype) e retorna o descritor.""" # Docstring
+    dtype = np.dtype(dtype) # Tipo dos elementos
+    bloco = shared_memory.SharedMemory(create=True, size=max(int(np.prod(forma)) * dtype.itemsize, 1)) # Sem cópia inicial
+    blocos_abertos.append(bloco) # Guardado para liberar ao final
+    return bloco.name, tuple(int(x) for x in forma), dtype.str # Descritor leve, enviado aos processos
+
+def _ler(descritor, blocos_abertos, indices=slice(None)) -> np.ndarray: # Cópia (de parte) de um bloco criado aqui
+    """Copia 'array[indices]' de um bloco criado por este processo; a visão temporária morre antes do fechamento.""" # Docstring
+    nome, forma, dtype = descritor # Desempacota o descritor
+    bloco = next(b for b in blocos_abertos if b.name == nome) # Bloco já aberto
+    return np.array(np.ndarray(forma, dtype=np.dtype(dtype), buffer=bloco.buf)[indices]) # Cópia independente do buffer
+
+# Python < 3.13 não tem 'SharedMemory(..., track=False)': anexar um bloco sempre o registra no resource_tracker.
+# Chamar 'resource_tracker.unregister' no processo filho só é correto se ele tiver um rastreador próprio; se o rastreador
+# for o do principal, apagaria o registro de quem criou o bloco (e o 'unlink' final acusaria KeyError). Em vez de
+# adivinhar qual é o caso, o rastreador do principal é iniciado aqui, antes de qualquer pool: processos criados depois
+# o herdam (fork) ou recebem o seu descritor (spawn, forkserver), e o registro repetido de um bloco já registrado não
+# tem efeito. O 'unlink' do principal desfaz o registro uma única vez.
+_ANEXAR_SEM_RASTREIO = sys.version_info >= (3, 13) # Parâmetro 'track' disponível
+if not _ANEXAR_SEM_RASTREIO and os.name == "posix": # Windows não usa resource_tracker para SharedMemory
+    resource_tracker.ensure_running() # Rastreador único para o principal e todos os processos do pool
+
+def _anexar(descritor, blocos_abertos): # Abre (sem copiar) um bloco criado pelo processo principal
+    """Retorna uma visão NumPy do bloco compartilhado descrito por (nome, forma, dtype).""" # Docstring
+    nome, forma, dtype = descritor # Desempacota o descritor
+    if _ANEXAR_SEM_RASTREIO: # Python 3.13+: só o processo que criou o bloco o registra
+        bloco = shared_memory.SharedMemory(name=nome, track=False) # Anexa sem rastreamento
+    else: # Versões anteriores: registro repetido no rastreador compartilhado (ver acima)
+        bloco = shared_memory.SharedMemory(name=nome) # Removido do rastreador pelo 'unlink' do principal
+    blocos_abertos.append(bloco) # Fechado ao final da tarefa
+    return np.ndarray(forma, dtype=np.dtype(dtype), buffer=bloco.buf) # Visão sem cópia
+
+def _tarefa(funcao, descritores, *argumentos): # Executado em cada processo do pool
+    """Anexa os buffers compartilhados, executa 'funcao(visoes, *argumentos)' e fecha os buffers.""" # Docstring
+    blocos_abertos = [] # Blocos anexados por esta tarefa
+    try: # Garante o fechamento dos blocos mesmo em caso de erro
+        visoes = {chave: _anexar(desc, blocos_abertos) for chave, desc in descritores.items()} # Visões compartilhadas
+        resultado = funcao(visoes, *argumentos) # Todas as visões temporárias morrem ao retornar
+        visoes = None # Remove as últimas referências aos buffers antes de fechar
+        return resultado # Resultado pequeno (contagens), enviado de volta por pickle
+    finally: # Libera os blocos anexados
+        for bloco in blocos_abertos: # Cada bloco anexado
+            bloco.close() # Fecha sem remover (o principal faz o unlink)
+
+def _fase(pool, funcao, descritores, tarefas) -> list: # Uma fase: todas as tarefas, com barreira ao final
+    """Executa 'funcao' com cada tupla de argumentos de 'tarefas' nos processos e retorna os resultados em ordem.""" # Docstring
+    return list(pool.map(_tarefa, repeat(funcao), repeat(descritores), *zip(*tarefas))) # Propaga exceções
+
+def _registros(faces, f0, f1, num_vertices, num_baldes): # Duas entradas por semi-aresta das faces [f0, f1)
+    """ # Início da docstring
+    A semi-aresta h = 3f + k (v_k -> v_k+1) gera (fonte=v_k, alvo=v_k+1, h) e (fonte=v_k+1, alvo=v_k, h), em ordem de h. # Entradas
+    O balde de uma entrada é a faixa de índices da sua fonte: cada balde vê todas as arestas dos seus vértices. # Particionamento
+    """ # Fim da docstring
+    bloco = faces[f0:f1] # Faces deste bloco
+    origem, destino = bloco.reshape(-1), bloco[:, [1, 2, 0]].reshape(-1) # Semi-arestas (v1,v2), (v2,v3), (v3,v1)
+    fonte = np.stack([origem, destino], axis=1).reshape(-1) # As duas pontas de cada semi-aresta
+    alvo = np.stack([destino, origem], axis=1).reshape(-1) # A ponta oposta
+    meia = np.repeat(np.arange(3 * f0, 3 * f1, dtype=np.int64), 2) # Semi-aresta de origem
+    balde = (fonte.astype(np.int64) * num_baldes // max(num_vertices, 1)).astype(np.min_scalar_type(num_baldes)) # Inteiro pequeno (radix sort)
+    return fonte, alvo, meia, balde # Entradas do bloco
+
+def _contar_registros(d, bloco, f0, f1): # Fase 1 (por bloco de faces)
+    """Conta quantas entradas do bloco de faces caem em cada balde.""" # Docstring
+    num_baldes = d["contagem"].shape[1] # Um balde por faixa de vértices
+    balde = _registros(d["faces"], f0, f1, len(d["vertices"]), num_baldes)[3] # Só os baldes
+    d["contagem"][bloco] = np.bincount(balde, minlength=num_baldes) # Linha deste bloco
+
+def _distribuir_registros(d, bloco, f0, f1): # Fase 2 (por bloco de faces)
+    """Copia as entradas do bloco para a faixa de cada balde; dentro de um balde, h continua crescente.""" # Docstring
+    num_baldes = d["contagem"].shape[1] # Um balde por faixa de vértices
+    fonte, alvo, meia, balde = _registros(d["faces"], f0, f1, len(d["vertices"]), num_baldes) # Mesmas entradas da fase 1
+    ordem = np.argsort(balde, kind='stable') # Agrupa por balde sem mudar a ordem de h
+    balde = balde[ordem].astype(np.int64) # Balde de cada entrada ordenada
+    inicio_local = np.cumsum(d["contagem"][bloco]) - d["contagem"][bloco] # Início de cada balde na ordem local
+    posicao = d["deslocamentos"][bloco][balde] + np.arange(len(ordem)) - inicio_local[balde] # Posição global
+    d["fonte"][posicao], d["alvo"][posicao], d["meia"][posicao] = fonte[ordem], alvo[ordem], meia[ordem] # Escrita direta
+
+def _agrupar_balde(d, r0, r1, v0, v1): # Fase 3 (por balde de vértices [v0, v1))
+    """ # Início da docstring
+    Agrupa as entradas [r0, r1) em arestas e calcula os vértices pares [v0, v1). # Objetivo principal
+    Cada par (fonte, alvo) é uma aresta vista de uma ponta; a menor semi-aresta dá a ordem de numeração (primeira aparição, # Numeração
+    como em 'TopologiaMalha'). A ponta menor responde pela aresta: marca a semi-aresta e guarda a segunda face e se é afiada. # Dono
+    Retorna (arestas por bloco de faces, arestas com mais de duas faces, primeira delas ou None). # Resultado
+    """ # Fim da docstring
+    vertices, faces = d["vertices"], d["faces"] # Leitura
+    num_vertices, num_meias = len(vertices), 3 * len(faces) # Tamanhos globais
+    chave = (d["fonte"][r0:r1].astype(np.int64) - v0) * num_vertices + d["alvo"][r0:r1] # Par (fonte, alvo)
+    ordem = np.argsort(chave) # Agrupa as entradas de cada par
+    chave, meia = chave[ordem], d["meia"][r0:r1][ordem] # Entradas agrupadas
+    inicio = np.flatnonzero(np.diff(chave, prepend=-1)) # Primeira entrada de cada par
+    num_faces = np.diff(np.append(inicio, len(chave))) # Faces da aresta (uma entrada por semi-aresta)
+    primeira = np.minimum.reduceat(meia, inicio) if len(chave) else meia # Menor semi-aresta: ordem de numeração
+    segunda = np.where(num_faces == 2, np.maximum.reduceat(meia, inicio), -1) if len(chave) else meia # Outra face (-1 em bordas)
+    local, vizinho = chave[inicio] // num_vertices, chave[inicio] % num_vertices # Fonte (relativa a v0) e alvo
+    ponta_menor, ponta_maior = np.minimum(local + v0, vizinho), np.maximum(local + v0, vizinho) # Aresta ordenada
+    propria = local + v0 < vizinho # Arestas pelas quais este balde responde
+
+    # Arestas afiadas: bordas e vincos (busca binária nas chaves ordenadas dos vincos)
+    afiada = num_faces != 2 # Bordas (e não-variedade, rejeitada pelo principal)
+    if len(d["vincos"]): # Vincos marcados
+        globais = ponta_menor * num_vertices + ponta_maior # Chave de cada aresta
+        posicao = np.minimum(np.searchsorted(d["vincos"], globais), len(d["vincos"]) - 1) # Candidata
+        vinco = d["vincos"][posicao] == globais # Aresta marcada como vinco
+        afiada |= vinco # Tratada como borda
+        d["vinco_meia"][posicao[vinco & propria]] = primeira[vinco & propria] + 1 # 0: vinco sem aresta
+
+    # Dados das arestas próprias, guardados na sua primeira semi-aresta
+    d["marca"][primeira[propria]] = 1 # Uma marca por aresta
+    d["segunda"][primeira[propria]] = segunda[propria] # Segunda semi-aresta (vértice oposto)
+    d["afiada"][primeira[propria]] = afiada[propria] # Regra do ponto médio
+    dona = np.repeat(propria, num_faces) # Entradas das arestas próprias
+    d["primeira"][meia[dona]] = np.repeat(primeira, num_faces)[dona] # Semi-aresta -> primeira semi-aresta da aresta
+    excesso = propria & (num_faces > 2) # Arestas não-variedade
+    exemplo = None # Primeira delas (menor índice de aresta)
+    if excesso.any(): # Malha inválida
+        i = np.flatnonzero(excesso)[np.argmin(primeira[excesso])] # Menor semi-aresta = menor índice
+        exemplo = (int(primeira[i]), int(ponta_menor[i]), int(ponta_maior[i]), int(num_faces[i])) # Ordenável por h
+    limites_meias = d["limites_meias"] # Faixas de semi-arestas dos blocos de faces
+    arestas_por_bloco = np.bincount(np.searchsorted(limites_meias, primeira[propria], side='right') - 1, # Bloco de cada marca
+                                    minlength=len(limites_meias) - 1) # Um total por bloco
+
+    # Vértices pares do balde, somando os vizinhos na ordem das arestas (mesma ordem de soma do motor serial)
+    ordem = np.argsort(local * max(num_meias, 1) + primeira) # Por vértice, depois por índice de aresta
+    grupo, vizinho, afiada = local[ordem], vizinho[ordem], afiada[ordem] # Vizinhança ordenada
+    ids = np.arange(v0, v1) # Vértices deste balde
+    n = np.bincount(grupo, minlength=len(ids)) # Valência de cada vértice
+    tipo = vertices.dtype # Precisão de trabalho, arredondada como no motor serial
+    maior = vizinho > ids[grupo] # Separa vizinhos de índice maior e menor
+    valores = vertices[vizinho] # Coordenadas dos vizinhos
+    soma_vizinhos = (somar_por_indice(grupo[maior], valores[maior], len(ids)).astype(tipo) + # Mesma ordem de soma
+                     somar_por_indice(grupo[~maior], valores[~maior], len(ids)).astype(tipo)) # do motor serial
+    beta = pesos_beta(n).astype(tipo)[:, np.newaxis] # Peso beta de Loop
+    novos = (1 - n.astype(tipo)[:, np.newaxis] * beta) * vertices[ids] + beta * soma_vizinhos # (1 - n*beta) * v + beta * soma
+    num_afiadas = np.bincount(grupo[afiada], minlength=len(ids))[:, np.newaxis] # Arestas de borda ou vinco de cada vértice
+    if (num_afiadas >= 2).any(): # Vértices de vinco ou canto neste balde
+        soma_afiadas = (somar_por_indice(grupo[maior & afiada], valores[maior & afiada], len(ids)).astype(tipo) + # Mesma ordem
+                        somar_por_indice(grupo[~maior & afiada], valores[~maior & afiada], len(ids)).astype(tipo)) # do motor serial
+        novos = np.where(num_afiadas == 2, (3/4) * vertices[ids] + (1/8) * soma_afiadas, novos) # 3/4 v + 1/8 (b1 + b2)
+        novos = np.where(num_afiadas > 2, vertices[ids], novos) # Canto: fica fixo
+    d["pares"][v0:v1] = novos # Escreve no buffer de saída
+    return arestas_por_bloco, int(excesso.sum()), exemplo # Contagens para o principal
+
+def _numerar_arestas(d, m0, m1, deslocamento): # Fase 4 (por bloco de faces)
+    """Numera as arestas marcadas nas semi-arestas [m0, m1) a partir de 'deslocamento' e calcula seus vértices ímpares.""" # Docstring
+    vertices, faces = d["vertices"], d["faces"].reshape(-1) # Leitura (faces achatadas: semi-aresta h começa em faces[h])
+    meias = m0 + np.flatnonzero(d["marca"][m0:m1]) # Primeira semi-aresta de cada aresta do bloco, em ordem
+    ids = deslocamento + np.arange(len(meias)) # Índices globais das arestas
+    d["id_aresta"][meias] = ids # Consultado pela fase 5 de todos os blocos
+    base = meias - meias % 3 # Primeira semi-aresta da face
+    a, b = faces[meias], faces[base + (meias + 1) % 3] # Extremidades
+    v1, v2 = vertices[np.minimum(a, b)], vertices[np.maximum(a, b)] # Menor índice primeiro, como em 'arestas'
+    segunda = np.maximum(d["segunda"][meias], 0) # Semi-aresta da outra face (0 em bordas, descartada abaixo)
+    opostos = faces[base + (meias + 2) % 3], faces[segunda - segunda % 3 + (segunda + 2) % 3] # Vértice oposto em cada face
+    interna = (d["afiada"][meias] == 0)[:, np.newaxis] # Arestas suaves com exatamente duas faces
+    tipo = vertices.dtype # Precisão de trabalho, arredondada como no motor serial
+    soma_opostos = (vertices[opostos[0]].astype(np.float64) + vertices[opostos[1]]).astype(tipo) # v3 + v4 (acumulado em float64)
+    soma_opostos = np.where(interna, soma_opostos, 0) # Bordas não usam opostos
+    d["impares"][ids] = np.where(interna, (3/8) * (v1 + v2) + (1/8) * soma_opostos, 0.5 * (v1 + v2)) # Regra de Loop
+
+def _refinar_bloco(d, f0, f1): # Fase 5 (por bloco de faces)
+    """Arestas de cada face do bloco e suas 4 faces filhas, na mesma ordem do motor serial.""" # Docstring
+    face_arestas = d["id_aresta"][d["primeira"][3 * f0:3 * f1]].reshape(-1, 3) # Semi-aresta -> aresta
+    d["novas_faces"][4 * f0:4 * f1] = refinar_faces(d["faces"][f0:f1], len(d["vertices"]), face_arestas) # 1 -> 4
+
+def subdividir_paralelo(malha: Malha, num_processos=None, num_blocos=None, executor=None, instrumentacao=None) -> Malha: # Loop em vários núcleos
+    """ # Início da docstring
+    Aplica um passo de Loop dividindo o trabalho entre processos, sem topologia pré-calculada no processo principal. # Objetivo principal
+    As faces são cortadas em blocos contínuos; cada bloco envia as pontas das suas semi-arestas ao balde (faixa de # Particionamento
+    vértices) de cada ponta. Cada balde agrupa as suas arestas, resolve bordas, vincos e opostos e calcula os vértices pares; # Arestas nos processos
+    depois os blocos numeram as arestas (ordem da primeira aparição), calculam os ímpares e refazem as faces. # Numeração
+    O principal só soma contagens por bloco. Vértices, entradas e saídas ficam em 'multiprocessing.shared_memory'. # Comunicação
+    O resultado é idêntico ao do motor vetorizado serial. Estágios medidos: 'arestas', 'vertices' e 'faces'. # Garantia de equivalência
+    Experimental: a única medição (um núcleo) ficou em 0,42-0,48x do vetorizado; a aceleração com vários núcleos ainda não # Desempenho
+    foi demonstrada (testes/benchmark_paralelo.py). Os blocos seguem a ordem das faces da entrada, de modo que a localidade # Localidade
+    de cada bloco depende da numeração da malha (contígua nas icosferas geradas aqui, arbitrária em malhas carregadas). # Limitação
+    """ # Fim da docstring
+    num_processos = num_processos or os.cpu_count() or 1 # Padrão: todos os núcleos
+    num_blocos = num_blocos or 4 * num_processos # Blocos extras para balancear a carga
+    vertices = np.asarray(malha.vertices) # Posições atuais (na precisão da malha)
+    faces = np.asarray(malha.faces) # Conectividade atual
+    num_vertices, num_faces = len(vertices), len(faces) # Tamanhos
+    limites_faces = np.arange(num_blocos + 1) * num_faces // num_blocos # Blocos contínuos de faces
+    limites_vertices = (np.arange(num_blocos + 1) * num_vertices + num_blocos - 1) // num_blocos # Baldes: v * B // N == j
+    vincos = np.sort(np.asarray(malha.vincos, dtype=np.int64).reshape(-1, 2), axis=1) # Vincos como (menor, maior)
+    chaves_vincos, vinco_unico = np.unique(vincos[:, 0] * num_vertices + vincos[:, 1], return_inverse=True) # Busca binária
+    pool = executor if executor is not None else ProcessPoolExecutor(max_workers=num_processos) # Pool do chamador ou temporário
+    blocos_abertos = [] # Blocos criados (removidos ao final)
+    try: # Garante a remoção dos blocos compartilhados
+        blocos = [(i, limites_faces[i], limites_faces[i + 1]) for i in range(num_blocos)] # Tarefas por bloco de faces
+        meias = [(3 * limites_faces[i], 3 * limites_faces[i + 1]) for i in range(num_blocos)] # Semi-arestas de cada bloco
+        with estagio(instrumentacao, "arestas", faces=num_faces, blocos=num_blocos): # Semi-arestas distribuídas pelos baldes
+            d = { # Tudo o que os processos leem ou escrevem
+                "vertices": _compartilhar(vertices, blocos_abertos), # Posições do nível atual
+                "faces": _compartilhar(faces, blocos_abertos), # (F, 3)
+                "vincos": _compartilhar(chaves_vincos, blocos_abertos), # Chaves ordenadas dos vincos
+                "limites_meias": _compartilhar(3 * limites_faces, blocos_abertos), # Faixas de semi-arestas
+                "contagem": _reservar((num_blocos, num_blocos), np.int64, blocos_abertos), # Entradas por (bloco, balde)
+            }
+            _fase(pool, _contar_registros, d, blocos) # Fase 1
+            contagem = _ler(d["contagem"], blocos_abertos) # (blocos, baldes)
+            limites_registros = np.concatenate([[0], np.cumsum(contagem.sum(axis=0))]) # Faixa de cada balde
+            d["deslocamentos"] = _compartilhar(limites_registros[:-1] + np.cumsum(contagem, axis=0) - contagem, blocos_abertos) # Início de cada bloco no balde
+            for chave, tipo in (("fonte", faces.dtype), ("alvo", faces.dtype), ("meia", np.int64)): # Entradas por balde
+                d[chave] = _reservar((6 * num_faces,), tipo, blocos_abertos) # Duas por semi-aresta
+            _fase(pool, _distribuir_registros, d, blocos) # Fase 2
+
+        with estagio(instrumentacao, "vertices", vertices=num_vertices, blocos=num_blocos) as contagens: # Arestas, pares e ímpares
+            for chave, tipo in (("marca", np.uint8), ("segunda", np.int64), ("afiada", np.uint8), ("primeira", np.int64)): # Por semi-aresta
+                d[chave] = _reservar((3 * num_faces,), tipo, blocos_abertos) # Indexados pela semi-aresta
+            d["vinco_meia"] = _reservar((len(chaves_vincos),), np.int64, blocos_abertos) # Primeira semi-aresta + 1 de cada vinco
+            d["pares"] = _reservar((num_vertices, 3), vertices.dtype, blocos_abertos) # Vértices pares
+            resultados = _fase(pool, _agrupar_balde, d, [(limites_registros[j], limites_registros[j + 1], # Fase 3
+                                                          limites_vertices[j], limites_vertices[j + 1]) for j in range(num_blocos)]) # Um balde por tarefa
+            num_excesso = sum(r[1] for r in resultados) # Arestas com mais de duas faces
+            if num_excesso: # Mesma validação (e mensagem) de 'arestas_afiadas'
+                _, a, b, num_faces_aresta = min(r[2] for r in resultados if r[2] is not None) # Menor índice de aresta
+                raise _erro_variedade(num_excesso, (a, b), num_faces_aresta) # Erro explícito
+            vinco_meia = _ler(d["vinco_meia"], blocos_abertos)[vinco_unico] - 1 # Semi-aresta de cada vinco (-1: não é aresta)
+            if (vinco_meia < 0).any(): # Vinco que não é aresta da malha
+                raise _erro_vinco(*vincos[np.argmax(vinco_meia < 0)]) # Primeiro vinco inválido
+            limites_arestas = np.concatenate([[0], np.cumsum(np.sum([r[0] for r in resultados], axis=0))]) # Arestas por bloco
+            num_arestas = int(limites_arestas[-1]) # Total de arestas únicas
+            d["id_aresta"] = _reservar((3 * num_faces,), np.int64, blocos_abertos) # Índice de aresta de cada primeira semi-aresta
+            d["impares"] = _reservar((num_arestas, 3), vertices.dtype, blocos_abertos) # Vértices ímpares
+            _fase(pool, _numerar_arestas, d, [meias[i] + (limites_arestas[i],) for i in range(num_blocos)]) # Fase 4
+            novos_vertices = np.concatenate([_ler(d["pares"], blocos_abertos), _ler(d["impares"], blocos_abertos)]) # Pares e ímpares
+            contagens["vertices"], contagens["arestas"] = num_vertices + num_arestas, num_arestas # Conhecidos só agora
+
+        with estagio(instrumentacao, "faces", faces=4 * num_faces): # Faces refeitas nos processos
+            d["novas_faces"] = _reservar((4 * num_faces, 3), np.int64, blocos_abertos) # Quatro filhas por face
+            _fase(pool, _refinar_bloco, d, [bloco[1:] for bloco in blocos]) # Fase 5
+            novas_faces = _ler(d["novas_faces"], blocos_abertos) # Mesma ordem do motor serial
+            ids_vincos = _ler(d["id_aresta"], blocos_abertos, vinco_meia) # Aresta de cada vinco
+            novos_vincos = _metades_vincos(vincos, ids_vincos, num_vertices) # Vincos do próximo nível
+    finally: # Remove os blocos do sistema
+        for bloco in blocos_abertos: # Cada bloco criado
+            bloco.close() # Fecha a visão local
+            bloco.unlink() # Remove o segmento compartilhado
+        if executor is None: # Pool temporário, apenas para esta chamada
+            pool.shutdown() # Encerra os processos
+    return Malha(novos_vertices, novas_faces, precisao=malha.precisao, vincos=novos_vincos) # Malha do próximo nível
@@ -0,0 +1,128 @@
+import numpy as np # Importa NumPy para aplicar as regras de Loop de forma vetorizada
+from esferaloop.nucleo.instrumentacao import estagio # Medição opcional de cada estágio
+#
+def pesos_beta(valencia) -> np.ndarray: # Peso beta de Loop para cada vértice par
+    """ # Início da docstring
+    Calcula o peso beta de Loop para um array de valências. # Objetivo principal
+    n = 3 usa beta = 3/16; n > 3 usa a fórmula trigonométrica; vértices isolados (n = 0) recebem 0. # Casos tratados
+    """ # Fim da docstring
+    n = np.asarray(valencia) # Aceita listas, escalares ou arrays
+    with np.errstate(divide='ignore', invalid='ignore'): # Vértices isolados (n = 0) são descartados abaixo
+        beta = np.where(n == 3, 3/16, (1/n) * (5/8 - (3/8 + 0.25 * np.cos(2 * np.pi / n))**2)) # Fórmula de Loop
+    return np.where(n > 0, beta, 0.0) # Vértices sem vizinhos permanecem onde estão
+
+def somar_por_indice(indices, valores, tamanho) -> np.ndarray: # Soma por grupos (scatter-add) de vetores XYZ
+    """Acumula as linhas de 'valores' (K, 3) nas posições 'indices', retornando (tamanho, 3).""" # Docstring
+    return np.stack([np.bincount(indices, weights=valores[:, j], minlength=tamanho) # bincount com pesos por coordenada
+                     for j in range(valores.shape[1])], axis=1) # Junta X, Y e Z
+
+def _ids_arestas(topologia, pares) -> np.ndarray: # Índice de cada par (a, b) na tabela de arestas
+    """Retorna o índice da aresta de cada par de vértices (K, 2); levanta ValueError se algum par não for aresta.""" # Docstring
+    pares = np.sort(np.asarray(pares, dtype=np.int64).reshape(-1, 2), axis=1) # (menor, maior), como em 'arestas'
+    chaves = topologia.arestas[:, 0].astype(np.int64) * topologia.num_vertices + topologia.arestas[:, 1] # Chave única por aresta
+    ordem = np.argsort(chaves) # Busca binária sobre as chaves ordenadas
+    procuradas = pares[:, 0] * topologia.num_vertices + pares[:, 1] # Chaves dos pares pedidos
+    posicao = np.minimum(np.searchsorted(chaves, procuradas, sorter=ordem), max(len(chaves) - 1, 0)) # Posição candidata
+    encontrados = (chaves[ordem[posicao]] == procuradas) if len(chaves) else np.zeros(len(pares), dtype=bool) # Par existe?
+    if not encontrados.all(): # Vinco que não é aresta da malha
+        raise _erro_vinco(*pares[np.argmin(encontrados)]) # Primeiro par inválido
+    return ordem[posicao] # Índices das arestas
+
+def _erro_vinco(a, b) -> ValueError: # Mensagem única para os motores serial e paralelo
+    """Erro de um vinco (a, b) que não é aresta da malha.""" # Docstring
+    return ValueError(f"Vinco ({a}, {b}) não é uma aresta da malha.") # Erro explícito
+
+def _erro_variedade(num_excesso, aresta, num_faces) -> ValueError: # Mensagem única para os motores serial e paralelo
+    """Erro de uma malha com 'num_excesso' arestas de mais de duas faces; 'aresta' é a primeira delas.""" # Docstring
+    a, b = aresta # Exemplo mostrado na mensagem
+    return ValueError(f"Malha não-variedade: {num_excesso} aresta(s) com mais de duas faces " # Quantidade
+                      f"(ex.: ({a}, {b}) com {num_faces} faces).") # Exemplo
+
+def verificar_variedade(topologia): # Arestas com mais de duas faces não têm regra de Loop
+    """Levanta ValueError se alguma aresta tiver mais de duas faces (malha não-variedade).""" # Docstring
+    excesso = np.flatnonzero(topologia.num_faces_aresta > 2) # Arestas não-variedade
+    if len(excesso): # Malha inválida para Loop
+        raise _erro_variedade(len(excesso), topologia.arestas[excesso[0]], topologia.num_faces_aresta[excesso[0]]) # Primeira aresta problemática
+
+def arestas_afiadas(topologia, vincos=None) -> np.ndarray: # Bordas e vincos marcados
+    """ # Início da docstring
+    Retorna (E,) bool: arestas de borda (uma face) ou marcadas em 'vincos' (K, 2). Valida a variedade da malha. # Objetivo principal
+    Ímpares em arestas afiadas usam o ponto médio; pares com 2 arestas afiadas usam 3/4 v + 1/8 (b1 + b2) # Regra de vinco
+    e pares com mais de 2 (cantos) ficam fixos. # Regra de canto
+    """ # Fim da docstring
+    verificar_variedade(topologia) # Falha cedo em arestas com 3 ou mais faces
+    afiada = topologia.num_faces_aresta != 2 # Bordas
+    if vincos is not None and len(vincos): # Vincos marcados pelo usuário
+        afiada[_ids_arestas(topologia, vincos)] = True # Arestas internas tratadas como borda
+    return afiada # Máscara por aresta
+
+def refinar_vincos(vincos, topologia, num_vertices) -> np.ndarray: # Vincos do próximo nível
+    """Cada vinco (a, b) da aresta e vira (a, m) e (m, b), com m = num_vertices + e (mesma convenção de 'refinar_faces').""" # Docstring
+    if vincos is None or not len(vincos): # Sem vincos marcados
+        return np.empty((0, 2), dtype=np.int64) # Nada a propagar
+    ids = _ids_arestas(topologia, vincos) # Aresta de cada vinco
+    return _metades_vincos(topologia.arestas[ids], ids, num_vertices) # Duas metades por vinco
+
+def _metades_vincos(extremos, ids, num_vertices) -> np.ndarray: # (a, b) da aresta e -> (a, m), (m, b)
+    """Metades dos vincos com extremidades ordenadas 'extremos' (K, 2) e arestas 'ids' (K,), na ordem dada.""" # Docstring
+    a, b = np.asarray(extremos, dtype=np.int64).reshape(-1, 2).T # Extremidades (menor, maior)
+    meio = num_vertices + np.asarray(ids, dtype=np.int64) # Vértice ímpar da aresta
+    return np.stack([np.stack([a, meio], axis=1), np.stack([meio, b], axis=1)], axis=1).reshape(-1, 2) # Duas metades por vinco
+
+def refinar_faces(faces, num_vertices, face_arestas) -> np.ndarray: # Nova topologia 1 -> 4
+    """ # Início da docstring
+    Gera as faces do próximo nível: cada triângulo v1-v2-v3 vira 4. # Objetivo principal
+    O vértice ímpar da aresta e recebe o índice num_vertices + e; a ordem é a do motor de referência. # Convenção de índices
+    """ # Fim da docstring
+    a, b, c = (num_vertices + np.asarray(face_arestas, dtype=np.int64)).reshape(-1, 3).T # Novos pontos em (v1,v2), (v2,v3), (v3,v1)
+    v1, v2, v3 = np.asarray(faces).T # Vértices originais de cada triângulo
+    return np.stack([ # 4 triângulos por face original
+        np.stack([v1, a, c], axis=1), # Triângulo do "canto" v1
+        np.stack([v2, b, a], axis=1), # Triângulo do "canto" v2
+        np.stack([v3, c, b], axis=1), # Triângulo do "canto" v3
+        np.stack([a, b, c], axis=1), # Triângulo central (invertido)
+    ], axis=1).reshape(-1, 3) # Intercala os 4 filhos de cada face
+
+def subdividir_arrays(vertices, faces, topologia, vincos=None, instrumentacao=None): # Um passo de Loop sobre arrays
+    """ # Início da docstring
+    Aplica um passo de Loop a 'vertices' (N, D) com a conectividade 'topologia' e retorna (novos_vertices, novas_faces). # Objetivo principal
+    D é livre: além de posições XYZ, aceita qualquer atributo interpolado pelas mesmas regras. # Uso genérico
+    Bordas e 'vincos' (K, 2) seguem as regras de 'arestas_afiadas'; os vincos do próximo nível vêm de 'refinar_vincos'. # Caso de borda
+    Com 'instrumentacao', emite os estágios 'impares', 'pares' e 'faces'. # Medição opcional
+    """ # Fim da docstring
+    num_vertices = len(vertices) # Quantidade de vértices originais (even vertices)
+    arestas = topologia.arestas # (E, 2) vértices de cada aresta, na ordem de 'obter_arestas'
+    num_arestas = topologia.num_arestas # Total de arestas únicas
+    id_aresta = topologia.face_arestas.reshape(-1) # Índice da aresta de cada semi-aresta (v1,v2), (v2,v3), (v3,v1)
+    oposto = faces[:, [2, 0, 1]].reshape(-1) # Vértice da face que não pertence à semi-aresta
+
+    # 1. Calcular Novos Vértices nas Arestas (Odd Vertices)
+    with estagio(instrumentacao, "impares", arestas=num_arestas): # Um novo vértice por aresta
+        afiada = arestas_afiadas(topologia, vincos) # Bordas e vincos (valida a variedade)
+        v1, v2 = vertices[arestas[:, 0]], vertices[arestas[:, 1]] # Extremidades de cada aresta (gather)
+        tipo = vertices.dtype # Precisão de trabalho (bincount acumula em float64 e o resultado volta para ela)
+        soma_opostos = somar_por_indice(id_aresta, vertices[oposto], num_arestas).astype(tipo) # v3 + v4 acumulados por aresta
+        interna = ~afiada[:, np.newaxis] # Arestas suaves compartilhadas por duas faces
+        novos_impares = np.where(interna, # Regra de Loop para arestas internas, ponto médio nas afiadas
+                                 (3/8) * (v1 + v2) + (1/8) * soma_opostos, # 3/8 * (v1 + v2) + 1/8 * (v3 + v4)
+                                 0.5 * (v1 + v2)) # Borda ou vinco: média simples
+
+    # 2. Atualizar Vértices Originais (Even Vertices)
+    with estagio(instrumentacao, "pares", vertices=num_vertices): # Um vértice atualizado por vértice original
+        n = topologia.valencia # Valência de cada vértice
+        soma_vizinhos = (somar_por_indice(arestas[:, 0], v2, num_vertices).astype(tipo) + # Vizinho 'maior' somado ao 'menor'
+                         somar_por_indice(arestas[:, 1], v1, num_vertices).astype(tipo)) # Vizinho 'menor' somado ao 'maior'
+        beta = pesos_beta(n).astype(tipo)[:, np.newaxis] # Peso beta de Loop (0 para vértices sem vizinhos)
+        novos_pares = (1 - n.astype(tipo)[:, np.newaxis] * beta) * vertices + beta * soma_vizinhos # (1 - n*beta) * v + beta * soma
+        if afiada.any(): # Bordas ou vincos: regras de vinco e de canto
+            extremos = arestas[afiada] # Apenas as arestas afiadas
+            num_afiadas = np.bincount(extremos.reshape(-1), minlength=num_vertices)[:, np.newaxis] # Arestas afiadas por vértice
+            soma_afiadas = (somar_por_indice(extremos[:, 0], v2[afiada], num_vertices).astype(tipo) + # Vizinhos b1 + b2
+                            somar_por_indice(extremos[:, 1], v1[afiada], num_vertices).astype(tipo)) # ao longo do vinco
+            novos_pares = np.where(num_afiadas == 2, (3/4) * vertices + (1/8) * soma_afiadas, novos_pares) # Vinco ou borda
+            novos_pares = np.where(num_afiadas > 2, vertices, novos_pares) # Canto: fica fixo
+
+    # 3. Gerar Novas Faces
+    with estagio(instrumentacao, "faces", faces=4 * len(faces)): # Quatro filhos por face
+        novas_faces = refinar_faces(faces, num_vertices, topologia.face_arestas) # Mesma ordem do motor de referência
+    return np.concatenate([novos_pares, novos_impares]), novas_faces # Vértices pares seguidos dos ímpares
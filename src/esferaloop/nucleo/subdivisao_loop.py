@@ -1,33 +1,185 @@
+import os # Montagem dos caminhos das imagens geradas em lote
 import numpy as np # Importa NumPy para cálculos matemáticos e manipulação de vetores
-from esferaloop.nucleo.malha import Malha # Importa a classe Malha para gerenciar a geometria
-from esferaloop.visualizacao.renderizador import Visualizador # Importa o Visualizador para exibir a malha
-from esferaloop.utilitarios.metricas import obter_metricas_malha, exibir_tabela_estatisticas # Importa funções de análise
+from esferaloop.nucleo.malha import Malha, PRECISOES # Importa a classe Malha para gerenciar a geometria
+from esferaloop.nucleo.regras_loop import subdividir_arrays, refinar_vincos, verificar_variedade # Regras de Loop compartilhadas entre os motores
+from esferaloop.nucleo.operador import CACHE_PADRAO # Cache compartilhado de operadores esparsos
+from esferaloop.nucleo import limite # Superfície limite de Loop (máscaras de limite e avaliação exata)
+from esferaloop.nucleo.adaptativo import subdividir_adaptativo # Refinamento adaptativo guiado pelo erro
+from esferaloop.nucleo.paralelo import subdividir_paralelo # Motor em vários processos com memória compartilhada
+from esferaloop.nucleo.instrumentacao import estagio # Estágios medidos (sem custo quando não há instrumentação)
+from concurrent.futures import ProcessPoolExecutor # Pool reaproveitado entre os níveis no motor paralelo
+from contextlib import contextmanager # Pool do motor paralelo mantido durante um percurso de níveis
+# Visualização (Matplotlib) e métricas são importadas dentro dos métodos que as usam: o núcleo carrega só com NumPy
 
 class SubdivisaoLoopEsfera: # Define a classe principal que coordena a subdivisão da esfera
     """ # Início da docstring da classe
     Implementação do algoritmo de subdivisão de Loop para malhas triangulares. # Explica o propósito do algoritmo
     Transforma uma malha grossa em uma superfície suave através de refinamento iterativo. # Detalha o processo de suavização
+    Parte do icosaedro ou de 'malha_base' (qualquer malha triangular variedade, com bordas e 'vincos' opcionais). # Malha inicial
     """ # Fim da docstring
-    def __init__(self, niveis_subdivisao=2, normalizar_cada_passo=False): # Inicializa o processo com níveis e opção de normalização
+    MOTORES = ("vetorizado", "referencia", "esparso", "paralelo") # NumPy puro, laço Python original (conferência), operador esparso em cache ou vários processos (experimental)
+    MOTORES_EXPERIMENTAIS = ("paralelo",) # Resultado idêntico, mas sem aceleração medida: num único núcleo fica em 0,42-0,48x do vetorizado
+
+    def __init__(self, niveis_subdivisao=2, normalizar_cada_passo=False, motor="vetorizado", cache_operadores=None, num_processos=None,
+                 preguicoso=False, retencao="todos", cache_niveis=None, precisao="float64", malha_base=None,
+                 instrumentacao=None): # Inicializa o processo com níveis e opção de normalização
+        if motor not in self.MOTORES: # Valida o nome do motor antes de qualquer processamento
+            raise ValueError(f"Motor desconhecido: {motor!r}. Use um de {self.MOTORES}.") # Erro explícito para nomes inválidos
         self.niveis = niveis_subdivisao # Armazena a quantidade de vezes que a malha será subdividida
         self.normalizar_cada_passo = normalizar_cada_passo # Define se a malha deve ser projetada na esfera em cada passo
-        self.malhas = [] # Cria uma lista vazia para armazenar as malhas de cada nível de detalhe
-        self.executar() # Chama o método que inicia a execução do algoritmo
+        if precisao not in PRECISOES: # Valida a precisão pedida
+            raise ValueError(f"Precisão inválida: {precisao!r}. Use um de {tuple(PRECISOES)}.") # Erro explícito
+        self.motor = motor # Guarda qual implementação de 'subdividir' será usada
+        self.precisao = precisao # float32/int32 ou float64/int64, mantida em todos os níveis
+        self.cache_operadores = cache_operadores if cache_operadores is not None else CACHE_PADRAO # Operadores por conectividade
+        self.num_processos = num_processos # Processos do motor paralelo (padrão: todos os núcleos)
+        self._executor = None # Pool ativo durante um percurso de níveis (_pool_paralelo) no motor paralelo
+        if not (retencao in ("todos", "ultimo") or (isinstance(retencao, int) and not isinstance(retencao, bool) and retencao >= 0)): # Valida a política (bool não é limite em bytes)
+            raise ValueError(f"Retenção inválida: {retencao!r}. Use 'todos', 'ultimo' ou um limite em bytes.") # Erro explícito
+        self.retencao = retencao # Quais níveis ficam guardados em memória depois de calculados
+        self._retidas = {} # nível -> Malha, na ordem em que foram calculados
+        self.cache_niveis = cache_niveis # Cache persistente opcional (utilitarios.cache_niveis.CacheNiveis)
+        if malha_base is not None: # Malha fornecida pelo usuário (ex.: 'carregar_obj')
+            verificar_variedade(malha_base.topologia) # Falha cedo em arestas com mais de duas faces
+        self.malha_base = malha_base # None: icosaedro
+        self._chave_base = None if cache_niveis is None else cache_niveis.chave_malha(self._malha_inicial()) # Hash da base, uma vez (a normalização entra na chave de cada nível)
+        self.instrumentacao = instrumentacao # Eventos por estágio, perfil e modo silencioso (nucleo.instrumentacao.Instrumentacao)
+        if not preguicoso: # Comportamento padrão: calcula todos os níveis já no construtor
+            self.executar() # Chama o método que inicia a execução do algoritmo
+
+    @property # Lista de todos os níveis (calculados sob demanda)
+    def malhas(self) -> list: # Mantém a interface original baseada em lista
+        """ # Início da docstring
+        Malhas de todos os níveis, do 0 ao final. # O que é retornado
+        Níveis descartados pela política de retenção são recalculados; prefira 'iterar_niveis' para processar em fluxo. # Custo
+        """ # Fim da docstring
+        with self._pool_paralelo(): # Um único pool para todos os níveis que faltarem
+            return [self.obter_malha(k) for k in range(self.niveis + 1)] # Um item por nível
 
-    def executar(self) -> list: # Método que coordena a execução sequencial das subdivisões
+    def executar(self) -> Malha: # Método que coordena a execução sequencial das subdivisões
         """Executa a subdivisão até o nível desejado começando de um icosaedro.""" # Docstring do método
-        malha = Malha.gerar_icosaedro() # Gera a malha inicial do icosaedro (Nível 0)
+        for malha in self.iterar_niveis(): # Percorre todos os níveis, guardando conforme a retenção
+            pass # Cada nível já é retido dentro do gerador
+        return malha # Retorna a malha final (a mais refinada de todas)
+
+    def iterar_niveis(self): # Gerador: um nível por vez
+        """ # Início da docstring
+        Produz as malhas dos níveis 0..niveis, uma de cada vez. # Objetivo principal
+        Níveis já retidos são reaproveitados; os demais são calculados a partir do anterior e retidos conforme 'retencao'. # Reuso
+        Com retencao='ultimo', apenas a malha corrente fica em memória durante a iteração. # Uso em fluxo
+        """ # Fim da docstring
+        try: # Restaura o nível da instrumentação ao final (ou ao fechar o gerador)
+            with self._pool_paralelo(self.niveis > 0): # Um único pool de processos para todos os níveis
+                yield from self._percorrer_niveis() # Níveis 0..niveis
+        finally: # Eventos emitidos depois da iteração não herdam o último nível
+            if self.instrumentacao is not None: # Só há nível a restaurar com instrumentação
+                self.instrumentacao.nivel = None # Mesmo estado de uma Instrumentacao nova
+
+    def _percorrer_niveis(self): # Corpo de 'iterar_niveis', com o pool já disponível
+        """Produz cada nível, reaproveitando os retidos e retendo os calculados.""" # Docstring
+        malha = None # Malha do nível anterior
+        for k in range(self.niveis + 1): # Nível base e cada subdivisão
+            if self.instrumentacao is not None: # Nível copiado para os eventos
+                self.instrumentacao.nivel = k # Vale também para o que o chamador medir antes do próximo nível
+            if k in self._retidas: # Já calculado e ainda em memória
+                malha = self._retidas[k] # Reaproveita sem recalcular
+            else: # Precisa calcular
+                malha = self._malha_base() if k == 0 else self._proximo_nivel(malha, k - 1) # Base ou um passo de Loop
+                self._reter(k, malha) # Aplica a política de retenção
+            yield malha # Entrega o nível ao chamador
+
+    @contextmanager # Uso: with self._pool_paralelo(): ... (vários passos de 'subdividir')
+    def _pool_paralelo(self, necessario=True): # Pool de processos compartilhado pelos passos de um percurso
+        """ # Início da docstring
+        No motor paralelo, cria um pool para o bloco 'with' e o encerra ao sair; os passos feitos dentro dele # Objetivo principal
+        ('iterar_niveis', 'obter_malha', 'malhas') o reaproveitam em vez de criar um pool por nível. # Reuso
+        Sem efeito em outros motores, se 'necessario' for falso ou se um pool já estiver ativo (blocos aninhados). # Casos neutros
+        """ # Fim da docstring
+        if self.motor != "paralelo" or not necessario or self._executor is not None: # Nada a criar
+            yield # O pool externo (se houver) continua valendo
+            return # Nada a encerrar
+        self._executor = ProcessPoolExecutor(max_workers=self.num_processos) # Evita recriar processos a cada nível
+        try: # Garante o encerramento do pool
+            yield # Passos de subdivisão
+        finally: # Encerra o pool criado acima
+            self._executor.shutdown() # Finaliza os processos
+            self._executor = None # Chamadas avulsas de 'subdividir' criam um pool temporário
+
+    def obter_malha(self, nivel=-1) -> Malha: # Acesso a um nível específico
+        """ # Início da docstring
+        Retorna a malha do nível pedido (negativos contam a partir do final, como em listas). # Convenção de índices
+        Se o nível não estiver retido, calcula a partir do maior nível retido abaixo dele. # Cálculo sob demanda
+        """ # Fim da docstring
+        nivel = nivel + self.niveis + 1 if nivel < 0 else nivel # Converte índices negativos
+        if not 0 <= nivel <= self.niveis: # Fora do intervalo calculável
+            raise IndexError(f"Nível {nivel} fora do intervalo 0..{self.niveis}.") # Mesmo tipo de erro de uma lista
+        if nivel in self._retidas: # Já disponível
+            return self._retidas[nivel] # Sem cálculo
+        inicio = max((k for k in self._retidas if k < nivel), default=None) # Ponto de partida mais próximo
+        malha = self._malha_base() if inicio is None else self._retidas[inicio] # Nível inicial
+        inicio = 0 if inicio is None else inicio # Nível correspondente a 'malha'
+        if inicio == 0: # A base recém-gerada também é retida
+            self._reter(0, malha) # Política de retenção
+        with self._pool_paralelo(inicio < nivel): # Um único pool para todos os passos que faltam
+            for k in range(inicio, nivel): # Passos que faltam
+                malha = self._proximo_nivel(malha, k) # Um passo de Loop
+                self._reter(k + 1, malha) # Política de retenção
+        return malha # Malha do nível pedido
+
+    def _malha_inicial(self) -> Malha: # Nível 0 antes da normalização
+        """Gera a malha inicial (icosaedro ou cópia de 'malha_base') na precisão configurada.""" # Docstring
+        if self.malha_base is None: # Caso padrão
+            return Malha.gerar_icosaedro(self.precisao) # Gera a malha inicial do icosaedro (Nível 0)
+        return Malha(self.malha_base.vertices, self.malha_base.faces, precisao=self.precisao, vincos=self.malha_base.vincos) # Cópia: a normalização é feita no lugar
+
+    def _malha_base(self) -> Malha: # Nível 0
+        """Gera a malha inicial (icosaedro ou cópia de 'malha_base'), normalizada se solicitado.""" # Docstring
+        malha = self._malha_inicial() # Icosaedro ou cópia da base
         if self.normalizar_cada_passo: # Verifica se a normalização inicial foi solicitada
             malha = self.normalizar_para_esfera(malha) # Ajusta os vértices iniciais para ficarem sobre a esfera
-        self.malhas.append(malha) # Adiciona a malha inicial à lista de níveis
+        return malha # Malha do nível 0
 
-        for k in range(self.niveis): # Itera de acordo com o número de níveis solicitados
-            print(f"Subdividindo nível {k} -> {k+1}...") # Exibe mensagem de progresso no console
+    def _proximo_nivel(self, malha: Malha, k) -> Malha: # Nível k -> k+1
+        """Aplica um passo de subdivisão (e a normalização, se ativa) à malha do nível k.""" # Docstring
+        if self.cache_niveis is not None: # Tenta reaproveitar um nível calculado em outra execução
+            chave = (self._chave_base, k + 1, self.normalizar_cada_passo, malha.vertices.dtype) # Identificação do nível
+            em_cache = self.cache_niveis.obter(*chave) # Busca em disco
+            if em_cache is not None: # Acerto: nenhum cálculo necessário
+                return em_cache # Malha mapeada do disco
+        self._progresso(f"Subdividindo nível {k} -> {k+1}...") # Exibe mensagem de progresso no console
+        nivel_anterior = None if self.instrumentacao is None else self.instrumentacao.nivel # Restaurado ao final do passo
+        if self.instrumentacao is not None: # Eventos deste passo levam o nível calculado (também via 'obter_malha')
+            self.instrumentacao.nivel = k + 1 # Mesmo número usado por 'iterar_niveis'
+        try: # Restaura o nível mesmo se o passo falhar
             malha = self.subdividir(malha) # Aplica uma iteração do algoritmo de Loop na malha atual
             if self.normalizar_cada_passo: # Verifica se deve normalizar após esta subdivisão
                 malha = self.normalizar_para_esfera(malha) # Reprojeta os novos pontos na superfície da esfera
-            self.malhas.append(malha) # Salva a nova malha refinada na lista de níveis
-        return self.malhas[-1] # Retorna a malha final (a mais refinada de todas)
+        finally: # Fora do passo, vale o nível de quem chamou (None fora de 'iterar_niveis')
+            if self.instrumentacao is not None: # Só há nível a restaurar com instrumentação
+                self.instrumentacao.nivel = nivel_anterior # Nível anterior ao passo
+        if self.cache_niveis is not None: # Guarda para as próximas execuções
+            self.cache_niveis.guardar(*chave, malha) # Gravação atômica
+        return malha # Malha do nível k+1
+
+    def _progresso(self, mensagem): # Mensagens de progresso no console
+        """Imprime a mensagem, ou a entrega à instrumentação (que a suprime no modo silencioso).""" # Docstring
+        if self.instrumentacao is None: # Comportamento padrão
+            print(mensagem) # Saída no console
+        else: # Modo silencioso respeitado
+            self.instrumentacao.progresso(mensagem) # Decide se imprime
+
+    def _reter(self, nivel, malha): # Política de retenção dos níveis calculados
+        """Guarda a malha e descarta níveis antigos conforme 'retencao'.""" # Docstring
+        self._retidas[nivel] = malha # Guarda o nível recém-calculado
+        if self.retencao == "todos": # Mantém tudo
+            return # Nada a descartar
+        if self.retencao == "ultimo": # Apenas o nível mais recente
+            self._retidas = {nivel: malha} # Descarta todos os outros
+            return # Política aplicada
+        tamanho = lambda m: m.vertices.nbytes + m.faces.nbytes # Bytes ocupados por uma malha
+        while len(self._retidas) > 1 and sum(tamanho(m) for m in self._retidas.values()) > self.retencao: # Acima do orçamento
+            mais_antigo = next(k for k in self._retidas if k != nivel) # Primeiro calculado (exceto o atual)
+            del self._retidas[mais_antigo] # Libera o nível mais antigo
 
     def subdividir(self, malha: Malha) -> Malha: # O "coração" do algoritmo: aplica as regras de Loop
         """ # Início da docstring
@@ -36,109 +188,283 @@ class SubdivisaoLoopEsfera: # Define a classe principal que coordena a subdivis
         2. Atualiza 'even vertices' (originais). # Passo 2: suavizar pontos antigos
         3. Reconecta para formar 4 novos triângulos por face original. # Passo 3: nova topologia
         """ # Fim da docstring
+        if self.motor == "referencia": # Motor original em Python puro, mantido como referência
+            return self._subdividir_referencia(malha) # Executa o laço aresta a aresta
+        if self.motor == "paralelo": # Blocos espaciais processados em vários núcleos
+            return subdividir_paralelo(malha, self.num_processos, executor=self._executor, instrumentacao=self.instrumentacao) # Mesmo resultado do motor serial
+        if self.motor == "esparso": # Operador linear pré-calculado para esta conectividade
+            with estagio(self.instrumentacao, "arestas", faces=len(malha.faces)): # Topologia embutida na construção do operador
+                operador = self.cache_operadores.obter(malha.faces, len(malha.vertices), 1, malha.vincos) # Passo único em cache
+            with estagio(self.instrumentacao, "vertices", vertices=operador.passos[-1].shape[0]): # Ímpares e pares em um produto
+                vertices = operador.aplicar(malha.vertices) # Novas posições via S @ V
+            return Malha(vertices, operador.faces[-1], precisao=malha.precisao, vincos=operador.vincos[-1]) # Malha do próximo nível
+        return self._subdividir_vetorizado(malha) # Caso padrão: motor vetorizado em NumPy
+
+    def subdividir_esparso(self, malha: Malha, niveis=None) -> Malha: # Vários níveis de uma vez via matriz esparsa
+        """ # Início da docstring
+        Subdivide 'malha' em 'niveis' passos (padrão: self.niveis) usando o operador esparso em cache. # Objetivo principal
+        A topologia só é processada na primeira chamada para cada conectividade; depois é apenas S_k @ V. # Ganho principal
+        Respeita 'normalizar_cada_passo' da mesma forma que 'executar'. # Equivalência com o caminho iterativo
+        """ # Fim da docstring
+        niveis = self.niveis if niveis is None else niveis # Nível final desejado
+        operador = self.cache_operadores.obter(malha.faces, len(malha.vertices), niveis, malha.vincos) # Busca ou constrói S_1..S_k
+        vertices = operador.aplicar(malha.vertices, self.normalizar_cada_passo) # Novas posições
+        return Malha(vertices, operador.faces[-1], precisao=malha.precisao, vincos=operador.vincos[-1]) # Malha do nível final
+
+    def subdividir_lote(self, vertices_lote, faces, niveis=None, vincos=None) -> tuple: # Muitas malhas com a mesma conectividade
+        """ # Início da docstring
+        Subdivide B malhas que compartilham 'faces' de uma só vez. # Objetivo principal
+        Recebe vértices (B, N, 3) e retorna (vértices (B, N_k, 3), faces (F_k, 3)) do nível k; 'vincos' valem para todo o lote. # Formatos de entrada e saída
+        A topologia é processada uma única vez e a aritmética é um único produto esparso S_k @ [V_1 ... V_B]. # Ganho principal
+        """ # Fim da docstring
+        vertices_lote = np.asarray(vertices_lote, dtype=PRECISOES[self.precisao][0]) # Garante a precisão configurada
+        if vertices_lote.ndim != 3 or vertices_lote.shape[2] != 3: # Valida o formato (B, N, 3)
+            raise ValueError(f"Esperado vértices no formato (B, N, 3), recebido {vertices_lote.shape}.") # Erro explícito
+        niveis = self.niveis if niveis is None else niveis # Nível final desejado
+        num_malhas, num_vertices, _ = vertices_lote.shape # Dimensões do lote
+        faces = np.asarray(faces) # Conectividade comum a todo o lote
+        if faces.ndim != 2 or faces.shape[1] != 3: # Valida o formato (F, 3)
+            raise ValueError(f"Esperado faces no formato (F, 3), recebido {faces.shape}.") # Erro explícito
+        if faces.size and (faces.min() < 0 or faces.max() >= num_vertices): # Índices fora dos N vértices de cada malha
+            raise ValueError(f"Faces referenciam vértices de {faces.min()} a {faces.max()}, mas cada malha do lote tem " # Erro explícito
+                             f"{num_vertices} vértices.") # Faces e vértices de malhas diferentes
+        operador = self.cache_operadores.obter(faces, num_vertices, niveis, vincos) # Operador compartilhado por todo o lote
+        colunas = vertices_lote.transpose(1, 0, 2).reshape(num_vertices, 3 * num_malhas) # (N, 3B): cada malha em 3 colunas
+        resultado = operador.aplicar(colunas, self.normalizar_cada_passo) # Um único produto para todas as malhas
+        faces_finais = operador.faces[-1].astype(PRECISOES[self.precisao][1], copy=False) # Índices na precisão configurada
+        return resultado.reshape(-1, num_malhas, 3).transpose(1, 0, 2), faces_finais # De volta para (B, N_k, 3)
+
+    def _subdividir_vetorizado(self, malha: Malha) -> Malha: # Mesmas regras de Loop, sem laços Python
+        """ # Início da docstring
+        Versão vetorizada de 'subdividir'. # Objetivo principal
+        Produz os mesmos vértices (na mesma ordem) e as mesmas faces do motor de referência. # Garantia de equivalência
+        """ # Fim da docstring
+        vertices = malha.vertices # Obtém os pontos (coordenadas) da malha atual
+        faces = malha.faces # Obtém a conectividade (triângulos) da malha atual
+        with estagio(self.instrumentacao, "arestas", faces=len(faces)): # Extração da topologia (em cache na malha)
+            topologia = malha.topologia # Arestas, faces adjacentes e vizinhança
+        novos_vertices, novas_faces = subdividir_arrays(vertices, faces, topologia, malha.vincos, self.instrumentacao) # Regras de Loop sobre arrays
+        novos_vincos = refinar_vincos(malha.vincos, topologia, len(vertices)) # Vincos do próximo nível
+        return Malha(novos_vertices, novas_faces, precisao=malha.precisao, vincos=novos_vincos) # Retorna a nova malha completa
+
+    @staticmethod # Não depende da instância
+    def _arestas_por_laco(faces) -> dict: # Laço original de 'obter_arestas', mantido no motor de referência
+        """Mapeia cada aresta (tupla ordenada) às faces adjacentes, face a face, sem passar por 'Malha.topologia'.""" # Docstring
+        arestas = {} # Inicializa um dicionário vazio para armazenar as arestas
+        for idx_face, face in enumerate(faces): # Itera sobre cada face da malha, mantendo o índice (idx_face)
+            for i in range(3): # Cada face triangular possui 3 arestas, itera por elas
+                v1, v2 = face[i], face[(i + 1) % 3] # Pega dois vértices consecutivos para formar uma aresta (cicla 0-1, 1-2, 2-0)
+                aresta = tuple(sorted((v1, v2))) # Ordena os índices e cria uma tupla para que a aresta (1,2) seja igual a (2,1)
+                if aresta not in arestas: # Verifica se esta aresta já foi registrada no dicionário
+                    arestas[aresta] = [] # Se for nova, cria uma lista vazia para armazenar as faces que a compartilham
+                arestas[aresta].append(idx_face) # Adiciona o índice da face atual à lista de faces adjacentes a esta aresta
+        return arestas # Retorna o dicionário completo com todas as arestas e suas faces vizinhas
+
+    def _subdividir_referencia(self, malha: Malha) -> Malha: # Implementação original, aresta por aresta
+        """Motor de referência em Python puro (lento), usado para conferir o motor vetorizado.""" # Docstring
         vertices = malha.vertices # Obtém os pontos (coordenadas) da malha atual
         faces = malha.faces # Obtém a conectividade (triângulos) da malha atual
-        arestas_dict = malha.obter_arestas() # Obtém o mapa de arestas e suas faces vizinhas
+        with estagio(self.instrumentacao, "arestas", faces=len(faces)): # Extração das arestas e faces adjacentes
+            arestas_dict = self._arestas_por_laco(faces) # Mapa de arestas montado sem a topologia em cache (conferência independente)
+        vincos = [tuple(sorted((int(a), int(b)))) for a, b in malha.vincos] # Vincos marcados, como arestas ordenadas
+        for aresta in vincos: # Cada vinco precisa ser uma aresta existente
+            if aresta not in arestas_dict: # Par de vértices sem aresta
+                raise ValueError(f"Vinco {aresta} não é uma aresta da malha.") # Mesmo erro do motor vetorizado
+        conjunto_vincos = set(vincos) # Consulta rápida
 
         # 1. Calcular Novos Vértices nas Arestas (Odd Vertices) # Cabeçalho do primeiro passo
-        novos_vertices = list(vertices) # Começa a nova lista de vértices copiando os originais
-        aresta_para_novo_vertice = {} # Mapa para saber qual novo vértice pertence a qual aresta
-
-        for aresta, faces_adjacentes in arestas_dict.items(): # Itera sobre cada aresta única da malha
-            v1_idx, v2_idx = aresta # Identifica os dois vértices que formam a aresta
-            v1, v2 = vertices[v1_idx], vertices[v2_idx] # Pega as coordenadas XYZ desses vértices
-
-            # Se a aresta for compartilhada por duas faces (malha fechada) # Regra para arestas internas
-            if len(faces_adjacentes) == 2: # Se houver dois triângulos vizinhos a esta aresta
-                # Encontrar os vértices opostos nas duas faces # Precisamos deles para a fórmula de peso
-                vertices_opostos = [] # Lista para guardar os dois vértices "da ponta" dos triângulos
-                for idx_face in faces_adjacentes: # Itera pelas duas faces adjacentes
-                    face = faces[idx_face] # Pega os 3 índices da face
-                    for idx_v in face: # Itera pelos vértices da face
-                        if idx_v not in aresta: # Se o vértice não fizer parte da aresta atual, ele é o oposto
-                            vertices_opostos.append(vertices[idx_v]) # Guarda a coordenada do vértice oposto
-                            break # Sai do loop interno pois já achou o oposto desta face
-
-                v3, v4 = vertices_opostos[0], vertices_opostos[1] # Nomeia os vértices opostos como v3 e v4
-                # Regra do Loop para odd vertices: 3/8 * (v1 + v2) + 1/8 * (v3 + v4) # Fórmula matemática
-                novo_v = (3/8) * (v1 + v2) + (1/8) * (v3 + v4) # Calcula a posição do novo ponto na aresta
-            else: # Caso a aresta tenha apenas 1 face (bordas da malha)
-                # Caso de borda (não esperado para uma esfera/icosaedro, mas bom para robustez) # Tratamento de exceção
-                novo_v = 0.5 * (v1 + v2) # Em bordas, o novo ponto é apenas a média simples (ponto médio)
-
-            aresta_para_novo_vertice[aresta] = len(novos_vertices) # Registra o índice que este novo vértice terá
-            novos_vertices.append(novo_v) # Adiciona o novo vértice à lista global
+        with estagio(self.instrumentacao, "impares", arestas=len(arestas_dict)): # Novos pontos nas arestas
+            novos_vertices = list(vertices) # Começa a nova lista de vértices copiando os originais
+            aresta_para_novo_vertice = {} # Mapa para saber qual novo vértice pertence a qual aresta
+
+            for aresta, faces_adjacentes in arestas_dict.items(): # Itera sobre cada aresta única da malha
+                v1_idx, v2_idx = aresta # Identifica os dois vértices que formam a aresta
+                v1, v2 = vertices[v1_idx], vertices[v2_idx] # Pega as coordenadas XYZ desses vértices
+
+                if len(faces_adjacentes) > 2: # Aresta não-variedade: Loop não tem regra para ela
+                    raise ValueError(f"Malha não-variedade: aresta {aresta} com {len(faces_adjacentes)} faces.") # Erro explícito
+
+                # Se a aresta for compartilhada por duas faces e não for um vinco # Regra para arestas internas
+                if len(faces_adjacentes) == 2 and aresta not in conjunto_vincos: # Se houver dois triângulos vizinhos a esta aresta
+                    # Encontrar os vértices opostos nas duas faces # Precisamos deles para a fórmula de peso
+                    vertices_opostos = [] # Lista para guardar os dois vértices "da ponta" dos triângulos
+                    for idx_face in faces_adjacentes: # Itera pelas duas faces adjacentes
+                        face = faces[idx_face] # Pega os 3 índices da face
+                        for idx_v in face: # Itera pelos vértices da face
+                            if idx_v not in aresta: # Se o vértice não fizer parte da aresta atual, ele é o oposto
+                                vertices_opostos.append(vertices[idx_v]) # Guarda a coordenada do vértice oposto
+                                break # Sai do loop interno pois já achou o oposto desta face
+
+                    v3, v4 = vertices_opostos[0], vertices_opostos[1] # Nomeia os vértices opostos como v3 e v4
+                    # Regra do Loop para odd vertices: 3/8 * (v1 + v2) + 1/8 * (v3 + v4) # Fórmula matemática
+                    novo_v = (3/8) * (v1 + v2) + (1/8) * (v3 + v4) # Calcula a posição do novo ponto na aresta
+                else: # Caso a aresta tenha apenas 1 face (bordas da malha) ou seja um vinco
+                    novo_v = 0.5 * (v1 + v2) # Em bordas e vincos, o novo ponto é apenas a média simples (ponto médio)
+
+                aresta_para_novo_vertice[aresta] = len(novos_vertices) # Registra o índice que este novo vértice terá
+                novos_vertices.append(novo_v) # Adiciona o novo vértice à lista global
 
         # 2. Atualizar Vértices Originais (Even Vertices) # Passo de suavização dos pontos que já existiam
-        vertices_atualizados = np.copy(np.array(novos_vertices))
-
-        # Mapear adjacência de vértices # Precisamos saber quem é vizinho de quem
-        v_adj = {} # Dicionário para guardar a lista de vizinhos de cada vértice
-        for aresta in arestas_dict.keys(): # Itera por todas as arestas
-            v1, v2 = aresta # Pega os dois vértices da aresta
-            if v1 not in v_adj: v_adj[v1] = [] # Se for a primeira vez que vemos v1, inicializa lista
-            if v2 not in v_adj: v_adj[v2] = [] # Se for a primeira vez que vemos v2, inicializa lista
-            v_adj[v1].append(v2) # v2 é vizinho de v1
-            v_adj[v2].append(v1) # v1 é vizinho de v2
-
-        for idx_v in range(len(vertices)): # Agora itera apenas pelos vértices originais (índices antigos)
-            vizinhos = v_adj.get(idx_v, []) # Busca a lista de vizinhos do vértice atual
-            n = len(vizinhos) # n é o grau (valência) do vértice
-
-            if n > 0: # Só processa se o vértice tiver vizinhos
-                # Cálculo do peso Beta # Define o quanto os vizinhos influenciam na nova posição
-                if n == 3: # Caso especial para vértices com 3 vizinhos
-                    beta = 3/16 # Valor constante de beta para n=3
-                else: # Caso geral para n > 3
-                    beta = (1/n) * (5/8 - (3/8 + 0.25 * np.cos(2 * np.pi / n))**2) # Fórmula trigonométrica de Loop
-
-                soma_vizinhos = np.sum(vertices[vizinhos], axis=0) # Soma as coordenadas XYZ de todos os vizinhos
-                # Regra: (1 - n*beta) * v_original + beta * sum(v_neighbors) # Fórmula de atualização
-                vertices_atualizados[idx_v] = (1 - n * beta) * vertices[idx_v] + beta * soma_vizinhos # Calcula nova posição
+        with estagio(self.instrumentacao, "pares", vertices=len(vertices)): # Suavização dos vértices originais
+            vertices_atualizados = np.copy(np.array(novos_vertices))
+
+            # Mapear adjacência de vértices # Precisamos saber quem é vizinho de quem
+            v_adj = {} # Dicionário para guardar a lista de vizinhos de cada vértice
+            for aresta in arestas_dict.keys(): # Itera por todas as arestas
+                v1, v2 = aresta # Pega os dois vértices da aresta
+                if v1 not in v_adj: v_adj[v1] = [] # Se for a primeira vez que vemos v1, inicializa lista
+                if v2 not in v_adj: v_adj[v2] = [] # Se for a primeira vez que vemos v2, inicializa lista
+                v_adj[v1].append(v2) # v2 é vizinho de v1
+                v_adj[v2].append(v1) # v1 é vizinho de v2
+            v_afiados = {} # Vizinhos ligados por arestas de borda ou vinco
+            for aresta, faces_adjacentes in arestas_dict.items(): # Itera por todas as arestas
+                if len(faces_adjacentes) != 2 or aresta in conjunto_vincos: # Aresta afiada
+                    v1, v2 = aresta # Pega os dois vértices da aresta
+                    v_afiados.setdefault(v1, []).append(v2) # v2 é vizinho afiado de v1
+                    v_afiados.setdefault(v2, []).append(v1) # v1 é vizinho afiado de v2
+
+            for idx_v in range(len(vertices)): # Agora itera apenas pelos vértices originais (índices antigos)
+                vizinhos = v_adj.get(idx_v, []) # Busca a lista de vizinhos do vértice atual
+                n = len(vizinhos) # n é o grau (valência) do vértice
+                afiados = v_afiados.get(idx_v, []) # Vizinhos ao longo de bordas e vincos
+
+                if len(afiados) > 2: # Canto: três ou mais arestas afiadas
+                    vertices_atualizados[idx_v] = vertices[idx_v] # O vértice fica fixo
+                elif len(afiados) == 2: # Vértice de borda ou de vinco
+                    vertices_atualizados[idx_v] = (3/4) * vertices[idx_v] + (1/8) * np.sum(vertices[afiados], axis=0) # 3/4 v + 1/8 (b1 + b2)
+                elif n > 0: # Só processa se o vértice tiver vizinhos
+                    # Cálculo do peso Beta # Define o quanto os vizinhos influenciam na nova posição
+                    if n == 3: # Caso especial para vértices com 3 vizinhos
+                        beta = 3/16 # Valor constante de beta para n=3
+                    else: # Caso geral para n > 3
+                        beta = (1/n) * (5/8 - (3/8 + 0.25 * np.cos(2 * np.pi / n))**2) # Fórmula trigonométrica de Loop
+
+                    soma_vizinhos = np.sum(vertices[vizinhos], axis=0) # Soma as coordenadas XYZ de todos os vizinhos
+                    # Regra: (1 - n*beta) * v_original + beta * sum(v_neighbors) # Fórmula de atualização
+                    vertices_atualizados[idx_v] = (1 - n * beta) * vertices[idx_v] + beta * soma_vizinhos # Calcula nova posição
 
         # 3. Gerar Novas Faces # Último passo: reconstruir a topologia da malha
-        novas_faces = [] # Lista para as novas faces triangulares (4x mais que antes)
-        for face in faces: # Itera sobre cada triângulo original
-            v1, v2, v3 = face # Identifica os 3 vértices do triângulo original
+        with estagio(self.instrumentacao, "faces", faces=4 * len(faces)): # Reconstrução das faces 1 -> 4
+            novas_faces = [] # Lista para as novas faces triangulares (4x mais que antes)
+            for face in faces: # Itera sobre cada triângulo original
+                v1, v2, v3 = face # Identifica os 3 vértices do triângulo original
+
+                # Obter índices dos novos vértices nas arestas # Busca no mapa que criamos no Passo 1
+                a = aresta_para_novo_vertice[tuple(sorted((v1, v2)))] # Novo ponto entre v1 e v2
+                b = aresta_para_novo_vertice[tuple(sorted((v2, v3)))] # Novo ponto entre v2 e v3
+                c = aresta_para_novo_vertice[tuple(sorted((v3, v1)))] # Novo ponto entre v3 e v1
 
-            # Obter índices dos novos vértices nas arestas # Busca no mapa que criamos no Passo 1
-            a = aresta_para_novo_vertice[tuple(sorted((v1, v2)))] # Novo ponto entre v1 e v2
-            b = aresta_para_novo_vertice[tuple(sorted((v2, v3)))] # Novo ponto entre v2 e v3
-            c = aresta_para_novo_vertice[tuple(sorted((v3, v1)))] # Novo ponto entre v3 e v1
+                # Cada triângulo original v1-v2-v3 vira 4 triângulos: # Divisão geométrica
+                # (v1, a, c), (v2, b, a), (v3, c, b), (a, b, c) # Conectividade dos novos triângulos
+                novas_faces.append([v1, a, c]) # Triângulo do "canto" v1
+                novas_faces.append([v2, b, a]) # Triângulo do "canto" v2
+                novas_faces.append([v3, c, b]) # Triângulo do "canto" v3
+                novas_faces.append([a, b, c]) # Triângulo central (invertido)
 
-            # Cada triângulo original v1-v2-v3 vira 4 triângulos: # Divisão geométrica
-            # (v1, a, c), (v2, b, a), (v3, c, b), (a, b, c) # Conectividade dos novos triângulos
-            novas_faces.append([v1, a, c]) # Triângulo do "canto" v1
-            novas_faces.append([v2, b, a]) # Triângulo do "canto" v2
-            novas_faces.append([v3, c, b]) # Triângulo do "canto" v3
-            novas_faces.append([a, b, c]) # Triângulo central (invertido)
+            novos_vincos = [] # Cada vinco vira duas metades ligadas ao seu novo ponto
+            for v1, v2 in vincos: # Vincos na ordem original
+                meio = aresta_para_novo_vertice[(v1, v2)] # Novo ponto do vinco
+                novos_vincos += [(v1, meio), (meio, v2)] # Metades do vinco
 
-        return Malha(vertices_atualizados, np.array(novas_faces)) # Retorna a nova malha completa
+        return Malha(vertices_atualizados, np.array(novas_faces), precisao=malha.precisao, vincos=novos_vincos) # Retorna a nova malha completa
+
+    def projetar_no_limite(self, nivel=-1) -> Malha: # Vértices de um nível na superfície limite
+        """ # Início da docstring
+        Retorna uma cópia do nível pedido com cada vértice na sua posição limite de Loop (máscara de limite por valência). # Objetivo principal
+        É a superfície que infinitas subdivisões produziriam a partir desse nível, sem o custo de memória de 4x por nível. # Motivação
+        """ # Fim da docstring
+        return limite.projetar_no_limite(self.obter_malha(nivel)) # Nova malha, mesmas faces
+
+    def avaliar_limite(self, faces, baricentricas, nivel=-1): # Pontos arbitrários da superfície limite
+        """ # Início da docstring
+        Avalia posições e normais da superfície limite do nível pedido em (face, coordenadas baricêntricas), em lote. # Objetivo principal
+        Retorna (posicoes, normais), ambos (Q, 3). Ver 'esferaloop.nucleo.limite.avaliar_limite'. # Formato
+        """ # Fim da docstring
+        return limite.avaliar_limite(self.obter_malha(nivel), faces, baricentricas) # Avaliação exata em lote
+
+    def subdividir_adaptativo(self, tolerancia, criterio="raio", max_niveis=None, largura=1024, altura=1024) -> tuple: # Refina só onde o erro exige
+        """ # Início da docstring
+        Refina a malha base apenas nas faces cujo erro passa de 'tolerancia', sem junções em T (vermelho-verde). # Objetivo principal
+        - criterio='raio': desvio geométrico do centroide de cada face; criterio='tela': maior aresta em pixels # Critérios
+          numa imagem 'largura' x 'altura' com a câmera do 'Rasterizador'. # Câmera
+        - Alvo dos novos vértices: a esfera com 'normalizar_cada_passo', senão a superfície limite de Loop # Superfície
+          (só malhas base fechadas e sem vincos; as demais geram ValueError). # Limitação
+        - max_niveis: profundidade máxima (padrão: self.niveis). # Limite
+        Retorna (malha, relatorio); ver 'esferaloop.nucleo.adaptativo.subdividir_adaptativo'. # Formato
+        """ # Fim da docstring
+        from esferaloop.visualizacao.rasterizador import Rasterizador # Importação local (câmera do rasterizador)
+        camera = Rasterizador(largura, altura) if criterio == "tela" else None # Só o critério de tela projeta
+        return subdividir_adaptativo(self._malha_base(), tolerancia, criterio=criterio, # Mesmo nível 0 de 'executar'
+                                     max_niveis=self.niveis if max_niveis is None else max_niveis, # Profundidade
+                                     esfera=self.normalizar_cada_passo, camera=camera) # Alvo e câmera
 
     def normalizar_para_esfera(self, malha: Malha) -> Malha: # Função utilitária para manter a forma circular
         """Normaliza todos os vértices para raio 1 (projeção na esfera).""" # Docstring
-        normas = np.linalg.norm(malha.vertices, axis=1)[:, np.newaxis] # Calcula a distância de cada vértice até a origem
-        malha.vertices /= normas # Divide a posição pela distância (fazendo o raio ser exatamente 1.0)
+        with estagio(self.instrumentacao, "normalizacao", vertices=len(malha.vertices)): # Projeção medida
+            normas = np.linalg.norm(malha.vertices, axis=1)[:, np.newaxis] # Calcula a distância de cada vértice até a origem
+            malha.vertices /= normas # Divide a posição pela distância (fazendo o raio ser exatamente 1.0)
+        malha.invalidar_metricas() # A alteração foi feita no lugar: métricas antigas deixam de valer
         return malha # Retorna a malha modificada
 
     def visualizar(self, nivel=-1, mostrar_wireframe=True, mostrar_superficie=True): # Exibe uma malha específica
         """Visualiza a malha do nível especificado (padrão: último nível).""" # Docstring
-        Visualizador.plotar_malha(self.malhas[nivel], title=f"Esfera Subdividida - Nível {len(self.malhas)-1 if nivel == -1 else nivel}", 
+        nivel = nivel + self.niveis + 1 if nivel < 0 else nivel # Converte índices negativos no número do nível
+        from esferaloop.visualizacao.renderizador import Visualizador # Importação local (carrega o Matplotlib)
+        Visualizador.plotar_malha(self.obter_malha(nivel), title=f"Esfera Subdividida - Nível {nivel}", 
                            mostrar_wireframe=mostrar_wireframe, mostrar_superficie=mostrar_superficie) # Chama o renderizador
         import matplotlib.pyplot as plt # Importa Matplotlib para exibir a janela
         plt.show() # Abre a janela gráfica
 
+    def salvar_imagens(self, diretorio, formato="png", largura=1024, altura=1024, **opcoes) -> list: # Imagens de todos os níveis
+        """ # Início da docstring
+        Renderiza cada nível com o rasterizador por software (sem Matplotlib e sem tela) e grava em 'diretorio'. # Objetivo principal
+        Os níveis são percorridos em fluxo; os arquivos se chamam nivel_<k>.<formato> ('png' ou 'ppm'). # Saída
+        """ # Fim da docstring
+        caminhos = (os.path.join(diretorio, f"nivel_{k}.{formato}") for k in range(self.niveis + 1)) # Um arquivo por nível
+        from esferaloop.visualizacao.rasterizador import Rasterizador # Importação local (renderização sem janela)
+        return Rasterizador(largura, altura).renderizar_lote(self.iterar_niveis(), caminhos, **opcoes) # Caminhos gravados
+
+    def _base_fechada(self) -> bool: # A malha do nível 0 não tem bordas?
+        """O icosaedro é fechado; para 'malha_base', verifica se toda aresta tem duas faces.""" # Docstring
+        if self.malha_base is None: # Icosaedro
+            return True # Sem bordas
+        return bool((self.malha_base.topologia.num_faces_aresta == 2).all()) # Fechada se não houver bordas
+
+    def _metricas(self, malha: Malha, fechada) -> dict: # Métricas de um nível, como estágio medido
+        """'obter_metricas_malha' dentro do estágio 'metricas'.""" # Docstring
+        with estagio(self.instrumentacao, "metricas", faces=len(malha.faces)): # Métricas de qualidade
+            from esferaloop.utilitarios.metricas import obter_metricas_malha # Importação local (métricas sob demanda)
+            return obter_metricas_malha(malha, fechada=fechada) # Memorizadas na malha
+
     def mostrar_progressao(self): # Exibe todos os níveis lado a lado
         """Mostra evolução da subdivisão lado a lado.""" # Docstring
+        from esferaloop.visualizacao.renderizador import Visualizador # Importação local (carrega o Matplotlib)
         Visualizador.mostrar_progressao(self.malhas) # Chama o método de progressão do Visualizador
 
     def exibir_estatisticas(self): # Exibe os dados numéricos de crescimento da malha
         """Exibe métricas de todos os níveis processados.""" # Docstring
-        todas_metricas = [obter_metricas_malha(m) for m in self.malhas] # Calcula métricas para cada nível salvo
+        fechada = self._base_fechada() # Subdividir preserva bordas: E = 3F/2 só vale para malhas fechadas
+        todas_metricas = [self._metricas(m, fechada) for m in self.iterar_niveis()] # Métricas nível a nível, em fluxo
+        from esferaloop.utilitarios.metricas import exibir_tabela_estatisticas # Importação local (métricas sob demanda)
         exibir_tabela_estatisticas(todas_metricas) # Exibe a tabela formatada no console
 
+    def relatorio_erro_precisao(self) -> list: # Erro da precisão configurada em relação a float64
+        """ # Início da docstring
+        Recalcula os mesmos níveis em float64 e mede o erro geométrico nível a nível. # Objetivo principal
+        Ambas as sequências são percorridas em fluxo, sem reter os níveis de referência. # Uso de memória
+        """ # Fim da docstring
+        referencia = SubdivisaoLoopEsfera(self.niveis, self.normalizar_cada_passo, motor=self.motor, # Mesma configuração,
+                                          cache_operadores=self.cache_operadores, num_processos=self.num_processos, # porém
+                                          preguicoso=True, retencao="ultimo", precisao="float64", malha_base=self.malha_base, # em float64
+                                          instrumentacao=self.instrumentacao) # Mesmo modo silencioso
+        from esferaloop.utilitarios.metricas import comparar_precisao # Importação local (métricas sob demanda)
+        return [dict(nivel=k, **comparar_precisao(malha, malha_ref)) # Uma linha por nível
+                for k, (malha, malha_ref) in enumerate(zip(self.iterar_niveis(), referencia.iterar_niveis()))] # Em paralelo
+
     def demo_interativa(self): # Inicia o modo interativo
         """Inicia a visualização interativa com slider e estatísticas em tempo real.""" # Docstring
         # Calcula as métricas de todos os níveis antecipadamente para performance no slider
-        metricas_por_nivel = [obter_metricas_malha(m) for m in self.malhas]
-        Visualizador.plot_interativo(self.malhas, metricas_por_nivel) # Abre janela com controle e estatísticas
+        malhas = self.malhas # Todos os níveis precisam estar disponíveis para o slider
+        metricas_por_nivel = [self._metricas(m, self._base_fechada()) for m in malhas] # Memorizadas em cada malha
+        from esferaloop.visualizacao.renderizador import Visualizador # Importação local (carrega o Matplotlib)
+        Visualizador.plot_interativo(malhas, metricas_por_nivel) # Abre janela com controle e estatísticas
@@ -0,0 +1,80 @@
+import numpy as np # Importa NumPy para construir as tabelas de conectividade como arrays
+#
+class TopologiaMalha: # Estrutura compacta de conectividade (arestas, faces vizinhas e vizinhança de vértices)
+    """ # Início da docstring da classe
+    Conectividade de uma malha triangular armazenada apenas em arrays int32. # Substitui o dicionário de 'obter_arestas'
+    - arestas (E, 2): vértices de cada aresta, com o menor índice primeiro # Aresta -> vértices
+    - faces_aresta (E, 2): faces adjacentes a cada aresta (-1 em bordas) # Aresta -> faces
+    - num_faces_aresta (E,): quantas faces usam cada aresta (> 2 indica aresta não-manifold) # Contagem completa
+    - face_arestas (F, 3): arestas (v1,v2), (v2,v3) e (v3,v1) de cada face # Face -> arestas
+    - vizinhos_inicio (N+1,) e vizinhos (2E,): vizinhança de vértices no formato CSR # Vértice -> vizinhos
+    As arestas seguem a ordem da primeira aparição ao percorrer as faces, a mesma de 'obter_arestas'. # Ordem estável
+    """ # Fim da docstring
+    def __init__(self, faces, num_vertices): # Constrói todas as tabelas a partir das faces
+        faces = np.asarray(faces).reshape(-1, 3) # Garante o formato (F, 3)
+        num_faces = len(faces) # Quantidade de triângulos
+
+        # Semi-arestas: 3 por face, na ordem (v1,v2), (v2,v3), (v3,v1)
+        origem = faces.reshape(-1).astype(np.int64) # Primeiro vértice de cada semi-aresta
+        destino = faces[:, [1, 2, 0]].reshape(-1).astype(np.int64) # Segundo vértice de cada semi-aresta
+        menor = np.minimum(origem, destino) # Índice menor da aresta (chave ordenada)
+        maior = np.maximum(origem, destino) # Índice maior da aresta
+        chaves = menor * max(num_vertices, 1) + maior # Codifica cada aresta ordenada em um único inteiro
+        _, primeira, inversa = np.unique(chaves, return_index=True, return_inverse=True) # Agrupa semi-arestas iguais
+        ordem = np.argsort(primeira) # Ordena as arestas pela primeira aparição
+        posicao = np.empty_like(ordem) # Tabela: posição ordenada da chave -> índice da aresta
+        posicao[ordem] = np.arange(len(ordem)) # Inverte a permutação
+        id_aresta = posicao[inversa.reshape(-1)] # Índice da aresta de cada semi-aresta
+        num_arestas = len(ordem) # Total de arestas únicas
+
+        self.num_vertices = num_vertices # Guarda o número de vértices usado na construção
+        self.arestas = np.stack([menor[primeira[ordem]], maior[primeira[ordem]]], axis=1).astype(np.int32) # (E, 2)
+        self.face_arestas = id_aresta.reshape(num_faces, 3).astype(np.int32) # (F, 3)
+        self.num_faces_aresta = np.bincount(id_aresta, minlength=num_arestas).astype(np.int32) # (E,)
+
+        # Aresta -> faces: as duas primeiras faces de cada aresta, na ordem das faces
+        semi_ordenadas = np.argsort(id_aresta, kind='stable') # Agrupa as semi-arestas por aresta, preservando a ordem
+        inicio_grupo = np.concatenate([[0], np.cumsum(self.num_faces_aresta)[:-1]]) # Primeira semi-aresta de cada grupo
+        ids_ordenados = id_aresta[semi_ordenadas] # Aresta de cada semi-aresta já agrupada
+        rank = np.arange(len(ids_ordenados)) - inicio_grupo[ids_ordenados] # Posição da face dentro do grupo (0, 1, ...)
+        self.faces_aresta = np.full((num_arestas, 2), -1, dtype=np.int32) # -1 marca a ausência de face (borda)
+        cabe = rank < 2 # Apenas duas faces cabem na tabela; as demais só aparecem em num_faces_aresta
+        self.faces_aresta[ids_ordenados[cabe], rank[cabe]] = semi_ordenadas[cabe] // 3 # Semi-aresta -> face
+
+        # Vértice -> vizinhos (CSR): cada aresta contribui nos dois sentidos
+        fontes = self.arestas.reshape(-1) # Vértice de partida: a0, b0, a1, b1, ...
+        alvos = self.arestas[:, ::-1].reshape(-1) # Vértice vizinho correspondente: b0, a0, b1, a1, ...
+        por_fonte = np.argsort(fontes, kind='stable') # Agrupa por vértice de partida
+        self.vizinhos = alvos[por_fonte].astype(np.int32) # (2E,) vizinhos concatenados
+        self.vizinhos_inicio = np.zeros(num_vertices + 1, dtype=np.int32) # (N+1,) deslocamentos CSR
+        np.cumsum(np.bincount(fontes, minlength=num_vertices), out=self.vizinhos_inicio[1:]) # Prefixo das valências
+
+    @classmethod # Construtor alternativo a partir de tabelas já calculadas
+    def de_arrays(cls, num_vertices, arestas, faces_aresta, num_faces_aresta, face_arestas, vizinhos_inicio, vizinhos): # Sem recalcular
+        """Monta a topologia a partir de arrays existentes (ex.: lidos de um arquivo mapeado).""" # Docstring
+        topologia = cls.__new__(cls) # Evita a construção a partir das faces
+        topologia.num_vertices = num_vertices # Número de vértices
+        topologia.arestas, topologia.faces_aresta = arestas, faces_aresta # Aresta -> vértices e faces
+        topologia.num_faces_aresta, topologia.face_arestas = num_faces_aresta, face_arestas # Contagens e face -> arestas
+        topologia.vizinhos_inicio, topologia.vizinhos = vizinhos_inicio, vizinhos # Vizinhança CSR
+        return topologia # Topologia pronta
+
+    @property # Propriedade calculada a partir da tabela CSR
+    def num_arestas(self) -> int: # Quantidade de arestas únicas
+        """Número de arestas únicas da malha.""" # Docstring
+        return len(self.arestas) # Uma linha por aresta
+
+    @property # Propriedade calculada a partir da tabela CSR
+    def valencia(self) -> np.ndarray: # Grau de cada vértice
+        """Valência (número de vizinhos) de cada vértice.""" # Docstring
+        return np.diff(self.vizinhos_inicio) # Diferença entre deslocamentos consecutivos
+
+    def vizinhos_de(self, idx_vertice) -> np.ndarray: # Consulta a vizinhança de um único vértice
+        """Retorna os índices dos vizinhos de um vértice.""" # Docstring
+        return self.vizinhos[self.vizinhos_inicio[idx_vertice]:self.vizinhos_inicio[idx_vertice + 1]] # Fatia CSR
+
+    def como_dicionario(self) -> dict: # Formato legado de 'Malha.obter_arestas'
+        """Converte para o dicionário {(v1, v2): [faces adjacentes]} usado por 'obter_arestas'.""" # Docstring
+        semi_ordenadas = np.argsort(self.face_arestas.reshape(-1), kind='stable') # Semi-arestas agrupadas por aresta
+        faces_agrupadas = np.split(semi_ordenadas // 3, np.cumsum(self.num_faces_aresta)[:-1]) # Lista de faces por aresta
+        return {(int(v1), int(v2)): grupo.tolist() for (v1, v2), grupo in zip(self.arestas, faces_agrupadas)} # Dicionário
@@ -2,4 +2,6 @@
 Módulo de Utilitários - Ferramentas de análise e métricas geométrica.
 """
 
-from .metricas import obter_metricas_malha, exibir_tabela_estatisticas
+from .metricas import obter_metricas_malha, exibir_tabela_estatisticas, comparar_precisao
+from .arquivos import salvar_malha, carregar_malha, exportar_ply, exportar_stl, carregar_obj, carregar_ply
+from .cache_niveis import CacheNiveis
@@ -0,0 +1,235 @@
+import os # Troca atômica de arquivos
+import struct # Empacotamento binário do cabeçalho
+import tempfile # Arquivos temporários para gravação atômica
+from contextlib import contextmanager # Gravação atômica como bloco 'with'
+import numpy as np # Importa NumPy para gravar e mapear os arrays
+from esferaloop.nucleo.malha import Malha # Estrutura carregada e exportada
+from esferaloop.nucleo.topologia import TopologiaMalha # Conectividade opcionalmente gravada junto da malha
+#
+MAGICO = b"ESFLMALH" # Assinatura no início de todo arquivo .malha
+VERSAO = 1 # Versão do formato
+_CABECALHO = struct.Struct("<8sII") # Assinatura, versão e número de seções
+_SECAO = struct.Struct("<16s4sIQQQ") # Nome, dtype, número de dimensões, linhas, colunas e deslocamento
+_ALINHAMENTO = 64 # Cada seção começa em um múltiplo de 64 bytes
+_LINHAS_POR_BLOCO = 1 << 20 # Linhas gravadas por vez nos exportadores (limita a memória temporária)
+_SECOES_TOPOLOGIA = ("arestas", "faces_aresta", "num_faces_aresta", "face_arestas", "vizinhos_inicio", "vizinhos") # Arrays int32
+
+def _alinhar(posicao): # Próximo múltiplo do alinhamento
+    return (posicao + _ALINHAMENTO - 1) // _ALINHAMENTO * _ALINHAMENTO # Arredonda para cima
+
+def _escrever_em_blocos(arquivo, array, dtype): # Grava um array convertendo aos poucos
+    """Grava 'array' no arquivo com o dtype pedido, bloco a bloco (sem uma cópia convertida completa).""" # Docstring
+    for inicio in range(0, len(array), _LINHAS_POR_BLOCO): # Percorre o array em fatias
+        arquivo.write(np.ascontiguousarray(array[inicio:inicio + _LINHAS_POR_BLOCO], dtype=dtype).tobytes()) # Fatia convertida
+
+@contextmanager # Uso: with _gravacao_atomica(caminho) as arquivo: ...
+def _gravacao_atomica(caminho): # Grava num temporário e troca pelo destino só no final
+    """ # Início da docstring
+    Abre um temporário na pasta de 'caminho' e, se o bloco terminar sem erro, o move para 'caminho' com os.replace. # Objetivo principal
+    Leitores (inclusive malhas mapeadas do arquivo antigo) veem o arquivo antigo ou o novo, nunca um parcial. # Garantia
+    """ # Fim da docstring
+    descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(caminho)), suffix=".tmp") # Mesma pasta: mesmo sistema de arquivos
+    mascara = os.umask(0) # mkstemp cria com 0600; lê a máscara do processo...
+    os.umask(mascara) # ...e a restaura
+    try: # Remove o temporário em caso de erro
+        with os.fdopen(descritor, "wb") as arquivo: # Arquivo binário
+            os.chmod(temporario, 0o666 & ~mascara) # Mesmas permissões de um open(caminho, "wb")
+            yield arquivo # Conteúdo gravado pelo chamador
+        os.replace(temporario, caminho) # Troca atômica
+    except BaseException: # Inclui interrupções
+        if os.path.exists(temporario): # Sobrou o temporário
+            os.remove(temporario) # Limpa
+        raise # Propaga o erro original
+
+def salvar_malha(malha: Malha, caminho, precisao="float64", incluir_topologia=False): # Formato binário próprio
+    """ # Início da docstring
+    Grava a malha em um arquivo binário compacto (.malha), pronto para ser mapeado com 'np.memmap'. # Objetivo principal
+    Layout: cabeçalho + tabela de seções + dados little-endian crus (vértices float32/float64, faces int32). # Formato
+    Com 'incluir_topologia', grava também os arrays de 'malha.topologia' para evitar reconstruí-los ao carregar. # Opção
+    Vincos marcados são gravados numa seção própria (int64), ignorada por leitores que não a conhecem. # Vincos
+    A gravação é atômica: sobrescrever um arquivo ainda mapeado por outra malha não altera os dados dela. # Sobrescrita
+    """ # Fim da docstring
+    if precisao not in ("float32", "float64"): # Apenas as duas precisões suportadas
+        raise ValueError(f"Precisão inválida: {precisao!r}. Use 'float32' ou 'float64'.") # Erro explícito
+    secoes = [("vertices", malha.vertices, "<f4" if precisao == "float32" else "<f8"), # Posições
+              ("faces", malha.faces, "<i4")] # Índices dos triângulos
+    if len(malha.vincos): # Só malhas com vincos marcados
+        secoes.append(("vincos", malha.vincos, "<i8")) # Pares de vértices
+    if incluir_topologia: # Conectividade opcional
+        topologia = malha.topologia # Constrói (ou reaproveita) a topologia em cache
+        secoes += [(nome, getattr(topologia, nome), "<i4") for nome in _SECOES_TOPOLOGIA] # Um array por seção
+
+    posicao = _alinhar(_CABECALHO.size + _SECAO.size * len(secoes)) # Primeiro byte de dados
+    tabela = [] # Entradas da tabela de seções
+    for nome, array, dtype in secoes: # Calcula o deslocamento de cada seção
+        forma = array.shape if array.ndim == 2 else (len(array), 1) # Arrays 1D ocupam uma coluna
+        tabela.append(_SECAO.pack(nome.encode(), dtype.encode(), array.ndim, forma[0], forma[1], posicao)) # Entrada da tabela
+        posicao = _alinhar(posicao + forma[0] * forma[1] * np.dtype(dtype).itemsize) # Próxima seção
+
+    with _gravacao_atomica(caminho) as arquivo: # Grava tudo em sequência
+        arquivo.write(_CABECALHO.pack(MAGICO, VERSAO, len(secoes))) # Cabeçalho
+        arquivo.write(b"".join(tabela)) # Tabela de seções
+        for (nome, array, dtype), entrada in zip(secoes, tabela): # Dados de cada seção
+            arquivo.write(b"\0" * (_SECAO.unpack(entrada)[5] - arquivo.tell())) # Preenchimento até o alinhamento
+            _escrever_em_blocos(arquivo, array, dtype) # Conteúdo convertido aos poucos
+
+def carregar_malha(caminho, modo="r") -> Malha: # Leitura sem cópia via memória mapeada
+    """ # Início da docstring
+    Abre um arquivo .malha com 'np.memmap' e retorna uma Malha que usa os arrays mapeados diretamente. # Zero-copy
+    'modo' segue 'np.memmap': 'r' (somente leitura), 'r+' (grava no arquivo) ou 'c' (cópia ao escrever). # Modos
+    Se o arquivo tiver topologia gravada, ela é associada à malha sem reconstrução. # Topologia opcional
+    """ # Fim da docstring
+    with open(caminho, "rb") as arquivo: # Lê apenas cabeçalho e tabela
+        magico, versao, num_secoes = _CABECALHO.unpack(arquivo.read(_CABECALHO.size)) # Cabeçalho fixo
+        if magico != MAGICO: # Arquivo de outro formato
+            raise ValueError(f"{caminho!r} não é um arquivo de malha válido.") # Erro explícito
+        if versao > VERSAO: # Arquivo gravado por uma versão mais nova
+            raise ValueError(f"Versão de formato {versao} não suportada (máximo {VERSAO}).") # Erro explícito
+        entradas = [_SECAO.unpack(arquivo.read(_SECAO.size)) for _ in range(num_secoes)] # Tabela de seções
+
+    arrays = {} # nome -> array mapeado
+    for nome, dtype, dimensoes, linhas, colunas, deslocamento in entradas: # Mapeia cada seção
+        nome = nome.rstrip(b"\0").decode() # Nome sem preenchimento
+        dtype = np.dtype(dtype.rstrip(b"\0").decode()) # Ex.: '<f8' ou '<i4'
+        forma = (linhas, colunas) if dimensoes == 2 else (linhas,) # 1D ou 2D
+        if linhas == 0: # np.memmap não aceita regiões vazias
+            arrays[nome] = np.empty(forma, dtype=dtype) # Array vazio equivalente
+        else: # Seção com dados
+            arrays[nome] = np.memmap(caminho, dtype=dtype, mode=modo, offset=deslocamento, shape=forma) # Sem cópia
+
+    topologia = None # Construída no primeiro acesso, se não estiver gravada
+    if all(nome in arrays for nome in _SECOES_TOPOLOGIA): # Topologia gravada
+        topologia = TopologiaMalha.de_arrays(len(arrays["vertices"]), **{n: arrays[n] for n in _SECOES_TOPOLOGIA}) # Sem reconstruir
+    vincos = np.asarray(arrays["vincos"], dtype=np.int64) if "vincos" in arrays else None # Lidos para a memória (são poucos)
+    return Malha.de_arrays(arrays["vertices"], arrays["faces"], vincos=vincos, topologia=topologia) # Envolve os arrays mapeados
+
+def exportar_ply(malha: Malha, caminho, precisao="float32"): # PLY binário little-endian
+    """Exporta a malha em PLY binário, gravando vértices e faces em blocos (sem listas Python); gravação atômica.""" # Docstring
+    tipo_ply, dtype = ("float", "<f4") if precisao == "float32" else ("double", "<f8") # Tipo das coordenadas
+    cabecalho = ("ply\nformat binary_little_endian 1.0\n" # Formato
+                 f"element vertex {len(malha.vertices)}\n" # Número de vértices
+                 f"property {tipo_ply} x\nproperty {tipo_ply} y\nproperty {tipo_ply} z\n" # Coordenadas
+                 f"element face {len(malha.faces)}\n" # Número de faces
+                 "property list uchar int vertex_indices\nend_header\n") # Lista de índices por face
+    registro_face = np.dtype([("n", "u1"), ("indices", "<i4", (3,))]) # 1 byte de contagem + 3 índices (13 bytes, empacotado)
+    with _gravacao_atomica(caminho) as arquivo: # Arquivo de saída
+        arquivo.write(cabecalho.encode("ascii")) # Cabeçalho em texto
+        _escrever_em_blocos(arquivo, malha.vertices, dtype) # Vértices
+        for inicio in range(0, len(malha.faces), _LINHAS_POR_BLOCO): # Faces em blocos
+            bloco = malha.faces[inicio:inicio + _LINHAS_POR_BLOCO] # Fatia de faces
+            registros = np.empty(len(bloco), dtype=registro_face) # Registros empacotados
+            registros["n"] = 3 # Todas as faces são triângulos
+            registros["indices"] = bloco # Índices convertidos para int32
+            arquivo.write(registros.tobytes()) # Grava o bloco
+
+def exportar_stl(malha: Malha, caminho): # STL binário
+    """Exporta a malha em STL binário (float32), calculando as normais bloco a bloco; gravação atômica.""" # Docstring
+    registro = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("atributo", "<u2")]) # 50 bytes por triângulo
+    with _gravacao_atomica(caminho) as arquivo: # Arquivo de saída
+        arquivo.write(b"EsferaLoop STL".ljust(80, b"\0")) # Cabeçalho de 80 bytes
+        arquivo.write(struct.pack("<I", len(malha.faces))) # Número de triângulos
+        for inicio in range(0, len(malha.faces), _LINHAS_POR_BLOCO): # Faces em blocos
+            triangulos = malha.vertices[malha.faces[inicio:inicio + _LINHAS_POR_BLOCO]] # (B, 3, 3)
+            normais = np.cross(triangulos[:, 1] - triangulos[:, 0], triangulos[:, 2] - triangulos[:, 0]) # Normal de cada face
+            with np.errstate(invalid='ignore', divide='ignore'): # Faces degeneradas recebem normal zero
+                normais = np.nan_to_num(normais / np.linalg.norm(normais, axis=1, keepdims=True)) # Normal unitária
+            registros = np.zeros(len(triangulos), dtype=registro) # Registros do bloco
+            registros["normal"], registros["vertices"] = normais, triangulos # Preenche os campos
+            arquivo.write(registros.tobytes()) # Grava o bloco
+
+_TIPOS_PLY = {"char": "i1", "int8": "i1", "uchar": "u1", "uint8": "u1", "short": "i2", "int16": "i2", # Tipos escalares do PLY
+              "ushort": "u2", "uint16": "u2", "int": "i4", "int32": "i4", "uint": "u4", "uint32": "u4", # -> códigos NumPy
+              "float": "f4", "float32": "f4", "double": "f8", "float64": "f8"} # (sem a ordem de bytes)
+
+def _leque(indices) -> list: # Polígono -> triângulos
+    """Triangula um polígono convexo em leque a partir do primeiro vértice.""" # Docstring
+    return [[indices[0], indices[k], indices[k + 1]] for k in range(1, len(indices) - 1)] # n - 2 triângulos
+
+def _montar_malha(caminho, vertices, faces, precisao) -> Malha: # Validação comum aos leitores
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3) # (F, 3), também para listas vazias
+    if len(faces) and (faces.min() < 0 or faces.max() >= len(vertices)): # Índice fora da lista de vértices
+        raise ValueError(f"{caminho!r}: face com índice de vértice inválido.") # Erro explícito
+    return Malha(vertices, faces, precisao=precisao) # Vincos podem ser marcados depois em 'malha.vincos'
+
+def carregar_obj(caminho, precisao="float64") -> Malha: # Wavefront OBJ em texto
+    """ # Início da docstring
+    Lê vértices ('v') e faces ('f') de um arquivo OBJ; polígonos com mais de 3 lados viram leques de triângulos. # Objetivo principal
+    Índices 'v/vt/vn' e negativos (relativos) são aceitos; normais, texturas, grupos e materiais são ignorados. # Subconjunto suportado
+    """ # Fim da docstring
+    vertices, faces = [], [] # Listas montadas linha a linha
+    with open(caminho, "r", encoding="utf-8", errors="replace") as arquivo: # Arquivo de texto
+        for linha in arquivo: # Uma declaração por linha
+            partes = linha.split() # Palavras da linha
+            if not partes: # Linha vazia
+                continue # Ignora
+            if partes[0] == "v": # Vértice (cores extras depois de x y z são ignoradas)
+                vertices.append(partes[1:4]) # Convertidos todos de uma vez ao final
+            elif partes[0] == "f": # Face (polígono)
+                indices = [int(parte.split("/")[0]) for parte in partes[1:]] # Apenas o índice de posição
+                faces += _leque([i - 1 if i > 0 else len(vertices) + i for i in indices]) # Base 1 ou relativo ao final
+    return _montar_malha(caminho, np.array(vertices, dtype=np.float64).reshape(-1, 3), faces, precisao) # Malha pronta
+
+def carregar_ply(caminho, precisao="float64") -> Malha: # PLY em texto ou binário
+    """ # Início da docstring
+    Lê um PLY ('ascii', 'binary_little_endian' ou 'binary_big_endian') com os elementos 'vertex' e 'face'. # Formatos
+    Os vértices são lidos de uma vez em um dtype estruturado; faces só com triângulos também (caminho rápido), # Vetorizado
+    e polígonos maiores viram leques de triângulos. # Polígonos
+    """ # Fim da docstring
+    with open(caminho, "rb") as arquivo: # Cabeçalho em texto seguido dos dados
+        if arquivo.readline().strip() != b"ply": # Assinatura
+            raise ValueError(f"{caminho!r} não é um arquivo PLY.") # Erro explícito
+        formato, elementos = None, [] # Formato e lista de (nome, quantidade, propriedades)
+        while True: # Lê o cabeçalho
+            linha = arquivo.readline() # Próxima linha
+            if not linha: # Fim do arquivo antes de 'end_header'
+                raise ValueError(f"{caminho!r}: cabeçalho PLY sem 'end_header'.") # Erro explícito
+            partes = linha.decode("ascii", "replace").split() # Palavras da linha
+            if not partes or partes[0] in ("comment", "obj_info"): # Comentários
+                continue # Ignora
+            if partes[0] == "end_header": # Fim do cabeçalho
+                break # Dados a seguir
+            if partes[0] == "format": # Ex.: binary_little_endian 1.0
+                formato = partes[1] # Guarda o formato
+            elif partes[0] == "element": # Novo elemento
+                elementos.append((partes[1], int(partes[2]), [])) # Nome, quantidade, propriedades
+            elif partes[0] == "property": # Propriedade do último elemento
+                elementos[-1][2].append(partes[1:]) # Tipo(s) e nome
+        if [nome for nome, _, _ in elementos] not in (["vertex"], ["vertex", "face"]): # Apenas vértices e faces
+            raise ValueError(f"{caminho!r}: elementos PLY não suportados ({[nome for nome, _, _ in elementos]}).") # Erro explícito
+        _, num_vertices, propriedades_vertice = elementos[0] # Vértices
+        _, num_faces, propriedades_face = elementos[1] if len(elementos) > 1 else ("face", 0, [["list", "uchar", "int", "vertex_indices"]]) # Faces
+        if any(p[0] == "list" for p in propriedades_vertice) or len(propriedades_face) != 1 or propriedades_face[0][0] != "list": # Layout esperado
+            raise ValueError(f"{caminho!r}: layout de propriedades PLY não suportado.") # Erro explícito
+        _, tipo_contagem, tipo_indice, _ = propriedades_face[0] # Tipos da lista de índices
+        nomes = [p[1] for p in propriedades_vertice] # Nomes das propriedades do vértice
+
+        if formato == "ascii": # Texto: uma linha por vértice e por face
+            linhas = [linha for linha in arquivo.read().decode("ascii", "replace").splitlines() if linha.strip()] # Linhas de dados
+            tabela = np.array([linha.split() for linha in linhas[:num_vertices]], dtype=np.float64).reshape(-1, len(nomes)) # (N, P)
+            vertices = tabela[:, [nomes.index(eixo) for eixo in "xyz"]] # Apenas x, y, z
+            faces = [] # Triângulos
+            for linha in linhas[num_vertices:num_vertices + num_faces]: # Cada face
+                valores = [int(valor) for valor in linha.split()] # Contagem seguida dos índices
+                faces += _leque(valores[1:1 + valores[0]]) # Leque de triângulos
+            return _montar_malha(caminho, vertices, faces, precisao) # Malha pronta
+
+        if formato not in ("binary_little_endian", "binary_big_endian"): # Formato desconhecido
+            raise ValueError(f"{caminho!r}: formato PLY {formato!r} não suportado.") # Erro explícito
+        ordem = "<" if formato == "binary_little_endian" else ">" # Ordem dos bytes
+        registro_vertice = np.dtype([(nome, ordem + _TIPOS_PLY[tipo]) for tipo, nome in propriedades_vertice]) # Registro empacotado
+        tabela = np.frombuffer(arquivo.read(num_vertices * registro_vertice.itemsize), dtype=registro_vertice) # Todos os vértices
+        vertices = np.stack([tabela[eixo].astype(np.float64) for eixo in "xyz"], axis=1) # (N, 3)
+        dados = arquivo.read() # Faces
+    contagem, indice = np.dtype(ordem + _TIPOS_PLY[tipo_contagem]), np.dtype(ordem + _TIPOS_PLY[tipo_indice]) # Tipos da lista
+    registro_triangulo = np.dtype([("n", contagem), ("indices", indice, (3,))]) # Face triangular empacotada
+    if len(dados) >= num_faces * registro_triangulo.itemsize: # Caminho rápido: só triângulos
+        triangulos = np.frombuffer(dados, dtype=registro_triangulo, count=num_faces) # Leitura única
+        if (triangulos["n"] == 3).all(): # Confirmado
+            return _montar_malha(caminho, vertices, triangulos["indices"], precisao) # Malha pronta
+    faces, posicao = [], 0 # Polígonos de tamanhos variados: leitura sequencial
+    for _ in range(num_faces): # Cada face
+        n = int(np.frombuffer(dados, dtype=contagem, count=1, offset=posicao)[0]) # Número de vértices
+        posicao += contagem.itemsize # Pula a contagem
+        faces += _leque(np.frombuffer(dados, dtype=indice, count=n, offset=posicao).tolist()) # Leque de triângulos
+        posicao += n * indice.itemsize # Próxima face
+    return _montar_malha(caminho, vertices, faces, precisao) # Malha pronta
@@ -0,0 +1,92 @@
+import hashlib # Impressão digital da malha base
+import os # Listagem, remoção e troca atômica de arquivos
+import numpy as np # Conversão canônica dos arrays para o hash
+from esferaloop.nucleo.malha import Malha, PRECISOES # Estrutura armazenada no cache e dtypes por precisão
+from esferaloop.utilitarios.arquivos import salvar_malha, carregar_malha # Formato binário mapeável
+#
+class CacheNiveis: # Cache persistente de níveis de subdivisão já calculados
+    """ # Início da docstring da classe
+    Guarda em disco as malhas produzidas por 'SubdivisaoLoopEsfera', no formato .malha. # O que é guardado
+    Chave: (hash da malha base, nível, normalizar_cada_passo, dtype). # Identificação de cada nível
+    Gravações são atômicas (arquivo temporário + os.replace), então vários processos podem compartilhar a pasta. # Concorrência
+    Acima de 'limite_bytes', os arquivos usados há mais tempo são removidos. # Política de despejo
+    """ # Fim da docstring
+    EXTENSAO = ".malha" # Extensão dos arquivos de cache
+
+    def __init__(self, diretorio, limite_bytes=1 << 30): # Configura o cache (padrão: 1 GiB)
+        self.diretorio = diretorio # Pasta compartilhada entre execuções e processos
+        self.limite_bytes = limite_bytes # Tamanho máximo total dos arquivos
+        os.makedirs(diretorio, exist_ok=True) # Cria a pasta se necessário
+
+    @staticmethod # Não depende do estado do cache
+    def chave_malha(malha: Malha) -> str: # Impressão digital de uma malha base
+        """Hash estável dos vértices (float64), das faces (int64) e dos vincos, se houver.""" # Docstring
+        resumo = hashlib.sha1(np.ascontiguousarray(malha.vertices, dtype=np.float64).tobytes()) # Posições
+        resumo.update(np.ascontiguousarray(malha.faces, dtype=np.int64).tobytes()) # Conectividade
+        if len(malha.vincos): # Malhas sem vincos mantêm a chave de sempre
+            resumo.update(b"vincos" + np.ascontiguousarray(malha.vincos, dtype=np.int64).tobytes()) # Vincos mudam as regras
+        return resumo.hexdigest() # Texto hexadecimal
+
+    def caminho(self, chave_base, nivel, normalizar, dtype) -> str: # Arquivo correspondente a uma chave
+        """Caminho do arquivo de um nível.""" # Docstring
+        modo = "normalizado" if normalizar else "bruto" # Parte legível do nome
+        return os.path.join(self.diretorio, f"{chave_base}_n{nivel}_{modo}_{np.dtype(dtype).name}{self.EXTENSAO}") # Ex.: <hash>_n6_bruto_float64.malha
+
+    def obter(self, chave_base, nivel, normalizar, dtype): # Consulta o cache
+        """ # Início da docstring
+        Retorna a malha guardada (mapeada com cópia-ao-escrever) ou None se não existir. # Objetivo principal
+        As faces (int32 no arquivo) voltam no dtype de índices da precisão, como as de um nível recém-calculado. # Mesmos dtypes
+        """ # Fim da docstring
+        caminho = self.caminho(chave_base, nivel, normalizar, dtype) # Arquivo esperado
+        try: # Outro processo pode removê-lo a qualquer momento
+            malha = carregar_malha(caminho, modo="c") # Alterações em memória não afetam o arquivo
+            os.utime(caminho) # Marca como usado recentemente (base do despejo LRU)
+        except (FileNotFoundError, ValueError): # Ausente ou inválido
+            return None # Falha no cache
+        tipo_indices = PRECISOES["float32" if np.dtype(dtype) == np.float32 else "float64"][1] # int32 ou int64
+        faces = malha.faces.astype(tipo_indices, copy=False) # Sem cópia em float32
+        return Malha.de_arrays(malha.vertices, faces, vincos=malha.vincos, topologia=malha.topologia_em_cache) # Acerto no cache
+
+    def guardar(self, chave_base, nivel, normalizar, dtype, malha: Malha): # Insere um nível no cache
+        """Grava a malha de forma atômica e aplica o limite de tamanho.""" # Docstring
+        caminho = self.caminho(chave_base, nivel, normalizar, dtype) # Arquivo de destino
+        precisao = "float32" if np.dtype(dtype) == np.float32 else "float64" # Precisão gravada
+        salvar_malha(malha, caminho, precisao=precisao, incluir_topologia=True) # Atômica (temporário .tmp + os.replace); topologia evita reconstrução
+        self._despejar() # Mantém o cache dentro do limite
+
+    def limpar(self): # Esvazia o cache
+        """Remove todos os arquivos de cache da pasta.""" # Docstring
+        for caminho, _, _ in self._arquivos(): # Cada arquivo de cache
+            self._remover(caminho) # Remove, ignorando concorrência
+
+    def tamanho_total(self) -> int: # Bytes ocupados pelo cache
+        """Soma dos tamanhos de todos os arquivos de cache.""" # Docstring
+        return sum(tamanho for _, tamanho, _ in self._arquivos()) # Soma simples
+
+    def _arquivos(self): # Lista (caminho, tamanho, último uso)
+        itens = [] # Resultado
+        for nome in os.listdir(self.diretorio): # Conteúdo da pasta
+            if nome.endswith(self.EXTENSAO): # Apenas arquivos de cache (ignora temporários)
+                caminho = os.path.join(self.diretorio, nome) # Caminho completo
+                try: # Pode ter sido removido por outro processo
+                    info = os.stat(caminho) # Tamanho e datas
+                except FileNotFoundError: # Removido entre listdir e stat
+                    continue # Ignora
+                itens.append((caminho, info.st_size, info.st_mtime)) # Registro do arquivo
+        return itens # Lista de arquivos
+
+    def _despejar(self): # Remove os menos usados até caber no limite
+        itens = sorted(self._arquivos(), key=lambda item: item[2]) # Do uso mais antigo para o mais recente
+        total = sum(tamanho for _, tamanho, _ in itens) # Tamanho atual
+        for caminho, tamanho, _ in itens[:-1]: # O arquivo mais recente sempre fica
+            if total <= self.limite_bytes: # Já cabe
+                break # Nada mais a remover
+            self._remover(caminho) # Remove o arquivo mais antigo
+            total -= tamanho # Atualiza o total
+
+    @staticmethod # Remoção tolerante a concorrência
+    def _remover(caminho): # Outro processo pode já ter removido
+        try: # Tenta remover
+            os.remove(caminho) # Leitores com o arquivo mapeado continuam válidos (POSIX)
+        except FileNotFoundError: # Já removido
+            pass # Nada a fazer
@@ -1,46 +1,98 @@
 import numpy as np # Importa NumPy para cálculos estatísticos e vetoriais
-import time # Importa biblioteca para controle de tempo (se necessário)
 # 
-def obter_metricas_malha(malha, raio_alvo=1.0) -> dict: # Função para calcular a precisão geométrica da malha
+def contar_arestas(malha, fechada=False) -> int: # Número de arestas sem montar a topologia completa
+    """ # Início da docstring
+    Conta as arestas únicas da malha. # Objetivo principal
+    Usa a topologia se ela já estiver em cache; para malhas fechadas, E = 3F/2; # Atalhos sem custo
+    caso contrário, conta chaves únicas de aresta (uma ordenação, sem montar as demais tabelas). # Caso geral
+    """ # Fim da docstring
+    if malha.topologia_em_cache is not None: # Topologia já construída por outro consumidor
+        return malha.topologia_em_cache.num_arestas # Reaproveita
+    if fechada: # Cada aresta é compartilhada por exatamente duas faces
+        return 3 * len(malha.faces) // 2 # Relação de Euler para malhas fechadas
+    faces = np.asarray(malha.faces, dtype=np.int64) # Índices em 64 bits para a chave
+    origem, destino = faces.reshape(-1), faces[:, [1, 2, 0]].reshape(-1) # Semi-arestas
+    chaves = np.minimum(origem, destino) * max(len(malha.vertices), 1) + np.maximum(origem, destino) # Chave ordenada
+    return len(np.unique(chaves)) # Arestas distintas
+
+def obter_metricas_malha(malha, raio_alvo=1.0, extras=False, fechada=False) -> dict: # Função para calcular a precisão geométrica da malha
     """ # Início da docstring
     Calcula métricas de qualidade da malha. # Objetivo principal
     - Contagem de elementos # Vértices e faces
     - Erro de raio (distância média ao centro) # Quão longe está de ser uma esfera
     - Desvio padrão do raio (suavidade da forma) # Consistência da esfericidade
+    Com 'extras', inclui razão de aspecto, distribuição de ângulos e histograma de valências. # Métricas opcionais
+    O resultado é memorizado na própria malha até que vértices ou faces sejam substituídos. # Cache por instância
     """ # Fim da docstring
+    chave = (raio_alvo, extras) # Variante de métricas pedida
+    if chave in malha.metricas_em_cache: # Já calculado para esta malha
+        return dict(malha.metricas_em_cache[chave]) # Cópia, para que o chamador não altere o cache
+
     vertices = malha.vertices # Pega as coordenadas XYZ dos pontos da malha
     faces = malha.faces # Pega a lista de triângulos da malha
 
     # Radii de todos os vértices (distância da origem) # Título do bloco de cálculo
-    raios = np.linalg.norm(vertices, axis=1) # Calcula o raio (norma) de cada vértice em relação à origem (0,0,0)
-
-    # Erro médio em relação ao raio alvo # Título do bloco de estatísticas
-    raio_medio = np.mean(raios) # Calcula o raio médio de todos os pontos
-    raio_max = np.max(raios) # Identifica o ponto mais distante do centro
-    raio_min = np.min(raios) # Identifica o ponto mais próximo do centro
-
-    erro_medio = np.mean(np.abs(raios - raio_alvo)) # Erro médio absoluto: média da diferença para o raio ideal (1.0)
-    desvio_padrao_raio = np.std(raios) # Desvio padrão: indica se os pontos estão todos à mesma distância ou oscilam
+    raios = np.sqrt(np.einsum('ij,ij->i', vertices, vertices)) # Norma de cada vértice, sem arrays intermediários (N, 3)
+    desvios = np.abs(raios - raio_alvo) # Distância de cada vértice à esfera ideal
 
     # Cálculo de áreas das faces para avaliar a distribuição uniforme
     face_vertices = vertices[faces] # Pega os 3 vértices de cada face: shape (M, 3, 3)
-    v0, v1, v2 = face_vertices[:, 0], face_vertices[:, 1], face_vertices[:, 2]
+    lados = face_vertices[:, [1, 2, 0]] - face_vertices # Vetores das arestas v0->v1, v1->v2, v2->v0: (M, 3, 3)
     # Área do triângulo via produto vetorial: 0.5 * |(v1-v0) x (v2-v0)|
-    areas = 0.5 * np.linalg.norm(np.cross(v1 - v0, v2 - v0), axis=1)
-    
-    area_media = np.mean(areas)
-    desvio_padrao_area = np.std(areas) # Medida de uniformidade da distribuição
+    produto = np.cross(lados[:, 0], -lados[:, 2]) # (v1 - v0) x (v2 - v0)
+    areas = 0.5 * np.sqrt(np.einsum('ij,ij->i', produto, produto)) # Área de cada face
 
-    return { # Retorna um dicionário com todos os dados calculados
+    metricas = { # Dicionário com todos os dados calculados
         "num_vertices": len(vertices), # Quantidade total de pontos
         "num_faces": len(faces), # Quantidade total de triângulos
-        "num_arestas": len(malha.obter_arestas()), # Quantidade total de arestas únicas
-        "erro_medio": erro_medio, # Média de erro em relação à esfera ideal
-        "desvio_padrao_raio": desvio_padrao_raio, # Medida de rugosidade/irregularidade
-        "area_media": area_media, # Área média das faces
-        "desvio_padrao_area": desvio_padrao_area, # Uniformidade da malha (objetivo específico)
-        "raio_min": raio_min, # Raio mínimo encontrado
-        "raio_max": raio_max # Raio máximo encontrado
+        "num_arestas": contar_arestas(malha, fechada), # Quantidade total de arestas únicas
+        "erro_medio": desvios.mean() if len(raios) else 0.0, # Média de erro em relação à esfera ideal
+        "desvio_padrao_raio": raios.std() if len(raios) else 0.0, # Medida de rugosidade/irregularidade
+        "area_media": areas.mean() if len(areas) else 0.0, # Área média das faces
+        "desvio_padrao_area": areas.std() if len(areas) else 0.0, # Uniformidade da malha (objetivo específico)
+        "raio_min": raios.min(initial=np.inf), # Raio mínimo encontrado
+        "raio_max": raios.max(initial=0.0) # Raio máximo encontrado
+    } # Fim do dicionário
+
+    if extras: # Métricas adicionais de qualidade dos triângulos
+        comprimentos = np.sqrt(np.einsum('ijk,ijk->ij', lados, lados)) # (M, 3) comprimento de cada lado
+        with np.errstate(divide='ignore', invalid='ignore'): # Faces degeneradas geram inf/nan, descartados abaixo
+            # Razão de aspecto R / (2r): 1 para o triângulo equilátero, cresce com a distorção
+            semiperimetro = comprimentos.sum(axis=1) / 2 # s = (a + b + c) / 2
+            circunraio = comprimentos.prod(axis=1) / (4 * areas) # R = abc / (4A)
+            inraio = areas / semiperimetro # r = A / s
+            aspecto = circunraio / (2 * inraio) # Razão normalizada
+            # Ângulo em cada vértice, a partir dos dois lados que partem dele
+            cos_angulos = -np.einsum('ijk,ijk->ij', lados, lados[:, [2, 0, 1]]) / (comprimentos * comprimentos[:, [2, 0, 1]]) # Lei do produto escalar
+        angulos = np.degrees(np.arccos(np.clip(cos_angulos[np.isfinite(cos_angulos)], -1.0, 1.0))) # Ângulos válidos, em graus
+        aspecto = aspecto[np.isfinite(aspecto)] # Ignora faces degeneradas
+        metricas.update({ # Acrescenta as métricas opcionais
+            "razao_aspecto_media": aspecto.mean() if len(aspecto) else np.nan, # Qualidade média
+            "razao_aspecto_max": aspecto.max() if len(aspecto) else np.nan, # Pior triângulo
+            "angulo_min": angulos.min() if len(angulos) else np.nan, # Menor ângulo (graus)
+            "angulo_max": angulos.max() if len(angulos) else np.nan, # Maior ângulo (graus)
+            "histograma_angulos": np.histogram(angulos, bins=18, range=(0.0, 180.0))[0], # Faixas de 10 graus
+            "histograma_valencia": np.bincount(malha.topologia.valencia), # Quantos vértices têm cada valência
+        })
+
+    malha.metricas_em_cache[chave] = metricas # Memoriza na instância
+    return dict(metricas) # Cópia para o chamador
+
+def comparar_precisao(malha, malha_referencia) -> dict: # Erro geométrico entre duas precisões da mesma malha
+    """ # Início da docstring
+    Compara uma malha (ex.: float32) com a mesma malha calculada em float64. # Objetivo principal
+    As diferenças são medidas em float64 para não mascarar o erro da precisão reduzida. # Cuidado numérico
+    """ # Fim da docstring
+    vertices = np.asarray(malha.vertices, dtype=np.float64) # Promoção explícita apenas para a comparação
+    referencia = np.asarray(malha_referencia.vertices, dtype=np.float64) # Malha de referência (float64)
+    distancias = np.linalg.norm(vertices - referencia, axis=1) # Deslocamento de cada vértice
+    diferenca_raio = np.abs(np.linalg.norm(vertices, axis=1) - np.linalg.norm(referencia, axis=1)) # Diferença de raio
+    return { # Retorna um dicionário com os erros
+        "precisao": malha.precisao, # Precisão avaliada
+        "num_vertices": len(vertices), # Quantidade de pontos comparados
+        "erro_max_posicao": float(distancias.max(initial=0.0)), # Maior deslocamento
+        "erro_medio_posicao": float(distancias.mean()) if len(distancias) else 0.0, # Deslocamento médio
+        "erro_max_raio": float(diferenca_raio.max(initial=0.0)), # Maior diferença de raio
     } # Fim do dicionário
 
 def exibir_tabela_estatisticas(todas_metricas: list): # Função para imprimir os resultados de forma organizada
@@ -1,5 +1,24 @@
 """
 Módulo de Visualização - Renderização 3D e interface interativa.
+O Visualizador (Matplotlib) é carregado no primeiro acesso; o rasterizador depende só do NumPy.
 """
 
-from .renderizador import Visualizador
+from importlib import import_module
+
+from .rasterizador import Rasterizador, salvar_png, salvar_ppm
+
+_PREGUICOSOS = {
+    "Visualizador": ".renderizador",
+}
+
+
+def __getattr__(nome):
+    if nome not in _PREGUICOSOS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(import_module(_PREGUICOSOS[nome], __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_PREGUICOSOS))
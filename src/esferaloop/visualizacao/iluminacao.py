@@ -0,0 +1,44 @@
+import numpy as np # Importa NumPy para o modelo de iluminação vetorizado (sem depender do Matplotlib)
+#
+PISO_Z = -1.1 # Altura do plano (invisível) que recebe a sombra projetada
+DIRECAO_LUZ = (0.8, 0.4, 1.2) # Luz inclinada para o lado (não normalizada)
+LIMITES_CENA = ((-1.8, 1.2), (-1.5, 1.5), (PISO_Z, 1.5)) # Enquadramento X, Y e Z comum a todos os renderizadores
+COR_SOMBRA = (0x11 / 255, 0x11 / 255, 0x11 / 255) # Cor '#111111' da sombra projetada
+ALFA_SOMBRA = 0.4 # Transparência da sombra
+
+def direcao_luz(dtype=np.float64) -> np.ndarray: # Vetor unitário da luz
+    """Direção da luz normalizada, no dtype pedido (a precisão da malha).""" # Docstring
+    direcao = np.array(DIRECAO_LUZ, dtype=dtype) # Vetor na precisão desejada
+    return direcao / np.linalg.norm(direcao) # Normaliza
+
+def normais_faces(poligonos) -> np.ndarray: # Normal unitária de cada triângulo
+    """Recebe os triângulos (F, 3, 3) e retorna as normais unitárias (F, 3); faces degeneradas recebem zero.""" # Docstring
+    normais = np.cross(poligonos[:, 1] - poligonos[:, 0], poligonos[:, 2] - poligonos[:, 0]) # Produto vetorial
+    modulo = np.sqrt(np.einsum('ij,ij->i', normais, normais))[:, np.newaxis] # Comprimento de cada normal
+    with np.errstate(invalid='ignore', divide='ignore'): # Faces degeneradas são zeradas abaixo
+        return np.where(modulo > 0, normais / modulo, 0) # Normais unitárias
+
+def intensidades_faces(normais, intensidade_luz=1.0) -> np.ndarray: # Modelo de iluminação por face
+    """ # Início da docstring
+    Lambert (luz direta) + luz refletida sutil no lado da sombra + luz ambiente mínima. # Modelo
+    'intensidade_luz' interpola entre iluminação uniforme (0) e o modelo completo (1). # Controle
+    """ # Fim da docstring
+    produto = normais @ direcao_luz(normais.dtype) # Cosseno entre normal e luz
+    direta = np.clip(produto, 0.0, 1.0) # Luz direta (lado iluminado)
+    refletida = np.clip(-produto, 0.0, 1.0) * 0.2 # Luz refletida (brilho sutil na base da sombra)
+    calculadas = np.clip(direta + refletida + 0.1, 0.0, 1.0) # Com luz ambiente mínima
+    return (1.0 - intensidade_luz) + calculadas * intensidade_luz # Interpolação para controle do slider
+
+def cores_faces(intensidades) -> np.ndarray: # Intensidade -> cor RGBA
+    """Converte intensidades (F,) em cores RGBA (F, 4) em tons de ciano/cinza azulado.""" # Docstring
+    cores = np.zeros((len(intensidades), 4)) # O canal vermelho fica em 0
+    cores[:, 1] = intensidades * 0.7 + 0.1 # Verde
+    cores[:, 2] = intensidades * 0.7 + 0.2 # Azul
+    cores[:, 3] = 1.0 # Opaco
+    return cores # Cores prontas
+
+def projetar_sombra(vertices) -> np.ndarray: # Projeção dos vértices no piso
+    """Projeta cada vértice na direção da luz até o plano z = PISO_Z.""" # Docstring
+    luz = direcao_luz(vertices.dtype) # Direção unitária
+    t = (PISO_Z - vertices[:, 2]) / luz[2] # Distância até o piso ao longo da luz
+    return vertices + t[:, np.newaxis] * luz # Pontos no piso
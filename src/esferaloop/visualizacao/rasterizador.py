@@ -0,0 +1,175 @@
+import os # Criação da pasta de saída nos lotes
+import struct # Blocos binários do PNG
+import zlib # Compressão e CRC do PNG
+import numpy as np # Importa NumPy para rasterizar sem Matplotlib
+from esferaloop.visualizacao import iluminacao # Mesmo modelo de luz e sombra de 'Visualizador.plotar_malha'
+from esferaloop.utilitarios.arquivos import _gravacao_atomica # Imagens gravadas num temporário e trocadas no final
+#
+LIMITE_AMOSTRAS = 1 << 22 # Máximo de pixels candidatos avaliados por vez (limita a memória temporária)
+COR_FUNDO = (1.0, 1.0, 1.0) # Fundo branco, como o da figura do Matplotlib
+
+class Rasterizador: # Renderizador por software, sem janela e sem Matplotlib
+    """ # Início da docstring da classe
+    Desenha uma Malha em um framebuffer NumPy com z-buffer, para gerar imagens em lote sem tela. # Objetivo
+    Usa a mesma cena de 'Visualizador.plotar_malha': luz, sombreamento por face, sombra no piso e enquadramento. # Equivalência visual
+    A projeção é ortográfica, com a câmera na orientação padrão do Matplotlib (elevação 30°, azimute -60°). # Câmera
+    A sombra é calculada como um mapa de sombra: cada ponto do piso visível é levado ao espaço da luz # Sombra
+    e consultado em uma máscara de cobertura da malha vista pela luz. # Equivale a projetar os triângulos no piso
+    """ # Fim da docstring
+    def __init__(self, largura=1024, altura=1024, elevacao=30.0, azimute=-60.0): # Configura a câmera
+        self.largura, self.altura = largura, altura # Tamanho da imagem em pixels
+        el, az = np.radians(elevacao), np.radians(azimute) # Ângulos em radianos
+        self.visao = np.array([np.cos(el) * np.cos(az), np.cos(el) * np.sin(az), np.sin(el)]) # Aponta para o observador
+        self.direita = np.array([-np.sin(az), np.cos(az), 0.0]) # Eixo horizontal da tela
+        self.cima = np.cross(self.visao, self.direita) # Eixo vertical da tela
+
+        # Enquadra os 8 cantos da cena (os mesmos limites de 'plotar_malha') com 5% de margem
+        cantos = np.array(np.meshgrid(*iluminacao.LIMITES_CENA)).reshape(3, -1).T # (8, 3)
+        tela = np.stack([cantos @ self.direita, cantos @ self.cima], axis=1) # Cantos no plano da tela
+        self.centro = (tela.min(axis=0) + tela.max(axis=0)) / 2 # Centro da cena na tela
+        extensao = tela.max(axis=0) - tela.min(axis=0) # Largura e altura da cena
+        self.escala = 0.95 * min(largura / extensao[0], altura / extensao[1]) # Pixels por unidade
+
+    def projetar(self, pontos): # Mundo -> (x, y) em pixels e profundidade
+        """Projeta pontos (N, 3) na tela: retorna (N, 2) em pixels e a profundidade (menor = mais perto).""" # Docstring
+        x = (pontos @ self.direita - self.centro[0]) * self.escala + self.largura / 2 # Coluna
+        y = self.altura / 2 - (pontos @ self.cima - self.centro[1]) * self.escala # Linha (cresce para baixo)
+        return np.stack([x, y], axis=-1), -(pontos @ self.visao) # Menor profundidade = mais perto
+
+    def renderizar(self, malha, intensidade_luz=1.0, mostrar_sombra=True) -> np.ndarray: # Imagem de uma malha
+        """Retorna a imagem (altura, largura, 3) em uint8.""" # Docstring
+        vertices = np.asarray(malha.vertices, dtype=np.float64) # Rasterização sempre em float64
+        faces = np.asarray(malha.faces) # Índices dos triângulos
+        poligonos = vertices[faces] # (F, 3, 3)
+        cores = iluminacao.cores_faces(iluminacao.intensidades_faces(iluminacao.normais_faces(poligonos), intensidade_luz))[:, :3] # (F, 3)
+
+        xy, profundidade = self.projetar(vertices) # Vértices na tela
+        num_pixels = self.largura * self.altura # Tamanho do framebuffer
+        zbuffer = np.full(num_pixels, np.inf) # Profundidade mais próxima de cada pixel
+        ids = np.full(num_pixels, -1, dtype=np.int64) # Face visível em cada pixel (-1 = vazio)
+        for tris, pixels, pesos in _fragmentos(xy[faces], self.largura, self.altura): # Fragmentos por bloco de triângulos
+            z = np.einsum('ij,ij->i', pesos, profundidade[faces[tris]]) # Profundidade interpolada
+            np.minimum.at(zbuffer, pixels, z) # Teste de profundidade
+            venceu = z == zbuffer[pixels] # Fragmentos que ficaram na frente
+            ids[pixels[venceu]] = tris[venceu] # Face visível
+
+        imagem = np.empty((num_pixels, 3)) # Framebuffer RGB em [0, 1]
+        imagem[:] = COR_FUNDO # Fundo
+        if mostrar_sombra: # Sombra no piso, só onde a malha não cobre
+            vazio = np.flatnonzero(ids < 0) # Pixels que mostram o piso
+            sombra = vazio[self._em_sombra(vertices, faces, vazio)] # Pixels do piso sombreados
+            imagem[sombra] = (1 - iluminacao.ALFA_SOMBRA) * imagem[sombra] + iluminacao.ALFA_SOMBRA * np.array(iluminacao.COR_SOMBRA) # Mistura alfa
+        visiveis = ids >= 0 # Pixels cobertos pela malha
+        imagem[visiveis] = cores[ids[visiveis]] # Sombreamento por face
+        return (np.clip(imagem, 0.0, 1.0) * 255 + 0.5).astype(np.uint8).reshape(self.altura, self.largura, 3) # RGB de 8 bits
+
+    def _em_sombra(self, vertices, faces, pixels) -> np.ndarray: # Mapa de sombra
+        """Para cada pixel do piso, indica se o raio em direção à luz encontra a malha.""" # Docstring
+        luz = iluminacao.direcao_luz() # Direção unitária da luz
+        u = np.cross(luz, [0.0, 0.0, 1.0]) # Eixos do plano perpendicular à luz
+        u /= np.linalg.norm(u) # Normaliza
+        v = np.cross(luz, u) # Segundo eixo
+
+        # Máscara de cobertura da malha vista pela luz, na mesma escala da imagem
+        plano = np.stack([vertices @ u, vertices @ v], axis=1) # Vértices no plano da luz
+        origem = plano.min(axis=0) # Canto da máscara
+        tamanho = np.ceil((plano.max(axis=0) - origem) * self.escala).astype(int) + 1 # Largura e altura da máscara
+        mascara = np.zeros(tamanho[0] * tamanho[1], dtype=bool) # Pixels cobertos pela malha
+        for _, cobertos, _ in _fragmentos((plano - origem)[faces] * self.escala, tamanho[0], tamanho[1]): # Só cobertura
+            mascara[cobertos] = True # Marca os pixels da máscara
+
+        # Pixel da tela -> ponto do piso (raio paralelo a 'visao') -> plano da luz
+        linhas, colunas = np.divmod(pixels, self.largura) # Posição de cada pixel
+        a = (colunas + 0.5 - self.largura / 2) / self.escala + self.centro[0] # Coordenada horizontal na cena
+        b = (self.altura / 2 - linhas - 0.5) / self.escala + self.centro[1] # Coordenada vertical na cena
+        pontos = a[:, np.newaxis] * self.direita + b[:, np.newaxis] * self.cima # Pontos no plano da tela
+        pontos += ((iluminacao.PISO_Z - pontos[:, 2]) / self.visao[2])[:, np.newaxis] * self.visao # Interseção com o piso
+        mx = np.floor((pontos @ u - origem[0]) * self.escala).astype(np.int64) # Coluna na máscara
+        my = np.floor((pontos @ v - origem[1]) * self.escala).astype(np.int64) # Linha na máscara
+        dentro = (mx >= 0) & (mx < tamanho[0]) & (my >= 0) & (my < tamanho[1]) # Dentro da máscara
+        resultado = np.zeros(len(pixels), dtype=bool) # Fora da máscara não há sombra
+        resultado[dentro] = mascara[my[dentro] * tamanho[0] + mx[dentro]] # Consulta a máscara
+        return resultado # Pixels sombreados
+
+    def salvar(self, malha, caminho, **opcoes): # Renderiza e grava
+        """Renderiza a malha e grava em PNG ou PPM, conforme a extensão de 'caminho'.""" # Docstring
+        imagem = self.renderizar(malha, **opcoes) # Framebuffer
+        (salvar_ppm if caminho.lower().endswith(".ppm") else salvar_png)(imagem, caminho) # Formato pela extensão
+        return imagem # Também devolve a imagem
+
+    def renderizar_lote(self, malhas, caminhos=None, **opcoes): # Várias malhas com a mesma câmera
+        """ # Início da docstring
+        Renderiza uma sequência de malhas (ex.: todos os níveis) reaproveitando a câmera. # Objetivo
+        Com 'caminhos', grava cada imagem e retorna a lista de caminhos; sem, retorna as imagens. # Saída
+        Aceita geradores, então os níveis podem vir de 'SubdivisaoLoopEsfera.iterar_niveis()'. # Fluxo
+        """ # Fim da docstring
+        if caminhos is None: # Apenas imagens em memória
+            return [self.renderizar(malha, **opcoes) for malha in malhas] # Lista de imagens
+        gravados = [] # Caminhos gravados
+        for malha, caminho in zip(malhas, caminhos): # Uma imagem por malha
+            pasta = os.path.dirname(caminho) # Pasta de destino
+            if pasta: # Caminho com pasta
+                os.makedirs(pasta, exist_ok=True) # Cria se necessário
+            self.salvar(malha, caminho, **opcoes) # Renderiza e grava
+            gravados.append(caminho) # Registra
+        return gravados # Caminhos gravados
+
+def _fragmentos(triangulos, largura, altura): # Pixels cobertos por cada triângulo, em blocos
+    """ # Início da docstring
+    Percorre os triângulos (T, 3, 2) em pixels e gera blocos (triângulos, pixels, pesos baricêntricos). # Saída
+    Os triângulos são agrupados pelo tamanho da caixa envolvente; cada grupo é avaliado de uma vez # Vetorização
+    em uma grade (triângulos x pixels da caixa), limitada a LIMITE_AMOSTRAS candidatos por bloco. # Memória
+    """ # Fim da docstring
+    x, y = triangulos[..., 0], triangulos[..., 1] # (T, 3) coordenadas de tela
+    x0 = np.clip(np.ceil(x.min(axis=1) - 0.5), 0, largura).astype(np.int64) # Primeira coluna cujo centro pode estar dentro
+    x1 = np.clip(np.floor(x.max(axis=1) - 0.5), -1, largura - 1).astype(np.int64) # Última coluna
+    y0 = np.clip(np.ceil(y.min(axis=1) - 0.5), 0, altura).astype(np.int64) # Primeira linha
+    y1 = np.clip(np.floor(y.max(axis=1) - 0.5), -1, altura - 1).astype(np.int64) # Última linha
+    w, h = x1 - x0 + 1, y1 - y0 + 1 # Tamanho da caixa envolvente
+    area = (x[:, 1] - x[:, 0]) * (y[:, 2] - y[:, 0]) - (y[:, 1] - y[:, 0]) * (x[:, 2] - x[:, 0]) # Área orientada (x2)
+    validos = np.flatnonzero((w > 0) & (h > 0) & (area != 0)) # Descarta triângulos fora da tela ou degenerados
+
+    tamanhos, grupo = np.unique(w[validos] * (altura + 1) + h[validos], return_inverse=True) # Agrupa por (w, h)
+    ordem = np.argsort(grupo, kind='stable') # Triângulos agrupados
+    limites = np.cumsum(np.bincount(grupo, minlength=len(tamanhos))) # Fim de cada grupo
+    for tamanho, fim, inicio in zip(tamanhos, limites, np.concatenate([[0], limites[:-1]])): # Um tamanho de caixa por vez
+        bw, bh = divmod(int(tamanho), altura + 1) # Largura e altura da caixa
+        dx, dy = np.tile(np.arange(bw), bh), np.repeat(np.arange(bh), bw) # Deslocamentos dentro da caixa
+        passo = max(LIMITE_AMOSTRAS // (bw * bh), 1) # Triângulos por bloco
+        for parte in range(inicio, fim, passo): # Blocos do grupo
+            tris = validos[ordem[parte:min(parte + passo, fim)]] # Triângulos do bloco
+            px = x0[tris, np.newaxis] + dx # (T, bw*bh) colunas candidatas
+            py = y0[tris, np.newaxis] + dy # Linhas candidatas
+            cx, cy = px + 0.5, py + 0.5 # Centros dos pixels
+            xa, xb, xc = (x[tris, i, np.newaxis] for i in range(3)) # Vértices do triângulo
+            ya, yb, yc = (y[tris, i, np.newaxis] for i in range(3)) # Idem
+            inv_area = 1.0 / area[tris, np.newaxis] # Normalização das funções de aresta
+            l0 = ((xb - cx) * (yc - cy) - (yb - cy) * (xc - cx)) * inv_area # Peso do vértice a
+            l1 = ((xc - cx) * (ya - cy) - (yc - cy) * (xa - cx)) * inv_area # Peso do vértice b
+            l2 = 1.0 - l0 - l1 # Peso do vértice c
+            dentro = (l0 >= 0) & (l1 >= 0) & (l2 >= 0) # Centro do pixel dentro do triângulo
+            linha_tri = np.broadcast_to(tris[:, np.newaxis], dentro.shape)[dentro] # Triângulo de cada fragmento
+            yield linha_tri, (py * largura + px)[dentro], np.stack([l0[dentro], l1[dentro], l2[dentro]], axis=1) # Bloco de fragmentos
+
+def salvar_png(imagem, caminho): # PNG sem dependências externas
+    """Grava uma imagem RGB (altura, largura, 3) uint8 em PNG, usando apenas zlib e struct (gravação atômica).""" # Docstring
+    altura, largura, _ = imagem.shape # Dimensões
+    linhas = np.empty((altura, 1 + largura * 3), dtype=np.uint8) # Cada linha começa pelo tipo de filtro
+    linhas[:, 0] = 0 # Filtro 'None'
+    linhas[:, 1:] = imagem.reshape(altura, -1) # Pixels RGB
+
+    def bloco(tipo, dados): # Bloco PNG: tamanho, tipo, dados e CRC
+        return struct.pack(">I", len(dados)) + tipo + dados + struct.pack(">I", zlib.crc32(tipo + dados) & 0xFFFFFFFF) # Formato do bloco
+
+    with _gravacao_atomica(caminho) as arquivo: # Nunca deixa um PNG parcial no destino
+        arquivo.write(b"\x89PNG\r\n\x1a\n") # Assinatura
+        arquivo.write(bloco(b"IHDR", struct.pack(">IIBBBBB", largura, altura, 8, 2, 0, 0, 0))) # 8 bits, RGB
+        arquivo.write(bloco(b"IDAT", zlib.compress(linhas.tobytes(), 6))) # Pixels comprimidos
+        arquivo.write(bloco(b"IEND", b"")) # Fim
+
+def salvar_ppm(imagem, caminho): # PPM binário (P6)
+    """Grava uma imagem RGB (altura, largura, 3) uint8 em PPM binário (gravação atômica).""" # Docstring
+    altura, largura, _ = imagem.shape # Dimensões
+    with _gravacao_atomica(caminho) as arquivo: # Nunca deixa um PPM parcial no destino
+        arquivo.write(f"P6\n{largura} {altura}\n255\n".encode("ascii")) # Cabeçalho
+        arquivo.write(np.ascontiguousarray(imagem, dtype=np.uint8).tobytes()) # Pixels
@@ -1,8 +1,12 @@
 import matplotlib.pyplot as plt # Importa Matplotlib para criação de gráficos 2D e 3D
 from mpl_toolkits.mplot3d import Axes3D # Importa ferramentas para eixos tridimensionais
-from mpl_toolkits.mplot3d.art3d import Poly3DCollection # Permite desenhar coleções de triângulos em 3D
+from mpl_toolkits.mplot3d.art3d import Poly3DCollection, Line3DCollection # Coleções de triângulos e de segmentos em 3D
 from matplotlib.widgets import Slider # Importa o componente de controle deslizante (slider)
 import numpy as np # Importa NumPy para manipulação de arrays e vetores
+from esferaloop.visualizacao import iluminacao # Modelo de iluminação compartilhado com o rasterizador
+from esferaloop.visualizacao.iluminacao import LIMITES_CENA # Enquadramento da cena
+# 
+PIXELS_POR_FACE = 16.0 # Área de tela mínima por face no modo interativo (política de nível de detalhe)
 # 
 class Visualizador: # Classe dedicada à renderização visual da malha
     """ # Início da docstring da classe
@@ -14,77 +18,57 @@ class Visualizador: # Classe dedicada à renderização visual da malha
             fig = plt.figure(figsize=(10, 8)) # Cria uma nova figura com tamanho 10x8 polegadas
             ax = fig.add_subplot(111, projection='3d') # Adiciona um subgráfico com projeção tridimensional
 
-        vertices = malha.vertices # Pega as coordenadas XYZ dos pontos da malha
-        faces = malha.faces # Pega a conectividade dos triângulos da malha
-
         if mostrar_superficie: # Se a visualização de superfície (preenchida) estiver ativada
-            # Criar coleção de polígonos para a superfície
-            poly3d = [[vertices[idx] for idx in face] for face in faces] 
-
-            # --- CÁLCULO MANUAL DE ILUMINAÇÃO (Lambertian Shading) ---
-            v0, v1, v2 = vertices[faces[:, 0]], vertices[faces[:, 1]], vertices[faces[:, 2]]
-            normais = np.cross(v1 - v0, v2 - v0) # Vetor normal a cada face
-            with np.errstate(invalid='ignore'): # Trata divisão por zero em malhas degeneradas se houver
-                modulo = np.linalg.norm(normais, axis=1)[:, np.newaxis]
-                normais = np.where(modulo > 0, normais / modulo, 0)
-
-            direcao_luz = np.array([0.8, 0.4, 1.2]) # Luz inclinada para o lado para sombra lateral
-            direcao_luz /= np.linalg.norm(direcao_luz)
-
-            # --- CÁLCULO DE ILUMINAÇÃO (Lambert + Refletida) ---
-            dot_product = np.dot(normais, direcao_luz)
-            
-            # Luz direta (lado iluminado)
-            direta = np.clip(dot_product, 0.0, 1.0)
-            
-            # Luz Refletida (brilho sutil na base da sombra, conforme imagem de referência)
-            refletida = np.clip(-dot_product, 0.0, 1.0) * 0.2 
-            
-            # Intensidade base (com luz ambiente mínima)
-            intesidades_calculadas = np.clip(direta + refletida + 0.1, 0.0, 1.0)
-            
-            # Interpolação para controle do slider
-            intensidades_finais = (1.0 * (1 - intensidade_luz)) + (intesidades_calculadas * intensidade_luz)
-
-            # Converte intensidades em cores (tons de ciano/cinza azulado)
-            cores_faces = []
-            for i in intensidades_finais:
-                # Cor base: azul petróleo/ciano suave
-                cores_faces.append((0, i * 0.7 + 0.1, i * 0.7 + 0.2)) 
-
-            colecao = Poly3DCollection(poly3d, facecolors=cores_faces, 
+            # Polígonos, cores RGBA e sombra calculados de uma vez, como arrays (F, 3, 3) e (F, 4)
+            dados = Visualizador.preparar_render(malha, intensidade_luz) # Mesma iluminação Lambert + refletida
+            colecao = Poly3DCollection(dados["poligonos"], facecolors=dados["cores"], 
                                      edgecolors='black' if mostrar_wireframe else 'none',
                                      alpha=1.0)
             ax.add_collection3d(colecao)
+            sombra = dados["sombra"] # Já calculada junto com a superfície
 
-        elif mostrar_wireframe: # Caso apenas o esqueleto (linhas) seja solicitado
-            # Se apenas wireframe for solicitado # Título do bloco alternativo
-            for face in faces: # Itera por cada triângulo
-                v = vertices[face] # Pega os 3 pontos do triângulo
-                v = np.vstack([v, v[0]]) # Adiciona o primeiro ponto novamente ao final para fechar o triângulo ao desenhar
-                ax.plot(v[:,0], v[:,1], v[:,2], color='black', linewidth=0.5) # Plota as linhas pretas finas
-
-        # --- ADICIONA PLANO DE FUNDO (PISO - REMOVIDO VISUALMENTE) ---
-        piso_z = -1.1 # Mantemos o valor para o cálculo da sombra, mas não desenhamos o piso
+        else: # Sem superfície: nenhum sombreamento por face é calculado
+            if mostrar_wireframe: # Caso apenas o esqueleto (linhas) seja solicitado
+                # Cada aresta única vira um segmento de uma única coleção (sem um ax.plot por face)
+                segmentos = malha.vertices[malha.topologia.arestas] # (E, 2, 3) extremidades de cada aresta
+                ax.add_collection3d(Line3DCollection(segmentos, colors='black', linewidths=0.5)) # Plota as linhas pretas finas
+            sombra = iluminacao.projetar_sombra(malha.vertices)[malha.faces] # Só a sombra (mesmo cálculo de 'preparar_render')
 
         # --- CÁLCULO DE SOMBRA PROJETADA ---
-        # Projeta cada vértice na direção da luz até atingir o plano do piso
-        direcao_luz = np.array([0.8, 0.4, 1.2])
-        direcao_luz /= np.linalg.norm(direcao_luz)
-        
-        t = (piso_z - vertices[:, 2]) / direcao_luz[2]
-        vertices_sombra = vertices + t[:, np.newaxis] * direcao_luz
-        
-        poly_sombra = [[vertices_sombra[idx] for idx in face] for face in faces]
+        # Cada vértice é projetado na direção da luz até atingir o plano do piso
         # Sombra suave e sem bordas para silhueta limpa
-        sombra_colecao = Poly3DCollection(poly_sombra, facecolors='#111111', alpha=0.4, edgecolors='none', zorder=1)
+        sombra_colecao = Poly3DCollection(sombra, facecolors=iluminacao.COR_SOMBRA, alpha=iluminacao.ALFA_SOMBRA, edgecolors='none', zorder=1)
         ax.add_collection3d(sombra_colecao)
 
-        # Ajustar limites e labels # Configurações de visualização da cena
-        # Limites ajustados para a nova posição da sombra (mais para o lado)
-        ax.set_xlim([-1.8, 1.2]) 
-        ax.set_ylim([-1.5, 1.5]) 
-        ax.set_zlim([piso_z, 1.5]) 
+        Visualizador._configurar_cena(ax, title) # Ajustar limites e labels
+
+    @staticmethod # Não depende de estado
+    def preparar_render(malha, intensidade_luz=1.0): # Dados de desenho de um nível, prontos para as coleções
+        """ # Início da docstring
+        Calcula uma única vez, sem listas Python, tudo o que as coleções 3D precisam: # Objetivo principal
+        - poligonos (F, 3, 3): vertices[faces] # Superfície
+        - cores (F, 4): cores RGBA com a mesma iluminação de 'plotar_malha' # Sombreamento
+        - sombra (F, 3, 3): triângulos projetados no piso na direção da luz # Sombra
+        """ # Fim da docstring
+        vertices, faces = malha.vertices, malha.faces # Geometria do nível
+        poligonos = vertices[faces] # (F, 3, 3) sem listas aninhadas
+        intensidades = iluminacao.intensidades_faces(iluminacao.normais_faces(poligonos), intensidade_luz) # Lambert + refletida + ambiente
+        cores = iluminacao.cores_faces(intensidades) # (F, 4) RGBA
+        sombra = iluminacao.projetar_sombra(vertices)[faces] # (F, 3, 3) triângulos projetados no piso
+        return {"poligonos": poligonos, "cores": cores, "sombra": sombra} # Dados do nível
+
+    @staticmethod # Não depende de estado
+    def orcamento_faces(ax, pixels_por_face=PIXELS_POR_FACE) -> int: # Limite de faces pela área de tela
+        """Número máximo de faces que vale a pena desenhar no eixo: área em pixels / pixels por face.""" # Docstring
+        caixa = ax.get_window_extent() # Retângulo do eixo em pixels
+        return max(int(caixa.width * caixa.height / pixels_por_face), 1) # Pelo menos uma face
+
+    @staticmethod # Não depende de estado
+    def _configurar_cena(ax, title): # Enquadramento comum a todos os desenhos
+        # Limites ajustados para a posição da sombra (mais para o lado)
+        ax.set_xlim(LIMITES_CENA[0]) 
+        ax.set_ylim(LIMITES_CENA[1]) 
+        ax.set_zlim(LIMITES_CENA[2]) 
         ax.set_title(title) # Define o título do gráfico
         ax.axis('off') # Desativa a exibição dos eixos
 
@@ -102,27 +86,62 @@ class Visualizador: # Classe dedicada à renderização visual da malha
         plt.show() # Abre a janela com a progressão completa
 
     @staticmethod # Define método estático para gráfico interativo
-    def plot_interativo(malhas, metricas_por_nivel=None): # Cria janela com slider para navegar pelos níveis
-        """Cria um gráfico interativo com um slider e painel de estatísticas.""" # Docstring
+    def plot_interativo(malhas, metricas_por_nivel=None, max_faces=None, pixels_por_face=PIXELS_POR_FACE): # Cria janela com slider para navegar pelos níveis
+        """ # Início da docstring
+        Cria um gráfico interativo com um slider e painel de estatísticas. # Objetivo principal
+        As coleções de cada nível são montadas uma vez e guardadas; mover o slider só troca a visibilidade. # Cache de renderização
+        Níveis com mais faces que o orçamento ('max_faces' ou área de tela / 'pixels_por_face') são # Nível de detalhe
+        exibidos pelo nível mais fino que cabe no orçamento; as estatísticas continuam sendo as do nível escolhido. # Política LOD
+        Retorna (figura, slider): o slider só responde enquanto houver uma referência a ele (janelas não bloqueantes, testes). # Retorno
+        """ # Fim da docstring
         fig = plt.figure(figsize=(11, 9)) # Cria figura levemente maior para as estatísticas
         ax = fig.add_subplot(111, projection='3d') # Cria o eixo 3D principal
         plt.subplots_adjust(bottom=0.2, top=0.95) # Reserva espaço para o slider e margem superior
 
+        colecoes = {} # nível desenhado -> (superfície, sombra), criadas sob demanda
+        exibido = [None] # Nível cujas coleções estão visíveis no momento
+        texto_estatisticas = ax.text2D(0.05, 0.95, "", transform=ax.transAxes, # Painel reutilizado entre níveis
+                                       fontsize=11, family='monospace', verticalalignment='top',
+                                       bbox=dict(boxstyle='round', facecolor='white', alpha=0.7),
+                                       visible=bool(metricas_por_nivel)) # Só aparece se houver métricas
+
+        def nivel_desenhado(nv): # Aplica o orçamento de faces
+            limite = max_faces if max_faces is not None else Visualizador.orcamento_faces(ax, pixels_por_face) # Faces permitidas
+            while nv > 0 and len(malhas[nv].faces) > limite: # Nível fino demais para a tela
+                nv -= 1 # Usa o nível anterior (mesma forma, menos faces)
+            return nv # Nível que será desenhado
+
+        def obter_colecoes(nd): # Coleções de um nível, construídas só na primeira visita
+            if nd not in colecoes: # Primeira vez neste nível
+                dados = Visualizador.preparar_render(malhas[nd]) # Arrays prontos (sem listas Python)
+                superficie = Poly3DCollection(dados["poligonos"], facecolors=dados["cores"], edgecolors='black', alpha=1.0) # Superfície iluminada
+                sombra = Poly3DCollection(dados["sombra"], facecolors=iluminacao.COR_SOMBRA, alpha=iluminacao.ALFA_SOMBRA, edgecolors='none', zorder=1) # Sombra projetada
+                ax.add_collection3d(superficie, autolim=False) # Os limites da cena são fixos
+                ax.add_collection3d(sombra, autolim=False) # Idem
+                colecoes[nd] = (superficie, sombra) # Guarda no cache
+            return colecoes[nd] # Coleções do nível
+
         # Função para plotar um nível específico # Função interna de atualização (callback)
         def atualizar_plot(val): # val recebe o valor do nível vindo do slider
             nv = int(slider_nivel.val) # Pega o nível atual do slider correspondente
-            
-            ax.clear() # Limpa o desenho anterior (malha e texto)
-            malha = malhas[nv] # Pega a malha correspondente ao nível
-            
-            Visualizador.plotar_malha(malha, title=f"Subdivisão de Loop - Nível {nv}", 
-                               mostrar_wireframe=True, mostrar_superficie=True, ax=ax,
-                               intensidade_luz=1.0) # Redesenha com iluminação total fixa
+            nd = nivel_desenhado(nv) # Nível efetivamente desenhado
+            if exibido[0] != nd: # Só troca as coleções se o nível desenhado mudou
+                if exibido[0] is not None: # Esconde o nível anterior
+                    for colecao in colecoes[exibido[0]]: # Superfície e sombra
+                        colecao.set_visible(False) # Continua em cache para a próxima visita
+                for colecao in obter_colecoes(nd): # Mostra o novo nível
+                    colecao.set_visible(True) # Sem reconstruir
+                exibido[0] = nd # Atualiza o estado
+
+            titulo = f"Subdivisão de Loop - Nível {nv}" # Título do nível escolhido
+            if nd != nv: # O orçamento reduziu o nível desenhado
+                titulo += f" (exibindo nível {nd})" # Deixa claro o que está na tela
+            Visualizador._configurar_cena(ax, titulo) # Atualiza o título
 
             # --- ADICIONA ESTATÍSTICAS EM TEMPO REAL ---
             if metricas_por_nivel:
                 m = metricas_por_nivel[nv]
-                texto_estatisticas = (
+                texto_estatisticas.set_text( # Atualiza o painel existente
                     f"Estatísticas Nível {nv}:\n"
                     f"Vértices: {m['num_vertices']}\n"
                     f"Arestas: {m['num_arestas']}\n"
@@ -130,10 +149,6 @@ class Visualizador: # Classe dedicada à renderização visual da malha
                     f"Erro Médio Raio: {m['erro_medio']:.6f}\n"
                     f"Desvio Área: {m['desvio_padrao_area']:.6f}"
                 )
-                # Adiciona texto no canto superior esquerdo (coordenadas 2D da figura)
-                ax.text2D(0.05, 0.95, texto_estatisticas, transform=ax.transAxes, 
-                          fontsize=11, family='monospace', verticalalignment='top',
-                          bbox=dict(boxstyle='round', facecolor='white', alpha=0.7))
 
             fig.canvas.draw_idle() # Atualiza a tela de forma eficiente
 
@@ -149,3 +164,4 @@ class Visualizador: # Classe dedicada à renderização visual da malha
         atualizar_plot(None) # Chama o plot inicial manualmente
 
         plt.show() # Inicia o loop de eventos da interface gráfica
+        return fig, slider_nivel # Figura e controle, para uso programático
@@ -3,11 +3,18 @@ SphereLoop - Loop Subdivision Sphere Rendering
 
 Este pacote implementa o algoritmo de Loop Subdivision para transformar
 um icosaedro inicial em uma esfera suave.
+
+Nome alternativo leve para o pacote 'esferaloop': os mesmos objetos, com
+o Visualizador (Matplotlib) carregado apenas no primeiro acesso.
 """
 
-from sphereloop.core.mesh import Malha
-from sphereloop.core.loop_subdivision import SubdivisaoLoopEsfera
-from sphereloop.visualization.renderer import Visualizador
-from sphereloop.utils.metrics import obter_metricas_malha
+import esferaloop as _esferaloop
+from esferaloop import Malha, SubdivisaoLoopEsfera, __version__
+
+
+def __getattr__(nome):
+    return getattr(_esferaloop, nome)
+
 
-__version__ = "1.0.0"
+def __dir__():
+    return sorted(set(globals()) | set(dir(_esferaloop)))
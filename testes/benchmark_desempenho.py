@@ -0,0 +1,205 @@
+""" # Início da docstring
+Benchmark de desempenho do EsferaLoop: tempo e pico de memória por operação e por nível. # Objetivo principal
+Uso: python testes/benchmark_desempenho.py --niveis 0-8 --saida atual.json [--comparar base.json --limite 0.2] # Linha de comando
+O resultado é um JSON que pode ser comparado entre commits; o código de saída é 1 se houver regressão # Regressões
+acima do limite ou se algum motor rápido divergir do motor de referência. # Equivalência
+""" # Fim da docstring
+import argparse # Linha de comando
+import json # Resultados legíveis por máquina
+import os # Caminhos
+import platform # Descrição do ambiente
+import subprocess # Commit atual (se houver git)
+import sys # Caminho do pacote e código de saída
+import time # Relógio de parede
+import tracemalloc # Pico de memória (o NumPy registra suas alocações no tracemalloc)
+from concurrent.futures import ProcessPoolExecutor # Pool do motor paralelo, criado uma vez fora das medições
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src')) # Mesmo ajuste de caminho dos exemplos
+
+import matplotlib # Backend sem janela, antes de qualquer importação do pyplot
+matplotlib.use("Agg") # Renderização em memória
+import matplotlib.pyplot as plt # Fechamento das figuras entre repetições
+import numpy as np # Lotes e comparações
+
+from esferaloop.nucleo.instrumentacao import Instrumentacao # Execuções auxiliares sem mensagens de progresso
+from esferaloop.nucleo.malha import Malha # Estrutura medida
+from esferaloop.nucleo.paralelo import subdividir_paralelo # Motor paralelo com o pool do benchmark
+from esferaloop.nucleo.subdivisao_loop import SubdivisaoLoopEsfera # Motores de subdivisão
+from esferaloop.utilitarios.metricas import obter_metricas_malha # Métricas medidas
+from esferaloop.visualizacao.renderizador import Visualizador # Renderização medida
+
+VERSAO_FORMATO = 1 # Versão do JSON de resultados
+MOTORES_RAPIDOS = ("vetorizado", "esparso", "paralelo") # Conferidos contra o motor 'referencia'
+NIVEL_MAXIMO = { # Nível de entrada mais alto de cada caso (acima disso o custo domina a execução)
+    "referencia": 5, # Laço Python aresta a aresta
+    "obter_arestas": 7, # Dicionário com uma entrada por aresta
+    "plotar_malha": 6, # Uma coleção do Matplotlib com todas as faces
+    "subdividir_lote": 6, # B malhas de uma vez
+}
+TAMANHO_LOTE = 16 # Malhas por lote em 'subdividir_lote'
+TEMPO_MINIMO = 0.2 # Segundos: repete casos rápidos até atingir este total
+MAX_REPETICOES = 20 # Limite de repetições por caso
+
+def medir(funcao, preparar=None, finalizar=None) -> dict: # Tempo (melhor de várias) e pico de memória de uma chamada
+    """ # Início da docstring
+    'preparar' roda antes de cada chamada e 'finalizar' depois, ambos fora da medição. # Custos excluídos
+    O tempo é o mínimo entre as repetições; o pico de memória vem de uma execução separada com tracemalloc. # Método
+    """ # Fim da docstring
+    tempos = [] # Tempo de cada repetição
+    while len(tempos) < MAX_REPETICOES and (not tempos or sum(tempos) < TEMPO_MINIMO): # Casos rápidos repetem mais
+        argumento = preparar() if preparar else None # Estado novo para esta repetição
+        inicio = time.perf_counter() # Início da medição
+        resultado = funcao(argumento) if preparar else funcao() # Operação medida
+        tempos.append(time.perf_counter() - inicio) # Duração
+        if finalizar: # Limpeza fora da medição
+            finalizar(resultado) # Ex.: fechar figuras
+    argumento = preparar() if preparar else None # Estado novo para a medição de memória
+    tracemalloc.start() # Rastreamento ligado só agora (tem custo próprio)
+    resultado = funcao(argumento) if preparar else funcao() # Mesma operação
+    _, pico = tracemalloc.get_traced_memory() # Pico desde o início do rastreamento
+    tracemalloc.stop() # Desliga
+    if finalizar: # Limpeza
+        finalizar(resultado) # Ex.: fechar figuras
+    return {"tempo_s": min(tempos), "pico_bytes": int(pico), "repeticoes": len(tempos)} # Resumo do caso
+
+def _copia(malha: Malha) -> Malha: # Malha independente (mesma precisão e vincos)
+    return Malha(malha.vertices, malha.faces, precisao=malha.precisao, vincos=malha.vincos) # Arrays copiados
+
+def _plotar(malha): # plotar_malha + desenho no canvas Agg (onde está a maior parte do custo)
+    Visualizador.plotar_malha(malha) # Cria a figura e as coleções
+    plt.gcf().canvas.draw() # Rasteriza
+    return plt.gcf() # Figura para fechar depois
+
+def _comparar_motores(base: Malha, niveis) -> list: # Equivalência dos motores rápidos com o de referência
+    """Subdivide 'base' em cada motor e compara faces (iguais) e vértices (tolerância 1e-12) nível a nível, sem progresso no console.""" # Docstring
+    silencioso = Instrumentacao(silencioso=True) # Só o resumo de divergências aparece
+    referencia = SubdivisaoLoopEsfera(niveis, motor="referencia", malha_base=base, instrumentacao=silencioso).malhas # Níveis de referência
+    linhas = [] # Uma linha por motor e nível
+    for motor in MOTORES_RAPIDOS: # Cada motor rápido
+        malhas = SubdivisaoLoopEsfera(niveis, motor=motor, malha_base=base, instrumentacao=silencioso).malhas # Mesmos níveis
+        for nivel, (esperada, obtida) in enumerate(zip(referencia, malhas)): # Nível a nível
+            faces_iguais = bool(np.array_equal(esperada.faces, obtida.faces)) # Mesma topologia e ordem
+            erro = float(np.abs(esperada.vertices - obtida.vertices).max()) if faces_iguais else float("inf") # Maior diferença
+            linhas.append({"motor": motor, "nivel": nivel, "faces_iguais": faces_iguais, # Resultado
+                           "erro_max_vertices": erro, "ok": faces_iguais and erro <= 1e-12}) # Aprovado?
+    return linhas # Tabela de equivalência
+
+def executar_benchmark(niveis, nivel_equivalencia=4) -> dict: # Todos os casos, nível a nível
+    """ # Início da docstring
+    Mede, para cada nível de entrada em 'niveis': obter_arestas, subdividir (cada motor), normalizar_para_esfera, # Casos
+    obter_metricas_malha, plotar_malha (Agg) e subdividir_lote com TAMANHO_LOTE malhas. # Casos em lote
+    Também confere os motores rápidos contra o de referência até 'nivel_equivalencia'. # Equivalência
+    """ # Fim da docstring
+    resultados = [] # Uma linha por caso
+    def registrar(caso, nivel, malha, medida, motor=None): # Acrescenta uma linha
+        resultados.append({"caso": caso, "motor": motor, "nivel": nivel, "num_faces": len(malha.faces), **medida}) # Linha do JSON
+        print(f"  {caso:<22} {motor or '':<11} nível {nivel}: {medida['tempo_s'] * 1e3:10.2f} ms  " # Progresso no console
+              f"{medida['pico_bytes'] / 2**20:9.1f} MiB") # Memória
+
+    esfera = SubdivisaoLoopEsfera(max(niveis), normalizar_cada_passo=True, preguicoso=True, retencao="ultimo") # Níveis em fluxo
+    gerador = np.random.default_rng(0) # Perturbações reprodutíveis do lote
+    with ProcessPoolExecutor() as pool: # Motor paralelo: processos criados uma vez, fora das medições
+        subdividir_paralelo(Malha.gerar_icosaedro(), executor=pool) # Aquece os processos (início e importações)
+        for nivel, malha in enumerate(esfera.iterar_niveis()): # Um nível de entrada por vez
+            if nivel not in niveis: # Nível fora do intervalo pedido
+                continue # Apenas avança
+            print(f"Nível {nivel} ({len(malha.faces)} faces)") # Cabeçalho do nível
+            if nivel <= NIVEL_MAXIMO["obter_arestas"]: # Dicionário de arestas (formato legado)
+                registrar("obter_arestas", nivel, malha, medir(lambda m: m.obter_arestas(), # Topologia reconstruída
+                                                                preparar=lambda: _copia(malha))) # a cada repetição
+            for motor in ("referencia",) + MOTORES_RAPIDOS: # Cada motor de subdivisão
+                if motor == "referencia" and nivel > NIVEL_MAXIMO["referencia"]: # Lento demais
+                    continue # Pula
+                if motor == "paralelo": # Pool compartilhado: a medida não inclui a criação dos processos
+                    passo = lambda m: subdividir_paralelo(m, executor=pool) # Mesmo caminho de 'subdividir' dentro de 'iterar_niveis'
+                else: # Só o método 'subdividir' é usado ('esparso': operador em cache após a 1ª repetição)
+                    passo = SubdivisaoLoopEsfera(0, motor=motor, preguicoso=True).subdividir # Um passo no motor pedido
+                registrar("subdividir", nivel, malha, medir(passo, preparar=lambda: _copia(malha)), motor) # Um passo
+            registrar("normalizar_para_esfera", nivel, malha, medir(esfera.normalizar_para_esfera, # No lugar:
+                                                                     preparar=lambda: _copia(malha))) # sobre uma cópia
+            registrar("obter_metricas_malha", nivel, malha, medir(obter_metricas_malha, # Sem memorização:
+                                                                   preparar=lambda: _copia(malha))) # malha nova a cada vez
+            if nivel <= NIVEL_MAXIMO["plotar_malha"]: # Renderização com Matplotlib
+                registrar("plotar_malha", nivel, malha, medir(_plotar, preparar=lambda: malha, # Figura nova
+                                                               finalizar=lambda figura: plt.close(figura))) # Libera a figura
+            if nivel <= NIVEL_MAXIMO["subdividir_lote"]: # Muitas malhas com a mesma conectividade
+                lote = malha.vertices * (1 + 0.01 * gerador.standard_normal((TAMANHO_LOTE, len(malha.vertices), 1))) # (B, N, 3)
+                motor_lote = SubdivisaoLoopEsfera(1, preguicoso=True) # Um nível por chamada
+                motor_lote.subdividir_lote(lote, malha.faces) # Aquece o cache de operadores (a medida é só S @ V)
+                registrar("subdividir_lote", nivel, malha, medir(lambda: motor_lote.subdividir_lote(lote, malha.faces)), f"B={TAMANHO_LOTE}") # Lote
+
+    print(f"Equivalência com o motor de referência (níveis 0..{nivel_equivalencia})") # Cabeçalho
+    equivalencia = _comparar_motores(Malha.gerar_icosaedro(), nivel_equivalencia) # Esfera fechada
+    grade = _grade_com_borda() # Malha aberta: exercita as regras de borda
+    equivalencia += [dict(linha, malha="grade") for linha in _comparar_motores(grade, min(nivel_equivalencia, 3))] # Com bordas
+    for linha in equivalencia: # Resumo no console
+        if not linha["ok"]: # Apenas as falhas
+            print(f"  DIVERGÊNCIA: {linha}") # Detalhe
+    return {"versao": VERSAO_FORMATO, "ambiente": _ambiente(), "resultados": resultados, "equivalencia": equivalencia} # JSON completo
+
+def _grade_com_borda(n=8) -> Malha: # Quadrado triangulado n x n, com bordas
+    x, y = np.meshgrid(np.arange(n, dtype=np.float64), np.arange(n, dtype=np.float64)) # Grade regular
+    vertices = np.stack([x.ravel(), y.ravel(), np.sin(x.ravel()) * np.cos(y.ravel())], axis=1) # Superfície ondulada
+    canto = (np.arange(n - 1)[:, np.newaxis] * n + np.arange(n - 1)).ravel() # Canto inferior de cada quadrado
+    faces = np.concatenate([np.stack([canto, canto + 1, canto + n + 1], axis=1), np.stack([canto, canto + n + 1, canto + n], axis=1)]) # 2 triângulos
+    return Malha(vertices, faces) # Malha aberta
+
+def _ambiente() -> dict: # Contexto necessário para comparar resultados
+    try: # Commit atual, se o benchmark rodar dentro do repositório
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, # Hash completo
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None # Vazio fora do git
+    except OSError: # git indisponível
+        commit = None # Sem commit
+    return {"commit": commit, "python": platform.python_version(), "numpy": np.__version__, # Versões
+            "plataforma": platform.platform(), "processador": platform.processor(), "nucleos": os.cpu_count()} # Máquina
+
+def comparar(atual: dict, base: dict, limite=0.2) -> list: # Regressões entre duas execuções
+    """ # Início da docstring
+    Compara casos com a mesma chave (caso, motor, nível) e retorna os que ficaram mais lentos ou usaram mais memória # Critério
+    do que base * (1 + limite). Casos presentes em só uma das execuções são ignorados. # Casos novos
+    """ # Fim da docstring
+    chave = lambda linha: (linha["caso"], linha["motor"], linha["nivel"]) # Identificação de cada caso
+    anteriores = {chave(linha): linha for linha in base["resultados"]} # Índice da base
+    regressoes = [] # Casos acima do limite
+    for linha in atual["resultados"]: # Cada caso atual
+        anterior = anteriores.get(chave(linha)) # Mesmo caso na base
+        if anterior is None: # Caso novo
+            continue # Nada a comparar
+        for medida in ("tempo_s", "pico_bytes"): # Tempo e memória
+            if anterior[medida] > 0 and linha[medida] > anterior[medida] * (1 + limite): # Acima da tolerância
+                regressoes.append({"caso": linha["caso"], "motor": linha["motor"], "nivel": linha["nivel"], "medida": medida, # Identificação
+                                   "base": anterior[medida], "atual": linha[medida], "razao": linha[medida] / anterior[medida]}) # Quanto piorou
+    return regressoes # Lista vazia: sem regressões
+
+def _intervalo(texto) -> list: # '0-8' ou '3' ou '0,2,4'
+    niveis = [] # Níveis pedidos
+    for parte in texto.split(","): # Partes separadas por vírgula
+        inicio, _, fim = parte.partition("-") # Intervalo opcional
+        niveis += list(range(int(inicio), int(fim or inicio) + 1)) # Inclusivo
+    return sorted(set(niveis)) # Sem repetições
+
+def main(argumentos=None) -> int: # Ponto de entrada da linha de comando
+    parser = argparse.ArgumentParser(description="Benchmark de desempenho do EsferaLoop.") # Opções
+    parser.add_argument("--niveis", type=_intervalo, default=_intervalo("0-8"), help="níveis de entrada, ex.: 0-8 ou 0,4,8") # Níveis
+    parser.add_argument("--saida", default="benchmark.json", help="arquivo JSON de resultados") # Saída
+    parser.add_argument("--comparar", help="JSON de uma execução anterior (base)") # Base
+    parser.add_argument("--limite", type=float, default=0.2, help="regressão tolerada (0.2 = 20%%)") # Tolerância
+    parser.add_argument("--nivel-equivalencia", type=int, default=4, help="último nível conferido contra a referência") # Equivalência
+    opcoes = parser.parse_args(argumentos) # Lê os argumentos
+
+    relatorio = executar_benchmark(opcoes.niveis, opcoes.nivel_equivalencia) # Executa todos os casos
+    with open(opcoes.saida, "w", encoding="utf-8") as arquivo: # Grava o JSON
+        json.dump(relatorio, arquivo, indent=2, ensure_ascii=False) # Legível também por pessoas
+    print(f"Resultados gravados em {opcoes.saida}") # Confirmação
+
+    falhou = not all(linha["ok"] for linha in relatorio["equivalencia"]) # Algum motor divergiu?
+    if opcoes.comparar: # Comparação com uma execução anterior
+        with open(opcoes.comparar, encoding="utf-8") as arquivo: # Base
+            regressoes = comparar(relatorio, json.load(arquivo), opcoes.limite) # Casos acima do limite
+        for r in regressoes: # Relatório das regressões
+            print(f"REGRESSÃO {r['caso']} {r['motor'] or ''} nível {r['nivel']} {r['medida']}: {r['razao']:.2f}x") # Uma linha por caso
+        falhou = falhou or bool(regressoes) # Regressão também reprova
+    return 1 if falhou else 0 # Código de saída para CI
+
+if __name__ == "__main__": # Execução direta
+    sys.exit(main()) # Propaga o código de saída
@@ -0,0 +1,62 @@
+""" # Início da docstring
+Escalonamento do motor 'paralelo': tempo de um passo de Loop e aceleração sobre o motor vetorizado serial por número de processos. # Objetivo principal
+Uso: python testes/benchmark_paralelo.py --nivel 7 --processos 1,2,4,8 [--saida escalonamento.json] # Linha de comando
+O pool de cada contagem é criado e aquecido fora da medição e passado ao motor via 'executor='; # Custo de criação excluído
+contagens acima de os.cpu_count() disputam os mesmos núcleos e aparecem marcadas na tabela. # Interpretação
+""" # Fim da docstring
+import argparse # Linha de comando
+import json # Resultados legíveis por máquina
+import os # Número de núcleos
+import sys # Caminho do pacote
+from concurrent.futures import ProcessPoolExecutor # Pool reutilizado entre as repetições
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src')) # Mesmo ajuste de caminho dos exemplos
+
+import numpy as np # Comparação dos resultados
+
+from benchmark_desempenho import _ambiente, _copia, medir # Mesmo método de medição do benchmark principal
+from esferaloop.nucleo.instrumentacao import Instrumentacao # Execução sem mensagens de progresso
+from esferaloop.nucleo.paralelo import subdividir_paralelo # Motor medido
+from esferaloop.nucleo.subdivisao_loop import SubdivisaoLoopEsfera # Malha de entrada e motor serial
+
+def executar_escalonamento(nivel, processos) -> dict: # Serial x paralelo com P processos
+    """ # Início da docstring
+    Mede um passo de subdivisão da icosfera de nível 'nivel' no motor vetorizado e no paralelo com cada P em 'processos'. # Casos
+    A aceleração é tempo_serial / tempo_paralelo; cada resultado paralelo é conferido contra o serial (faces e vértices iguais). # Métrica
+    """ # Fim da docstring
+    silencioso = Instrumentacao(silencioso=True) # Só a tabela aparece no console
+    malha = SubdivisaoLoopEsfera(nivel, normalizar_cada_passo=True, retencao="ultimo", instrumentacao=silencioso).obter_malha() # Entrada
+    serial = SubdivisaoLoopEsfera(0, preguicoso=True, instrumentacao=silencioso) # Motor vetorizado (só 'subdividir' é usado)
+    esperada = serial.subdividir(_copia(malha)) # Resultado de referência
+    tempo_serial = medir(serial.subdividir, preparar=lambda: _copia(malha))["tempo_s"] # Linha de base
+    print(f"Nível {nivel} ({len(malha.faces)} faces), {os.cpu_count()} núcleo(s) disponível(is)") # Cabeçalho
+    print(f"  {'processos':>9} {'tempo (ms)':>11} {'aceleração':>11}") # Colunas
+    print(f"  {'serial':>9} {tempo_serial * 1e3:11.2f} {1.0:10.2f}x") # Linha de base
+    linhas = [] # Uma linha por contagem de processos
+    for num_processos in processos: # Cada tamanho de pool
+        with ProcessPoolExecutor(max_workers=num_processos) as pool: # Criado fora da medição
+            obtida = subdividir_paralelo(_copia(malha), num_processos, executor=pool) # Aquece os processos (importações, fork)
+            iguais = bool(np.array_equal(esperada.faces, obtida.faces) and np.array_equal(esperada.vertices, obtida.vertices)) # Equivalência
+            tempo = medir(lambda m: subdividir_paralelo(m, num_processos, executor=pool), preparar=lambda: _copia(malha))["tempo_s"] # Um passo
+        excedente = os.cpu_count() is not None and num_processos > os.cpu_count() # Mais processos do que núcleos
+        linhas.append({"processos": num_processos, "tempo_s": tempo, "aceleracao": tempo_serial / tempo, # Resultado
+                       "identico": iguais, "acima_dos_nucleos": excedente}) # Conferências
+        print(f"  {num_processos:>9} {tempo * 1e3:11.2f} {tempo_serial / tempo:10.2f}x" # Linha da tabela
+              f"{'  (acima dos núcleos)' if excedente else ''}{'' if iguais else '  DIVERGÊNCIA'}") # Marcas
+    return {"ambiente": _ambiente(), "nivel": nivel, "num_faces": len(malha.faces), "tempo_serial_s": tempo_serial, "paralelo": linhas} # JSON
+
+def main(argumentos=None) -> int: # Ponto de entrada da linha de comando
+    parser = argparse.ArgumentParser(description="Escalonamento do motor paralelo do EsferaLoop.") # Opções
+    parser.add_argument("--nivel", type=int, default=7, help="nível de entrada (7: 327680 faces)") # Tamanho da malha
+    parser.add_argument("--processos", default="1,2,4,8", help="contagens de processos, ex.: 1,2,4,8") # Tamanhos de pool
+    parser.add_argument("--saida", help="arquivo JSON de resultados (opcional)") # Saída
+    opcoes = parser.parse_args(argumentos) # Lê os argumentos
+
+    relatorio = executar_escalonamento(opcoes.nivel, [int(p) for p in opcoes.processos.split(",")]) # Executa a tabela
+    if opcoes.saida: # Gravação opcional
+        with open(opcoes.saida, "w", encoding="utf-8") as arquivo: # Grava o JSON
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False) # Legível também por pessoas
+    return 0 if all(linha["identico"] for linha in relatorio["paralelo"]) else 1 # Divergência reprova
+
+if __name__ == "__main__": # Execução direta
+    sys.exit(main()) # Propaga o código de saída
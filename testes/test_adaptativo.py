@@ -0,0 +1,76 @@
+""" # Início da docstring
+Testes do refinamento adaptativo: malha fechada e orientada, equilíbrio 2:1 entre vizinhas e ausência de junções em T. # Objetivo principal
+A malha base é um icosaedro com direções perturbadas, para que o refinamento não seja uniforme. # Malha de teste
+Uso: python -m pytest testes/test_adaptativo.py # Linha de comando
+""" # Fim da docstring
+import os # Caminho do pacote
+import sys # Ajuste do caminho de importação
+
+import numpy as np # Verificações vetorizadas
+import pytest # Executor dos testes
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')) # Mesmo ajuste de caminho dos exemplos
+
+from esferaloop.nucleo.adaptativo import subdividir_adaptativo # Função testada
+from esferaloop.nucleo.malha import Malha # Malha base
+
+def malha_base() -> Malha: # Icosaedro irregular (faces de tamanhos diferentes)
+    icosaedro = Malha.gerar_icosaedro() # 20 faces
+    ruido = 0.15 * np.random.default_rng(1).standard_normal(icosaedro.vertices.shape) # Perturbação reprodutível
+    return Malha(icosaedro.vertices + ruido, icosaedro.faces) # Mesma conectividade
+
+def arestas_por_face(faces) -> np.ndarray: # Semi-arestas (v1,v2), (v2,v3), (v3,v1) de cada face
+    return np.stack([faces, faces[:, [1, 2, 0]]], axis=2).reshape(-1, 2) # (3F, 2)
+
+def coordenadas_na_base(base, malha) -> tuple: # Face base e baricêntricas dos cantos de cada face (projeção central)
+    """Para cada face, a face base atravessada pelo raio do centroide e as baricêntricas planas dos seus 3 cantos.""" # Docstring
+    inversas = np.linalg.inv(base.vertices[base.faces].transpose(0, 2, 1)) # (20, 3, 3): colunas A, B, C
+    lam = np.einsum('tij,fj->fti', inversas, malha.vertices[malha.faces].mean(axis=1)) # (F, 20, 3) sem normalizar
+    soma = lam.sum(axis=2) # > 0 só do lado certo da origem
+    face_base = np.argmax(np.where(soma > 0, (lam / soma[..., np.newaxis]).min(axis=2), -np.inf), axis=1) # Todas >= 0
+    cantos = np.einsum('fij,fkj->fki', inversas[face_base], malha.vertices[malha.faces]) # (F, 3, 3)
+    return face_base, cantos / cantos.sum(axis=2, keepdims=True) # Baricêntricas planas
+
+@pytest.mark.parametrize("esfera,tolerancia", [(True, 0.005), (False, 0.01)]) # Alvo esfera e superfície limite
+def test_fechada_e_orientada(esfera, tolerancia): # Cada aresta com 2 faces, percorrida em sentidos opostos
+    malha, relatorio = subdividir_adaptativo(malha_base(), tolerancia, esfera=esfera) # Refinamento não uniforme
+    assert relatorio["faces_verdes"] > 0 # Há transições: o teste não é trivial
+    semi = arestas_por_face(malha.faces) # Semi-arestas orientadas
+    chaves = semi[:, 0] * len(malha.vertices) + semi[:, 1] # (a, b) orientada
+    assert len(np.unique(chaves)) == len(chaves) # Nenhuma semi-aresta repetida (orientação consistente)
+    assert np.isin(semi[:, 1] * len(malha.vertices) + semi[:, 0], chaves).all() # Toda semi-aresta tem a gêmea (b, a)
+    assert len(malha.vertices) - len(chaves) // 2 + len(malha.faces) == 2 # Euler: V - E + F = 2 (esfera)
+
+def test_equilibrio_2_para_1_e_sem_juncoes_em_t(): # Vizinhas diferem no máximo um nível; pontos médios não pendurados
+    base = malha_base() # Alvo: esfera unitária
+    malha, relatorio = subdividir_adaptativo(base, 0.002) # Vários níveis diferentes
+    face_base, cantos = coordenadas_na_base(base, malha) # Posição de cada canto no plano da face base
+    lados = np.abs(cantos - cantos[:, [1, 2, 0]]).max(axis=(1, 2)) # 2^-nivel: maior passo baricêntrico (também nas verdes)
+    niveis = np.round(-np.log2(lados)).astype(int) # Nível de cada face
+    assert niveis.max() == relatorio["nivel_max"] and niveis.min() < niveis.max() # Refinamento não uniforme
+
+    semi = arestas_por_face(malha.faces) # Semi-arestas orientadas
+    chaves = np.minimum(semi[:, 0], semi[:, 1]) * len(malha.vertices) + np.maximum(semi[:, 0], semi[:, 1]) # Aresta não orientada
+    ordem = np.argsort(chaves, kind="stable") # As duas faces de cada aresta ficam juntas
+    faces_da_aresta = (ordem // 3).reshape(-1, 2) # Pares de faces vizinhas (a malha é fechada)
+    assert (chaves[ordem].reshape(-1, 2)[:, 0] == chaves[ordem].reshape(-1, 2)[:, 1]).all() # Exatamente duas por aresta
+    assert (np.abs(niveis[faces_da_aresta[:, 0]] - niveis[faces_da_aresta[:, 1]]) <= 1).all() # Equilíbrio 2:1
+
+    meios = (cantos + cantos[:, [1, 2, 0]]) / 2 # Ponto médio plano de cada lado, em baricêntricas
+    meios = np.einsum('fkj,fjd->fkd', meios, base.vertices[base.faces[face_base]]).reshape(-1, 3) # Plano da face base
+    meios /= np.linalg.norm(meios, axis=1, keepdims=True) # Projetado como os vértices novos
+    vertices = {tuple(v) for v in np.round(malha.vertices, 9)} # Posições existentes
+    pendurados = [tuple(v) in vertices for v in np.round(meios, 9)] # Ponto médio de um lado que já é vértice
+    assert not any(pendurados) # Nenhuma junção em T
+
+def grade_aberta(n=4) -> Malha: # Quadrado triangulado n x n, com bordas
+    x, y = np.meshgrid(np.arange(n, dtype=np.float64), np.arange(n, dtype=np.float64)) # Grade regular
+    vertices = np.stack([x.ravel(), y.ravel(), 0.3 * x.ravel() ** 2 - 0.2 * x.ravel() * y.ravel()], axis=1) # Superfície curva
+    canto = (np.arange(n - 1)[:, np.newaxis] * n + np.arange(n - 1)).ravel() # Canto inferior de cada quadrado
+    faces = np.concatenate([np.stack([canto, canto + 1, canto + n + 1], axis=1), np.stack([canto, canto + n + 1, canto + n], axis=1)]) # 2 triângulos
+    return Malha(vertices, faces) # Malha aberta
+
+@pytest.mark.parametrize("base", [grade_aberta, lambda: Malha(malha_base().vertices, malha_base().faces, vincos=[[0, 1], [1, 5]])]) # Borda e vinco
+def test_superficie_limite_exige_malha_fechada_sem_vincos(base): # Erro explícito antes de refinar
+    with pytest.raises(ValueError, match="esfera=False.*fechadas, manifold e sem vincos"): # Limitação nomeada
+        subdividir_adaptativo(base(), 0.01, esfera=False) # Alvo na superfície limite
@@ -0,0 +1,135 @@
+""" # Início da docstring
+Testes de ida e volta dos formatos de arquivo: .malha (memmap), PLY, STL e OBJ. # Objetivo principal
+Conferem dtypes, vincos, topologia gravada e a sobrescrita atômica (arquivo mapeado continua válido). # Casos
+Uso: python -m pytest testes/test_arquivos.py # Linha de comando
+""" # Fim da docstring
+import os # Listagem da pasta temporária
+import sys # Ajuste do caminho de importação
+
+import numpy as np # Comparações
+import pytest # Executor dos testes
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')) # Mesmo ajuste de caminho dos exemplos
+
+from esferaloop.nucleo.malha import Malha # Malhas gravadas
+from esferaloop.nucleo.topologia import TopologiaMalha # Topologia reconstruída para comparação
+from esferaloop.utilitarios import arquivos # Módulo testado
+from esferaloop.utilitarios.arquivos import carregar_malha, carregar_obj, carregar_ply, exportar_ply, exportar_stl, salvar_malha # Leitores e gravadores
+
+VINCOS = [[0, 1], [1, 5], [5, 0]] # Triângulo de arestas afiadas do icosaedro
+
+def malha_com_vincos(precisao="float64") -> Malha: # Icosaedro com vincos marcados
+    icosaedro = Malha.gerar_icosaedro(precisao) # 12 vértices, 20 faces
+    return Malha(icosaedro.vertices, icosaedro.faces, precisao=precisao, vincos=VINCOS) # Mesma geometria com vincos
+
+@pytest.mark.parametrize("precisao,dtype", [("float32", "<f4"), ("float64", "<f8")]) # Cada precisão gravada
+def test_malha_ida_e_volta(tmp_path, precisao, dtype): # Formato .malha com vincos e topologia
+    malha = malha_com_vincos() # Original em float64
+    caminho = str(tmp_path / "icosaedro.malha") # Arquivo de saída
+    salvar_malha(malha, caminho, precisao=precisao, incluir_topologia=True) # Grava tudo
+    lida = carregar_malha(caminho) # Mapeada do disco
+    assert isinstance(lida.vertices, np.memmap) and isinstance(lida.faces, np.memmap) # Sem cópia
+    assert lida.vertices.dtype == np.dtype(dtype) and lida.faces.dtype == np.dtype("<i4") # dtypes do formato
+    assert np.array_equal(lida.vertices, malha.vertices.astype(dtype)) # Mesmas posições (na precisão gravada)
+    assert np.array_equal(lida.faces, malha.faces) # Mesmas faces
+    assert lida.vincos.dtype == np.int64 and np.array_equal(lida.vincos, VINCOS) # Vincos preservados
+    assert isinstance(lida.topologia_em_cache.arestas, np.memmap) # Topologia associada sem reconstrução (lida do arquivo)
+    reconstruida = TopologiaMalha(malha.faces, len(malha.vertices)) # Referência
+    for nome in ("arestas", "faces_aresta", "num_faces_aresta", "face_arestas", "vizinhos_inicio", "vizinhos"): # Cada tabela
+        assert np.array_equal(getattr(lida.topologia, nome), getattr(reconstruida, nome)), nome # Mesmo conteúdo
+
+def test_malha_sem_topologia_nem_vincos(tmp_path): # Seções opcionais ausentes
+    caminho = str(tmp_path / "simples.malha") # Arquivo de saída
+    salvar_malha(Malha.gerar_icosaedro(), caminho) # Padrão: sem topologia
+    lida = carregar_malha(caminho) # Mapeada
+    assert lida.topologia_em_cache is None and len(lida.vincos) == 0 # Nada extra
+    assert lida.topologia.num_arestas == 30 and lida.topologia_em_cache is not None # Construída sob demanda
+
+def test_sobrescrita_atomica(tmp_path): # Regravar um arquivo mapeado não altera a malha já aberta
+    caminho = str(tmp_path / "nivel.malha") # Mesmo destino nas duas gravações
+    antiga = Malha.gerar_icosaedro() # Primeira versão
+    salvar_malha(antiga, caminho) # Grava
+    mapeada = carregar_malha(caminho) # Aberta a partir do arquivo antigo
+    nova = Malha(2 * antiga.vertices, antiga.faces[::-1]) # Conteúdo diferente, mesmo tamanho
+    salvar_malha(nova, caminho) # Sobrescreve
+    assert np.array_equal(mapeada.vertices, antiga.vertices) # O mapeamento antigo continua intacto
+    assert np.array_equal(carregar_malha(caminho).vertices, nova.vertices) # Leitores novos veem a versão nova
+    assert sorted(os.listdir(tmp_path)) == ["nivel.malha"] # Nenhum temporário sobrando
+
+def test_sobrescrita_com_erro_preserva_arquivo(tmp_path, monkeypatch): # Falha no meio da gravação
+    caminho = str(tmp_path / "nivel.malha") # Destino
+    salvar_malha(Malha.gerar_icosaedro(), caminho) # Versão válida
+    conteudo = open(caminho, "rb").read() # Bytes originais
+    def falhar(*_): # Simula disco cheio durante a gravação
+        raise OSError("disco cheio") # Erro no meio do arquivo
+    monkeypatch.setattr(arquivos, "_escrever_em_blocos", falhar) # Falha ao gravar os dados
+    with pytest.raises(OSError): # Erro propagado
+        salvar_malha(Malha.gerar_icosaedro(), caminho) # Tentativa de sobrescrita
+    assert open(caminho, "rb").read() == conteudo # Arquivo antigo intacto
+    assert sorted(os.listdir(tmp_path)) == ["nivel.malha"] # Temporário removido
+
+@pytest.mark.parametrize("precisao", ["float32", "float64"]) # Tipo das coordenadas no PLY
+def test_ply_ida_e_volta(tmp_path, precisao): # exportar_ply -> carregar_ply
+    malha = malha_com_vincos() # Original em float64
+    caminho = str(tmp_path / "icosaedro.ply") # Arquivo de saída
+    exportar_ply(malha, caminho, precisao=precisao) # PLY binário
+    lida = carregar_ply(caminho, precisao=precisao) # Leitura na mesma precisão
+    assert lida.vertices.dtype == np.dtype(precisao) # Precisão pedida
+    assert np.array_equal(lida.vertices, malha.vertices.astype(precisao)) # Mesmas posições
+    assert np.array_equal(lida.faces, malha.faces) # Mesmas faces
+
+def test_stl_conteudo(tmp_path): # STL binário: cabeçalho, triângulos e normais
+    malha = Malha.gerar_icosaedro() # Malha fechada
+    caminho = str(tmp_path / "icosaedro.stl") # Arquivo de saída
+    exportar_stl(malha, caminho) # Grava
+    dados = open(caminho, "rb").read() # Conteúdo completo
+    assert int(np.frombuffer(dados, dtype="<u4", count=1, offset=80)[0]) == len(malha.faces) # Número de triângulos
+    registro = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("atributo", "<u2")]) # 50 bytes
+    registros = np.frombuffer(dados, dtype=registro, offset=84) # Todos os triângulos
+    assert len(dados) == 84 + len(malha.faces) * registro.itemsize # Sem bytes extras
+    assert np.array_equal(registros["vertices"], malha.vertices[malha.faces].astype(np.float32)) # Vértices de cada triângulo
+    centros = registros["vertices"].mean(axis=1) # Centro de cada face
+    assert np.allclose(np.linalg.norm(registros["normal"], axis=1), 1, atol=1e-6) # Normais unitárias
+    assert (np.einsum("ij,ij->i", registros["normal"], centros) > 0).all() # Apontam para fora
+
+def test_obj_ida_e_volta(tmp_path): # Texto OBJ gravado a partir da malha e lido de volta
+    malha = Malha.gerar_icosaedro() # Malha de origem
+    caminho = tmp_path / "icosaedro.obj" # Arquivo de saída
+    linhas = [f"v {x!r} {y!r} {z!r}" for x, y, z in malha.vertices.tolist()] # Posições com todos os dígitos
+    linhas += [f"f {a + 1}/1/1 {b + 1}//2 {c - len(malha.vertices)}" for a, b, c in malha.faces.tolist()] # Base 1, v/vt/vn e negativos
+    caminho.write_text("\n".join(linhas) + "\n", encoding="utf-8") # Grava
+    for precisao in ("float32", "float64"): # Cada precisão de leitura
+        lida = carregar_obj(str(caminho), precisao=precisao) # Leitura
+        assert lida.vertices.dtype == np.dtype(precisao) # Precisão pedida
+        assert np.array_equal(lida.vertices, malha.vertices.astype(precisao)) # Mesmas posições
+        assert np.array_equal(lida.faces, malha.faces) # Mesmas faces
+
+def test_obj_poligonos_em_leque(tmp_path): # Quadriláteros viram dois triângulos
+    caminho = tmp_path / "quadrado.obj" # Arquivo de saída
+    caminho.write_text("v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nf 1 2 3 4\n", encoding="utf-8") # Um quadrilátero
+    assert carregar_obj(str(caminho)).faces.tolist() == [[0, 1, 2], [0, 2, 3]] # Leque a partir do primeiro vértice
+
+def test_de_arrays_com_topologia(): # Construtor alternativo recebe a topologia pronta
+    malha = Malha.gerar_icosaedro() # Arrays de origem
+    topologia = TopologiaMalha(malha.faces, len(malha.vertices)) # Pronta
+    envolvida = Malha.de_arrays(malha.vertices, malha.faces, vincos=VINCOS, topologia=topologia) # Sem cópia
+    assert envolvida.vertices is malha.vertices and envolvida.faces is malha.faces # Mesmos arrays
+    assert envolvida.topologia is topologia and np.array_equal(envolvida.vincos, VINCOS) # Usadas como estão
+
+def test_cache_operadores_em_disco(tmp_path, monkeypatch): # Operadores .npz gravados de forma atômica e relidos
+    pytest.importorskip("scipy") # Operadores são matrizes esparsas
+    from esferaloop.nucleo.operador import CacheOperadores # Importação local: SciPy é opcional
+    malha = malha_com_vincos() # Conectividade com vincos
+    gravado = CacheOperadores(diretorio=str(tmp_path)).obter(malha.faces, len(malha.vertices), 2, VINCOS) # Níveis 1 e 2 em disco
+    assert sorted(nome.rsplit("_", 1)[1] for nome in os.listdir(tmp_path)) == ["n1.npz", "n2.npz"] # Nenhum temporário
+    lido = CacheOperadores(diretorio=str(tmp_path)).obter(malha.faces, len(malha.vertices), 2, VINCOS) # Cache novo: lido do disco
+    assert all((a != b).nnz == 0 for a, b in zip(gravado.passos, lido.passos)) # Mesmas matrizes
+    assert all(np.array_equal(a, b) for a, b in zip(gravado.vincos, lido.vincos)) # Mesmos vincos por nível
+
+    vazio = tmp_path / "falha" # Pasta sem operadores
+    def falhar(*_, **__): # Simula disco cheio durante a gravação
+        raise OSError("disco cheio") # Erro no meio do arquivo
+    monkeypatch.setattr(np, "savez", falhar) # Falha ao gravar o .npz
+    with pytest.raises(OSError, match="disco cheio"): # Erro propagado
+        CacheOperadores(diretorio=str(vazio)).obter(malha.faces, len(malha.vertices), 1) # Primeiro nível
+    assert os.listdir(vazio) == [] # Nenhum arquivo parcial nem temporário
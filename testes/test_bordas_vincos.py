@@ -0,0 +1,78 @@
+""" # Início da docstring
+Testes das regras de borda, vinco e canto e da validação de malhas não-variedade, em todos os motores. # Objetivo principal
+- Ímpar em aresta afiada (borda ou vinco): ponto médio. Par com 2 arestas afiadas: 3/4 v + 1/8 (b1 + b2). # Regras
+- Par com mais de 2 arestas afiadas (canto): fixo. Aresta com 3 faces ou vinco fora das arestas: ValueError. # Casos especiais
+Uso: python -m pytest testes/test_bordas_vincos.py # Linha de comando
+""" # Fim da docstring
+import os # Caminho do pacote
+import sys # Ajuste do caminho de importação
+
+import numpy as np # Comparações
+import pytest # Executor dos testes
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')) # Mesmo ajuste de caminho dos exemplos
+
+from esferaloop.nucleo.instrumentacao import Instrumentacao # Sem mensagens de progresso
+from esferaloop.nucleo.malha import Malha # Malhas de entrada
+from esferaloop.nucleo.subdivisao_loop import SubdivisaoLoopEsfera # Motores testados
+
+MOTORES = SubdivisaoLoopEsfera.MOTORES # Todos os motores seguem as mesmas regras
+
+def subdividir(malha, motor) -> Malha: # Um passo de Loop no motor pedido
+    if motor == "esparso": # Operador esparso
+        pytest.importorskip("scipy") # Dependência opcional
+    opcoes = {"num_processos": 2} if motor == "paralelo" else {} # Dois processos: exercita a divisão em blocos
+    return SubdivisaoLoopEsfera(0, motor=motor, preguicoso=True, instrumentacao=Instrumentacao(silencioso=True), **opcoes).subdividir(malha) # Só o passo
+
+def retalho_aberto(n=4) -> Malha: # Grade n x n triangulada, fora de um plano
+    x, y = np.meshgrid(np.arange(n, dtype=np.float64), np.arange(n, dtype=np.float64)) # Grade regular
+    vertices = np.stack([x.ravel(), y.ravel(), 0.3 * x.ravel() ** 2 - 0.2 * x.ravel() * y.ravel()], axis=1) # Superfície curva
+    canto = (np.arange(n - 1)[:, np.newaxis] * n + np.arange(n - 1)).ravel() # Canto inferior de cada quadrado
+    faces = np.concatenate([np.stack([canto, canto + 1, canto + n + 1], axis=1), np.stack([canto, canto + n + 1, canto + n], axis=1)]) # 2 triângulos
+    return Malha(vertices, faces) # Malha com bordas
+
+@pytest.mark.parametrize("motor", MOTORES) # Cada motor
+def test_retalho_aberto(motor): # Regras de borda
+    malha = retalho_aberto() # 16 vértices: 4 internos e 12 de borda
+    v, topologia = malha.vertices, malha.topologia # Posições e arestas
+    nova = subdividir(malha, motor).vertices # Um passo
+    borda = topologia.num_faces_aresta == 1 # Arestas de uma só face
+    a, b = topologia.arestas[borda].T # Extremidades das arestas de borda
+    impares = len(v) + np.flatnonzero(borda) # Vértice novo de cada aresta de borda
+    assert np.allclose(nova[impares], (v[a] + v[b]) / 2, rtol=0, atol=1e-12) # Ponto médio exato
+    vizinhos_borda = {} # Vértice -> vizinhos ao longo da borda
+    for p, q in topologia.arestas[borda].tolist(): # Cada aresta de borda
+        vizinhos_borda.setdefault(p, []).append(q) # Nos dois sentidos
+        vizinhos_borda.setdefault(q, []).append(p) # Nos dois sentidos
+    assert len(vizinhos_borda) == 12 and all(len(vs) == 2 for vs in vizinhos_borda.values()) # Contorno da grade 4 x 4
+    for i, (b1, b2) in vizinhos_borda.items(): # Cada par de borda
+        assert np.allclose(nova[i], 3 / 4 * v[i] + 1 / 8 * (v[b1] + v[b2]), rtol=0, atol=1e-12), i # 3/4, 1/8, 1/8
+
+@pytest.mark.parametrize("motor", MOTORES) # Cada motor
+def test_vincos_e_canto(motor): # Vértice com 3 vincos fica fixo; com 2, segue a regra de vinco
+    icosaedro = Malha.gerar_icosaedro() # Malha fechada
+    v = icosaedro.vertices # Posições originais
+    vincos = [[0, 1], [0, 5], [0, 11], [1, 5]] # 0: três vincos (canto); 1 e 5: dois; 11: um
+    nova = subdividir(Malha(v, icosaedro.faces, vincos=vincos), motor) # Um passo
+    suave = subdividir(Malha(v, icosaedro.faces), motor).vertices # Sem vincos, para o vértice com um só vinco
+    assert np.array_equal(nova.vertices[0], v[0]) # Canto fixo
+    assert np.allclose(nova.vertices[1], 3 / 4 * v[1] + 1 / 8 * (v[0] + v[5]), rtol=0, atol=1e-12) # Vinco: 3/4, 1/8, 1/8
+    assert np.allclose(nova.vertices[5], 3 / 4 * v[5] + 1 / 8 * (v[0] + v[1]), rtol=0, atol=1e-12) # Idem
+    assert np.allclose(nova.vertices[11], suave[11], rtol=0, atol=1e-12) # Um vinco só: regra suave
+    ids = [len(v) + int(np.flatnonzero((icosaedro.topologia.arestas == sorted(par)).all(axis=1))[0]) for par in vincos] # Ímpar de cada vinco
+    assert np.allclose(nova.vertices[ids], [(v[p] + v[q]) / 2 for p, q in vincos], rtol=0, atol=1e-12) # Pontos médios
+    assert len(nova.vincos) == 2 * len(vincos) # Cada vinco vira duas metades no próximo nível
+
+@pytest.mark.parametrize("motor", MOTORES) # Cada motor
+def test_aresta_com_tres_faces(motor): # Malha não-variedade
+    malha = Malha(np.eye(5, 3) + np.arange(5)[:, np.newaxis], [[0, 1, 2], [1, 0, 3], [0, 1, 4]]) # Aresta (0, 1) em 3 faces
+    with pytest.raises(ValueError, match="não-variedade"): # Sem regra de Loop para ela
+        subdividir(malha, motor) # Qualquer motor
+    with pytest.raises(ValueError, match="não-variedade"): # Validação já no construtor
+        SubdivisaoLoopEsfera(1, malha_base=malha, preguicoso=True) # Falha cedo
+
+@pytest.mark.parametrize("motor", MOTORES) # Cada motor
+def test_vinco_fora_das_arestas(motor): # (0, 2) não é aresta do icosaedro
+    icosaedro = Malha.gerar_icosaedro() # Malha fechada
+    with pytest.raises(ValueError, match="não é uma aresta"): # Mensagem comum aos motores
+        subdividir(Malha(icosaedro.vertices, icosaedro.faces, vincos=[[0, 1], [0, 2]]), motor) # Segundo vinco inválido
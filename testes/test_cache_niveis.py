@@ -0,0 +1,50 @@
+""" # Início da docstring
+Testes do cache persistente de níveis: falha, acerto (mesmos arrays e dtypes do cálculo) e despejo por tamanho. # Objetivo principal
+Uso: python -m pytest testes/test_cache_niveis.py # Linha de comando
+""" # Fim da docstring
+import os # Listagem da pasta do cache
+import sys # Ajuste do caminho de importação
+
+import numpy as np # Comparações
+import pytest # Executor dos testes
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')) # Mesmo ajuste de caminho dos exemplos
+
+from esferaloop.nucleo.instrumentacao import Instrumentacao # Sem mensagens de progresso
+from esferaloop.nucleo.subdivisao_loop import SubdivisaoLoopEsfera # Produtor dos níveis
+from esferaloop.utilitarios.cache_niveis import CacheNiveis # Cache testado
+
+def esfera(niveis, precisao, cache=None) -> SubdivisaoLoopEsfera: # Execução silenciosa
+    return SubdivisaoLoopEsfera(niveis, precisao=precisao, cache_niveis=cache, instrumentacao=Instrumentacao(silencioso=True)) # Níveis calculados no construtor
+
+@pytest.mark.parametrize("precisao", ["float32", "float64"]) # Cada precisão
+def test_acerto_igual_ao_calculo(tmp_path, precisao): # Falha, gravação e acerto
+    esperadas = esfera(3, precisao).malhas # Sem cache
+    cache = CacheNiveis(str(tmp_path)) # Pasta vazia
+    chave = CacheNiveis.chave_malha(esperadas[0]) # Malha base: icosaedro
+    assert cache.obter(chave, 3, False, esperadas[3].vertices.dtype) is None # Falha: nada gravado ainda
+    esfera(3, precisao, cache) # Primeira execução: grava os níveis 1..3
+    assert len(os.listdir(tmp_path)) == 3 # Um arquivo por nível
+    obtidas = esfera(3, precisao, cache).malhas # Segunda execução: tudo do cache
+    for esperada, obtida in zip(esperadas[1:], obtidas[1:]): # Níveis vindos do disco
+        assert isinstance(obtida.vertices, np.memmap) # Acerto: mapeada do arquivo
+        assert obtida.vertices.dtype == esperada.vertices.dtype and obtida.faces.dtype == esperada.faces.dtype # Mesmos dtypes
+        assert np.array_equal(obtida.vertices, esperada.vertices) and np.array_equal(obtida.faces, esperada.faces) # Mesmos valores
+
+def test_despejo_por_tamanho(tmp_path): # Os arquivos usados há mais tempo saem primeiro
+    cache = CacheNiveis(str(tmp_path), limite_bytes=0) # Nenhum arquivo cabe além do mais recente
+    esfera(3, "float64", cache) # Grava os níveis 1..3 em sequência
+    assert [nome.split("_")[1] for nome in os.listdir(tmp_path)] == ["n3"] # Só o último gravado fica
+    assert cache.tamanho_total() == os.path.getsize(os.path.join(tmp_path, os.listdir(tmp_path)[0])) # Tamanho do que restou
+    cache.limpar() # Esvazia
+    assert os.listdir(tmp_path) == [] # Pasta vazia
+
+def test_chave_base_calculada_uma_vez(tmp_path, monkeypatch): # O hash da base não é refeito a cada nível
+    cache = CacheNiveis(str(tmp_path)) # Pasta vazia
+    chaves = [] # Malhas passadas a 'chave_malha'
+    original = CacheNiveis.chave_malha # Hash real
+    monkeypatch.setattr(CacheNiveis, "chave_malha", staticmethod(lambda malha: chaves.append(malha) or original(malha))) # Conta as chamadas
+    objeto = SubdivisaoLoopEsfera(3, preguicoso=True, retencao="ultimo", cache_niveis=cache, instrumentacao=Instrumentacao(silencioso=True)) # Nada calculado ainda
+    assert len(chaves) == 1 and objeto._chave_base == original(chaves[0]) # Calculado no construtor
+    objeto.malhas # Grava e relê os níveis 1..3 (retencao='ultimo' refaz os anteriores)
+    assert len(chaves) == 1 and len(os.listdir(tmp_path)) == 3 # Nenhum hash novo; um arquivo por nível
@@ -0,0 +1,51 @@
+""" # Início da docstring
+Testes da icosfera direta: mesma numeração de vértices e faces do caminho iterativo (subdividir + normalizar). # Objetivo principal
+Uso: python -m pytest testes/test_icosfera.py # Linha de comando
+""" # Fim da docstring
+import os # Caminho do pacote
+import sys # Ajuste do caminho de importação
+
+import numpy as np # Comparações
+import pytest # Executor dos testes
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')) # Mesmo ajuste de caminho dos exemplos
+
+from esferaloop.nucleo.icosfera import gerar_icosfera # Função testada
+from esferaloop.nucleo.instrumentacao import Instrumentacao # Sem mensagens de progresso
+from esferaloop.nucleo.malha import Malha # Atalho estático
+from esferaloop.nucleo.subdivisao_loop import SubdivisaoLoopEsfera # Caminho iterativo
+
+NIVEIS = 4 # Níveis 0..4 conferidos
+
+@pytest.fixture(scope="module") # Calculado uma vez para todos os testes
+def iterativas() -> list: # Esfera geodésica pelo caminho iterativo
+    return SubdivisaoLoopEsfera(NIVEIS, normalizar_cada_passo=True, instrumentacao=Instrumentacao(silencioso=True)).malhas # Níveis 0..4
+
+@pytest.mark.parametrize("nivel", range(NIVEIS + 1)) # Cada nível
+def test_mesma_numeracao_do_caminho_iterativo(iterativas, nivel): # Faces idênticas, sem permutação
+    direta, iterativa = gerar_icosfera(nivel), iterativas[nivel] # As duas construções
+    assert len(direta.vertices) == len(iterativa.vertices) == 10 * 4 ** nivel + 2 # V = 10 * 4^k + 2
+    assert np.array_equal(direta.faces, iterativa.faces) # Mesmos índices, na mesma ordem
+    assert np.allclose(np.linalg.norm(direta.vertices, axis=1), 1.0, rtol=0, atol=1e-12) # Na esfera unitária
+    tolerancia = 1e-12 if nivel <= 1 else 0.02 # Até o nível 1 as posições coincidem; depois, só aproximadamente
+    assert np.abs(direta.vertices - iterativa.vertices).max() <= tolerancia # Mesmo vértice em cada índice
+
+def test_pontos_geodesicos(): # Pontos de aresta na grade da aresta base, projetados
+    nivel, n = 3, 8 # Frequência 2^3
+    malha = gerar_icosfera(nivel) # Esfera direta
+    base = Malha.gerar_icosaedro() # Arestas base
+    p, q = base.vertices[base.faces[0, 0]], base.vertices[base.faces[0, 1]] # Primeira aresta da primeira face
+    esperados = p + np.arange(n + 1)[:, np.newaxis] / n * (q - p) # Grade baricêntrica da aresta
+    esperados /= np.linalg.norm(esperados, axis=1)[:, np.newaxis] # Projetados
+    distancias = np.linalg.norm(malha.vertices[np.newaxis] - esperados[:, np.newaxis], axis=2).min(axis=1) # Vértice mais próximo
+    assert distancias.max() < 1e-12 # Todos presentes na malha
+
+@pytest.mark.parametrize("precisao", ["float32", "float64"]) # dtypes de cada precisão
+def test_precisao(precisao): # Mesmos dtypes do caminho iterativo
+    malha = Malha.gerar_icosfera(2, precisao) # Atalho estático
+    iterativa = SubdivisaoLoopEsfera(2, normalizar_cada_passo=True, precisao=precisao, instrumentacao=Instrumentacao(silencioso=True)).malhas[2] # Referência
+    assert malha.vertices.dtype == iterativa.vertices.dtype and malha.faces.dtype == iterativa.faces.dtype # dtypes iguais
+
+def test_nivel_invalido(): # Nível negativo
+    with pytest.raises(ValueError): # Erro explícito
+        gerar_icosfera(-1) # Não existe
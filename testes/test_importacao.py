@@ -0,0 +1,74 @@
+""" # Início da docstring
+Testes de importação: o núcleo deve carregar rápido e sem Matplotlib (nem SciPy), para processos de trabalho curtos. # Objetivo principal
+Cada medida roda num interpretador novo, já com o NumPy carregado, para medir apenas o custo do pacote. # Isolamento
+Uso: python -m pytest testes/test_importacao.py # Linha de comando
+""" # Fim da docstring
+import json # Resultado do subprocesso
+import os # Caminho do pacote
+import subprocess # Interpretador limpo (sys.modules vazio)
+import sys # Executável atual
+
+import pytest # Executor dos testes
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src') # Mesmo ajuste de caminho dos exemplos
+ORCAMENTO_IMPORTACAO = 0.5 # Segundos para importar o pacote inteiro (hoje ~0.07 s; folga para máquinas de CI lentas)
+REPETICOES = 3 # Melhor de algumas execuções: ignora picos de disco frio
+PESADOS = ("matplotlib", "mpl_toolkits", "scipy") # Dependências que o núcleo não pode carregar na importação
+
+MEDIR = """
+import json, sys, time
+sys.path.insert(0, {src!r})
+import numpy
+inicio = time.perf_counter()
+{importacao}
+tempo = time.perf_counter() - inicio
+print(json.dumps({{"tempo": tempo, "modulos": sorted(sys.modules)}}))
+""" # Programa executado em cada subprocesso
+
+def importar_isolado(importacao) -> dict: # Tempo e módulos carregados por uma importação num interpretador novo
+    """Executa 'importacao' num subprocesso e retorna {'tempo', 'modulos'}.""" # Docstring
+    codigo = MEDIR.format(src=SRC, importacao=importacao) # Programa completo
+    saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True).stdout # Interpretador limpo
+    return json.loads(saida.strip().splitlines()[-1]) # Última linha: o JSON
+
+def carregados(modulos, prefixos) -> list: # Módulos pesados presentes em sys.modules
+    return [m for m in modulos if m.split(".")[0] in prefixos] # Pelo pacote de topo
+
+@pytest.mark.parametrize("importacao", [ # Pontos de entrada usados pelos processos de trabalho
+    "import esferaloop", # Pacote principal
+    "from esferaloop.nucleo.subdivisao_loop import SubdivisaoLoopEsfera", # Caminho dos exemplos
+    "import esferaloop.nucleo, esferaloop.utilitarios, esferaloop.visualizacao", # Todos os subpacotes
+    "import sphereloop", # Nome alternativo
+])
+def test_importacao_sem_dependencias_pesadas(importacao): # Matplotlib e SciPy só sob demanda
+    resultado = importar_isolado(importacao) # Interpretador limpo
+    assert carregados(resultado["modulos"], PESADOS) == [] # Nada pesado carregado
+
+def test_orcamento_tempo_importacao(): # Orçamento de tempo do pacote inteiro
+    importacao = "import esferaloop, esferaloop.nucleo, esferaloop.utilitarios, esferaloop.visualizacao, sphereloop" # Tudo
+    tempo = min(importar_isolado(importacao)["tempo"] for _ in range(REPETICOES)) # Melhor execução
+    assert tempo < ORCAMENTO_IMPORTACAO, f"Importação levou {tempo:.3f} s (orçamento: {ORCAMENTO_IMPORTACAO} s)" # Regressão
+
+def test_motores_sem_matplotlib(): # Subdividir e medir não precisam da visualização
+    resultado = importar_isolado( # Uso típico de um processo de trabalho
+        "from esferaloop.nucleo import SubdivisaoLoopEsfera, Instrumentacao\n" # Núcleo
+        "esfera = SubdivisaoLoopEsfera(2, instrumentacao=Instrumentacao(silencioso=True))\n" # Sem saída no console
+        "esfera.relatorio_erro_precisao()") # Métricas carregadas sob demanda
+    assert carregados(resultado["modulos"], ("matplotlib", "mpl_toolkits")) == [] # Sem Matplotlib
+    assert "esferaloop.utilitarios.metricas" in resultado["modulos"] # Métricas carregadas no uso
+
+def test_visualizador_preguicoso(): # O Visualizador continua acessível pelos mesmos nomes
+    pytest.importorskip("matplotlib") # Exige o Matplotlib instalado
+    resultado = importar_isolado( # Acesso pelo pacote, pelo subpacote e pelo nome alternativo
+        "import matplotlib\n" # Backend sem janela
+        "matplotlib.use('Agg')\n" # Antes do pyplot
+        "import esferaloop, esferaloop.visualizacao, sphereloop\n" # Importações leves
+        "assert esferaloop.Visualizador is esferaloop.visualizacao.Visualizador is sphereloop.Visualizador\n" # Mesmo objeto
+        "assert sphereloop.SubdivisaoLoopEsfera is esferaloop.SubdivisaoLoopEsfera") # Nome alternativo funcional
+    assert "esferaloop.visualizacao.renderizador" in resultado["modulos"] # Carregado no primeiro acesso
+
+def test_atributo_inexistente(): # __getattr__ preguiçoso não mascara erros de digitação
+    sys.path.insert(0, SRC) # Pacote local
+    import esferaloop # Importação leve
+    with pytest.raises(AttributeError): # Nome desconhecido
+        esferaloop.Visualisador # Erro de digitação
@@ -0,0 +1,78 @@
+""" # Início da docstring
+Testes da instrumentação por estágio: campos dos eventos, nível de cada passo, modo silencioso e perfil. # Objetivo principal
+Uso: python -m pytest testes/test_instrumentacao.py # Linha de comando
+""" # Fim da docstring
+import os # Caminho do pacote
+import pstats # Leitura do perfil gravado
+import sys # Ajuste do caminho de importação
+
+import pytest # Executor dos testes
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')) # Mesmo ajuste de caminho dos exemplos
+
+from esferaloop.nucleo.instrumentacao import ESTAGIOS, Instrumentacao # Classe testada e estágios válidos
+from esferaloop.nucleo.subdivisao_loop import SubdivisaoLoopEsfera # Motor que emite os eventos
+
+NIVEIS = 2 # Níveis subdivididos em cada teste
+
+@pytest.mark.parametrize("memoria", [False, True]) # Sem e com tracemalloc
+def test_ouvinte_recebe_campos_do_evento(memoria): # Estágio, nível, tempo, bytes e contagens
+    recebidos = [] # Eventos entregues ao ouvinte
+    instrumentacao = Instrumentacao(ouvintes=[recebidos.append], memoria=memoria, silencioso=True) # Ouvinte registrado
+    SubdivisaoLoopEsfera(NIVEIS, normalizar_cada_passo=True, instrumentacao=instrumentacao) # Níveis calculados no construtor
+    assert recebidos == instrumentacao.eventos and recebidos # Mesmos eventos, na ordem de emissão
+    assert {"arestas", "impares", "pares", "faces", "normalizacao"} <= {e["estagio"] for e in recebidos} # Estágios do motor vetorizado
+    for evento in recebidos: # Cada evento estruturado
+        assert set(evento) == {"estagio", "nivel", "tempo_s", "bytes_alocados", "pico_bytes", "contagens"} # Formato documentado
+        assert evento["estagio"] in ESTAGIOS and isinstance(evento["contagens"], dict) # Nome conhecido
+        assert evento["nivel"] in range(NIVEIS + 1) and evento["tempo_s"] >= 0 # Nível do passo e duração
+        if memoria: # Bytes medidos pelo tracemalloc
+            assert isinstance(evento["bytes_alocados"], int) and evento["pico_bytes"] >= 0 # Relativos ao início do estágio
+        else: # Padrão: sem custo de rastreamento
+            assert evento["bytes_alocados"] is None and evento["pico_bytes"] is None # Não medidos
+    faces = [e for e in recebidos if e["estagio"] == "faces"] # Um por passo de subdivisão
+    assert [e["nivel"] for e in faces] == [1, 2] and [e["contagens"]["faces"] for e in faces] == [80, 320] # 20 * 4^k faces
+
+def test_memoria_desligada_por_padrao(): # tracemalloc só quando pedido
+    assert Instrumentacao().memoria is False # Opt-in
+
+def test_nivel_restaurado_fora_dos_passos(): # Eventos posteriores não herdam o último nível
+    instrumentacao = Instrumentacao(silencioso=True) # Sem saída no console
+    esfera = SubdivisaoLoopEsfera(NIVEIS, preguicoso=True, instrumentacao=instrumentacao) # Nada calculado ainda
+    for _ in esfera.iterar_niveis(): # Percorre todos os níveis
+        pass # Só os eventos interessam
+    assert instrumentacao.nivel is None # Gerador esgotado
+    iteracao = esfera.iterar_niveis() # Gerador abandonado no meio
+    next(iteracao) # Nível 0
+    iteracao.close() # Executa o 'finally' do gerador
+    assert instrumentacao.nivel is None # Também ao fechar antes do fim
+    outra = SubdivisaoLoopEsfera(NIVEIS, preguicoso=True, instrumentacao=Instrumentacao(silencioso=True)) # Sem níveis retidos
+    outra.obter_malha(NIVEIS) # Passos fora de 'iterar_niveis'
+    assert [e["nivel"] for e in outra.instrumentacao.eventos if e["estagio"] == "faces"] == [1, 2] # Nível de cada passo
+    assert outra.instrumentacao.nivel is None # Restaurado depois do último passo
+
+@pytest.mark.parametrize("silencioso", [False, True]) # Com e sem mensagens
+def test_silencioso_suprime_progresso(capsys, silencioso): # Mensagens de progresso no console
+    instrumentacao = Instrumentacao(silencioso=silencioso) # Modo testado
+    SubdivisaoLoopEsfera(NIVEIS, instrumentacao=instrumentacao) # Emite uma mensagem por nível
+    saida = capsys.readouterr().out # Texto impresso
+    if silencioso: # Nada no console
+        assert saida == "" # Suprimido
+    else: # Mesma saída de sempre
+        assert "Subdividindo nível 0 -> 1..." in saida and "Subdividindo nível 1 -> 2..." in saida # Um aviso por passo
+    assert len(instrumentacao.eventos) > 0 # Os eventos continuam sendo emitidos
+
+def test_perfil_gera_estatisticas(tmp_path): # cProfile acumulado durante os estágios
+    instrumentacao = Instrumentacao(silencioso=True, perfil=True) # Perfil ligado
+    SubdivisaoLoopEsfera(NIVEIS, instrumentacao=instrumentacao) # Estágios medidos
+    relatorio = instrumentacao.relatorio_perfil(linhas=5) # Texto do pstats
+    assert "function calls" in relatorio and "regras_loop.py" in relatorio # Regras de Loop chamadas nos estágios
+    caminho = tmp_path / "perfil.prof" # Arquivo do cProfile
+    instrumentacao.salvar_perfil(str(caminho)) # Formato binário padrão
+    estatisticas = pstats.Stats(str(caminho)) # Legível pelo pstats
+    assert estatisticas.total_calls > 0 # Chamadas registradas
+    assert any(funcao[2] == "pesos_beta" for funcao in estatisticas.stats) # Peso beta calculado dentro do estágio 'pares'
+
+def test_perfil_desativado(): # Relatório exige perfil=True
+    with pytest.raises(ValueError, match="perfil=True"): # Erro explícito
+        Instrumentacao().relatorio_perfil() # Sem perfil
@@ -0,0 +1,59 @@
+""" # Início da docstring
+Testes da superfície limite de Loop: convergência dos níveis para a projeção chi e avaliação exata nos retalhos. # Objetivo principal
+A malha de partida é um icosaedro com raios perturbados, para que nenhuma simetria esconda erros de peso. # Malha de teste
+Uso: python -m pytest testes/test_limite.py # Linha de comando
+""" # Fim da docstring
+import os # Caminho do pacote
+import sys # Ajuste do caminho de importação
+
+import numpy as np # Comparações
+import pytest # Executor dos testes
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')) # Mesmo ajuste de caminho dos exemplos
+
+from esferaloop.nucleo.instrumentacao import Instrumentacao # Sem mensagens de progresso
+from esferaloop.nucleo.limite import VALENCIA_REGULAR, avaliar_limite, normais_no_limite, projetar_no_limite # Funções testadas
+from esferaloop.nucleo.malha import Malha # Malha de partida
+from esferaloop.nucleo.subdivisao_loop import SubdivisaoLoopEsfera # Níveis de Loop (sem normalização)
+
+NIVEIS = 6 # Níveis calculados a partir da malha perturbada
+
+@pytest.fixture(scope="module") # Calculado uma vez para todos os testes
+def niveis() -> list: # Níveis 0..NIVEIS de Loop puro
+    icosaedro = Malha.gerar_icosaedro() # 12 vértices de valência 5
+    raios = 1 + 0.2 * np.random.default_rng(0).standard_normal((len(icosaedro.vertices), 1)) # Perturbação reprodutível
+    base = Malha(icosaedro.vertices * raios, icosaedro.faces) # Forma irregular
+    return SubdivisaoLoopEsfera(NIVEIS, malha_base=base, instrumentacao=Instrumentacao(silencioso=True)).malhas # Sem normalizar
+
+@pytest.mark.parametrize("k", [0, 1, 2]) # Nível projetado
+def test_niveis_convergem_para_a_projecao(niveis, k): # |P_{k+m} - lim_k| -> 0 nos vértices do nível k
+    limite_k = projetar_no_limite(niveis[k]).vertices # Posições limite dos vértices do nível k
+    num_vertices = len(limite_k) # Os vértices do nível k mantêm seus índices nos níveis seguintes
+    erros = [np.abs(niveis[j].vertices[:num_vertices] - limite_k).max() for j in range(k, NIVEIS + 1)] # Um erro por m
+    assert all(depois < 0.3 * antes for antes, depois in zip(erros, erros[1:])) # Queda geométrica (~1/4 por nível)
+    assert erros[-1] < 1e-3 # Já próximo do limite no último nível (malha de raio ~1)
+
+def test_projecao_invariante_pela_subdivisao(niveis): # O limite de um vértice não muda ao subdividir
+    referencia = projetar_no_limite(niveis[1]).vertices # Nível 1 projetado
+    for j in range(2, NIVEIS + 1): # Níveis mais finos
+        assert np.allclose(projetar_no_limite(niveis[j]).vertices[:len(referencia)], referencia, rtol=0, atol=1e-12) # Mesmo ponto
+
+def test_box_spline_nos_cantos(niveis): # Avaliação regular nos cantos == máscara de limite
+    malha = niveis[2] # Já tem retalhos regulares (3 cantos de valência 6)
+    regulares = np.flatnonzero((malha.topologia.valencia[malha.faces] == VALENCIA_REGULAR).all(axis=1)) # Faces regulares
+    assert len(regulares) > 0 # O teste precisa de retalhos de box spline
+    faces = np.repeat(regulares, 3) # Cada canto de cada face
+    baricentricas = np.tile(np.eye(3), (len(regulares), 1)) # (1,0,0), (0,1,0), (0,0,1)
+    posicoes, normais = avaliar_limite(malha, faces, baricentricas) # Caminho da box spline
+    cantos = malha.faces[regulares].reshape(-1) # Vértice de cada avaliação
+    assert np.allclose(posicoes, projetar_no_limite(malha).vertices[cantos], rtol=0, atol=1e-12) # Mesma posição
+    assert np.allclose(normais, normais_no_limite(malha)[cantos], rtol=0, atol=1e-9) # Mesma normal
+
+def test_pontos_medios_iguais_ao_limite_do_nivel_seguinte(niveis): # Pontos de aresta, regulares ou não
+    malha, seguinte = niveis[1], niveis[2] # Ponto médio de uma aresta do nível 1 é o vértice ímpar do nível 2
+    topologia = malha.topologia # Aresta de cada semi-aresta
+    faces = np.repeat(np.arange(len(malha.faces)), 3) # Três arestas por face
+    baricentricas = np.tile([[0.5, 0.5, 0], [0, 0.5, 0.5], [0.5, 0, 0.5]], (len(malha.faces), 1)) # (v1,v2), (v2,v3), (v3,v1)
+    posicoes, _ = avaliar_limite(malha, faces, baricentricas) # Box spline ou descida local
+    impares = len(malha.vertices) + topologia.face_arestas.reshape(-1) # Índice do vértice ímpar de cada aresta
+    assert np.allclose(posicoes, projetar_no_limite(seguinte).vertices[impares], rtol=0, atol=1e-10) # Mesmo ponto da superfície
@@ -0,0 +1,35 @@
+""" # Início da docstring
+Testes da contagem de arestas e das métricas memorizadas por malha. # Objetivo principal
+Uso: python -m pytest testes/test_metricas.py # Linha de comando
+""" # Fim da docstring
+import os # Caminho do pacote
+import sys # Ajuste do caminho de importação
+
+import numpy as np # Malhas de teste
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')) # Mesmo ajuste de caminho dos exemplos
+
+from esferaloop.nucleo.malha import Malha # Malhas medidas
+from esferaloop.utilitarios.metricas import contar_arestas, obter_metricas_malha # Funções testadas
+
+def faixa_aberta() -> Malha: # Quatro triângulos em tira: 6 vértices, 9 arestas
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [2, 0, 0], [0, 1, 0], [1, 1, 0], [2, 1, 0]], dtype=np.float64) # Grade 3 x 2
+    return Malha(vertices, [[0, 1, 4], [0, 4, 3], [1, 2, 5], [1, 5, 4]]) # Malha aberta
+
+def test_contar_arestas_sem_construir_topologia(): # Caminho por chaves únicas
+    malha = faixa_aberta() # Malha com bordas
+    assert contar_arestas(malha) == 9 # Arestas distintas
+    assert malha.topologia_em_cache is None # Nada construído
+
+def test_contar_arestas_reaproveita_topologia(): # Topologia já em cache
+    malha = Malha.gerar_icosaedro() # Fechada
+    assert malha.topologia.num_arestas == 30 # Constrói a topologia
+    assert contar_arestas(malha) == contar_arestas(malha, fechada=True) == 30 # Mesmo valor pelos dois atalhos
+
+def test_metricas_memorizadas(): # Invalidação ao trocar vértices
+    malha = Malha.gerar_icosaedro() # Raio ~1
+    primeira = obter_metricas_malha(malha) # Calculada
+    primeira["num_arestas"] = -1 # O chamador altera a sua cópia
+    assert obter_metricas_malha(malha)["num_arestas"] == 30 # O cache não foi afetado
+    malha.vertices = 2 * malha.vertices # Substituição descarta o cache
+    assert np.isclose(obter_metricas_malha(malha)["erro_medio"], 1.0) # Raio 2: erro 1 em relação ao alvo
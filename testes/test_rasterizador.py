@@ -0,0 +1,126 @@
+""" # Início da docstring
+Testes determinísticos do rasterizador por software: cobertura de um triângulo, z-buffer, sombra no piso e arquivos PNG/PPM. # Objetivo principal
+As referências são calculadas aqui mesmo (centros dos pixels, cores do modelo de iluminação), sem imagens gravadas. # Referências
+Uso: python -m pytest testes/test_rasterizador.py # Linha de comando
+""" # Fim da docstring
+import os # Listagem da pasta temporária
+import struct # Cabeçalho do PNG
+import sys # Ajuste do caminho de importação
+import zlib # Pixels e CRC do PNG
+
+import numpy as np # Comparações
+import pytest # Executor dos testes
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')) # Mesmo ajuste de caminho dos exemplos
+
+from esferaloop.nucleo.malha import Malha # Cenas de teste
+from esferaloop.visualizacao import iluminacao # Cores e sombra esperadas
+from esferaloop.visualizacao.rasterizador import COR_FUNDO, Rasterizador, salvar_png, salvar_ppm # Módulo testado
+
+LADO = 96 # Imagens pequenas: testes rápidos
+TRIANGULO = [[-0.6, -0.6, 0.0], [0.6, -0.6, 0.0], [0.0, 0.6, 0.0]] # Horizontal, no centro da cena
+FOLGA = 1e-6 # Centros de pixel a esta distância (baricêntrica) de uma aresta não são conferidos
+
+def para_uint8(cores) -> np.ndarray: # Mesma conversão do framebuffer
+    return (np.clip(np.asarray(cores, dtype=np.float64), 0.0, 1.0) * 255 + 0.5).astype(np.uint8) # RGB de 8 bits
+
+def cor_face(triangulo) -> np.ndarray: # Cor esperada de uma face isolada
+    poligono = np.asarray(triangulo, dtype=np.float64)[np.newaxis] # (1, 3, 3)
+    return para_uint8(iluminacao.cores_faces(iluminacao.intensidades_faces(iluminacao.normais_faces(poligono)))[0, :3]) # RGB
+
+def baricentricas_pixels(rasterizador, triangulo) -> np.ndarray: # Pesos de cada centro de pixel em relação ao triângulo
+    xy, _ = rasterizador.projetar(np.asarray(triangulo, dtype=np.float64)) # Vértices na tela
+    colunas, linhas = np.meshgrid(np.arange(LADO) + 0.5, np.arange(LADO) + 0.5) # Centros dos pixels (linha, coluna)
+    (xa, ya), (xb, yb), (xc, yc) = xy # Vértices projetados
+    area = (xb - xa) * (yc - ya) - (yb - ya) * (xc - xa) # Área orientada (x2)
+    l0 = ((xb - colunas) * (yc - linhas) - (yb - linhas) * (xc - colunas)) / area # Peso do vértice a
+    l1 = ((xc - colunas) * (ya - linhas) - (yc - linhas) * (xa - colunas)) / area # Peso do vértice b
+    return np.stack([l0, l1, 1.0 - l0 - l1], axis=-1) # (LADO, LADO, 3)
+
+def test_cobertura_de_um_triangulo(): # Pixels cujo centro está dentro do triângulo, com a cor da face
+    rasterizador = Rasterizador(LADO, LADO) # Câmera padrão
+    imagem = rasterizador.renderizar(Malha(TRIANGULO, [[0, 1, 2]]), mostrar_sombra=False) # Só o triângulo
+    assert imagem.shape == (LADO, LADO, 3) and imagem.dtype == np.uint8 # Framebuffer RGB de 8 bits
+    pesos = baricentricas_pixels(rasterizador, TRIANGULO) # Referência independente
+    dentro, fora = (pesos > FOLGA).all(axis=-1), (pesos < -FOLGA).any(axis=-1) # Longe das arestas
+    assert dentro.sum() > 100 # O triângulo cobre uma área razoável
+    assert (imagem[dentro] == cor_face(TRIANGULO)).all() # Cor sombreada da face
+    assert (imagem[fora] == para_uint8(COR_FUNDO)).all() # Fundo em todo o resto
+
+def test_zbuffer_mostra_a_face_mais_proxima(): # Ordem de profundidade, não ordem das faces
+    rasterizador = Rasterizador(LADO, LADO) # Câmera padrão
+    frente = np.array(TRIANGULO) + 0.8 * rasterizador.visao # Horizontal, deslocado em direção à câmera (mesma posição na tela)
+    atras = np.array([[-1.0, -1.0, -0.2], [1.0, -1.0, 0.2], [0.0, 1.0, 0.0]]) # Maior e inclinado (outra cor), atrás do primeiro
+    vertices = np.concatenate([frente, atras]) # Seis vértices
+    imagens = [rasterizador.renderizar(Malha(vertices, faces), mostrar_sombra=False) # Mesma cena
+               for faces in ([[0, 1, 2], [3, 4, 5]], [[3, 4, 5], [0, 1, 2]])] # Nas duas ordens de desenho
+    assert np.array_equal(imagens[0], imagens[1]) # O resultado não depende da ordem das faces
+    pesos_frente, pesos_atras = baricentricas_pixels(rasterizador, frente), baricentricas_pixels(rasterizador, atras) # Coberturas
+    sobreposicao = (pesos_frente > FOLGA).all(axis=-1) & (pesos_atras > FOLGA).all(axis=-1) # Pixels das duas faces
+    so_atras = (pesos_atras > FOLGA).all(axis=-1) & (pesos_frente < -FOLGA).any(axis=-1) # Só a face de trás
+    assert sobreposicao.sum() > 20 and so_atras.sum() > 20 # As duas regiões existem
+    assert not np.array_equal(cor_face(frente), cor_face(atras)) # Cores distinguíveis
+    assert (imagens[0][sobreposicao] == cor_face(frente)).all() # A face da frente vence o teste de profundidade
+    assert (imagens[0][so_atras] == cor_face(atras)).all() # A de trás aparece onde está sozinha
+
+def test_ponto_do_piso_em_sombra(): # Sombra projetada pela luz no plano z = PISO_Z
+    rasterizador = Rasterizador(LADO, LADO) # Câmera padrão
+    malha = Malha(TRIANGULO, [[0, 1, 2]]) # Triângulo acima do piso
+    imagem = rasterizador.renderizar(malha, mostrar_sombra=True) # Com sombra
+    centroide = np.mean(TRIANGULO, axis=0, keepdims=True) # Centro do triângulo
+    (x, y), = rasterizador.projetar(iluminacao.projetar_sombra(centroide))[0] # Sombra do centro, vista pela câmera
+    sombreado = imagem[int(y), int(x)] # Pixel do piso atrás do triângulo (na direção da luz)
+    esperado = para_uint8((1 - iluminacao.ALFA_SOMBRA) * np.array(COR_FUNDO) + iluminacao.ALFA_SOMBRA * np.array(iluminacao.COR_SOMBRA)) # Mistura alfa
+    assert (sombreado == esperado).all() # Piso escurecido pela sombra
+    assert (imagem[0, 0] == para_uint8(COR_FUNDO)).all() # Canto da imagem: piso iluminado
+    sem_sombra = rasterizador.renderizar(malha, mostrar_sombra=False) # Mesma cena sem sombra
+    assert (sem_sombra[int(y), int(x)] == para_uint8(COR_FUNDO)).all() # O escurecimento vem só da sombra
+
+def imagem_teste() -> np.ndarray: # Pixels distintos em cada posição e canal
+    return (np.arange(5 * 7 * 3) * 7 % 256).astype(np.uint8).reshape(5, 7, 3) # 5 linhas, 7 colunas
+
+def test_png_ida_e_volta(tmp_path): # Assinatura, IHDR, CRC e pixels
+    imagem = imagem_teste() # Imagem conhecida
+    caminho = str(tmp_path / "imagem.png") # Arquivo de saída
+    salvar_png(imagem, caminho) # Gravação atômica
+    dados = open(caminho, "rb").read() # Arquivo completo
+    assert dados[:8] == b"\x89PNG\r\n\x1a\n" # Assinatura
+    blocos, posicao = {}, 8 # Blocos lidos
+    while posicao < len(dados): # Percorre os blocos
+        tamanho, tipo = struct.unpack(">I4s", dados[posicao:posicao + 8]) # Tamanho e tipo
+        conteudo = dados[posicao + 8:posicao + 8 + tamanho] # Dados do bloco
+        crc, = struct.unpack(">I", dados[posicao + 8 + tamanho:posicao + 12 + tamanho]) # CRC gravado
+        assert crc == zlib.crc32(tipo + conteudo) & 0xFFFFFFFF # CRC de cada bloco
+        blocos[tipo] = conteudo # Guarda pelo tipo
+        posicao += 12 + tamanho # Próximo bloco
+    assert list(blocos) == [b"IHDR", b"IDAT", b"IEND"] and posicao == len(dados) # Blocos e tamanho exatos
+    assert struct.unpack(">IIBBBBB", blocos[b"IHDR"]) == (7, 5, 8, 2, 0, 0, 0) # Largura, altura, 8 bits, RGB
+    linhas = np.frombuffer(zlib.decompress(blocos[b"IDAT"]), dtype=np.uint8).reshape(5, 1 + 7 * 3) # Uma linha por vez
+    assert (linhas[:, 0] == 0).all() # Filtro 'None'
+    assert np.array_equal(linhas[:, 1:].reshape(5, 7, 3), imagem) # Mesmos pixels
+    assert os.listdir(tmp_path) == ["imagem.png"] # Nenhum temporário restante
+
+def test_ppm_ida_e_volta(tmp_path): # Cabeçalho P6, tamanho e pixels
+    imagem = imagem_teste() # Imagem conhecida
+    caminho = str(tmp_path / "imagem.ppm") # Arquivo de saída
+    salvar_ppm(imagem, caminho) # Gravação atômica
+    dados = open(caminho, "rb").read() # Arquivo completo
+    cabecalho = b"P6\n7 5\n255\n" # Largura, altura e valor máximo
+    assert dados.startswith(cabecalho) and len(dados) == len(cabecalho) + imagem.size # Tamanho exato
+    assert np.array_equal(np.frombuffer(dados[len(cabecalho):], dtype=np.uint8).reshape(5, 7, 3), imagem) # Mesmos pixels
+    assert os.listdir(tmp_path) == ["imagem.ppm"] # Nenhum temporário restante
+
+def falhar(*argumentos, **opcoes): # Simula um erro de E/S durante a gravação
+    raise OSError("disco cheio") # Depois que o arquivo de saída já foi aberto
+
+@pytest.mark.parametrize("salvar", [salvar_png, salvar_ppm]) # Os dois formatos
+def test_falha_preserva_imagem_anterior(tmp_path, monkeypatch, salvar): # Gravação atômica
+    caminho = str(tmp_path / "imagem.img") # Destino já existente
+    salvar(imagem_teste(), caminho) # Primeira versão
+    original = open(caminho, "rb").read() # Conteúdo anterior
+    monkeypatch.setattr(np, "ascontiguousarray", falhar) # Falha no meio da escrita do PPM
+    monkeypatch.setattr(zlib, "compress", falhar) # Idem, no PNG
+    with pytest.raises(OSError, match="disco cheio"): # Erro propagado
+        salvar(imagem_teste()[::-1], caminho) # Segunda versão, interrompida
+    assert open(caminho, "rb").read() == original # Destino intacto
+    assert os.listdir(tmp_path) == ["imagem.img"] # Temporário removido
@@ -0,0 +1,101 @@
+""" # Início da docstring
+Testes do renderizador Matplotlib no backend Agg (sem janela): coleções criadas por 'plotar_malha' e seus tamanhos. # Objetivo principal
+'plot_interativo': cache das coleções por nível e limite de faces (max_faces ou área de tela / PIXELS_POR_FACE). # Slider
+Uso: python -m pytest testes/test_renderizador.py # Linha de comando
+""" # Fim da docstring
+import os # Caminho do pacote
+import sys # Ajuste do caminho de importação
+
+import pytest # Executor dos testes
+
+matplotlib = pytest.importorskip("matplotlib") # Visualização é opcional
+matplotlib.use("Agg") # Sem janela
+
+import matplotlib.pyplot as plt # Figuras de teste
+from mpl_toolkits.mplot3d.art3d import Line3DCollection, Poly3DCollection # Tipos das coleções
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')) # Mesmo ajuste de caminho dos exemplos
+
+from esferaloop.nucleo.instrumentacao import Instrumentacao # Sem mensagens de progresso
+from esferaloop.nucleo.subdivisao_loop import SubdivisaoLoopEsfera # Malhas desenhadas
+from esferaloop.visualizacao import iluminacao # Sombreamento que não deve ser calculado sem superfície
+from esferaloop.visualizacao.renderizador import Visualizador # Classe testada
+
+@pytest.fixture(scope="module") # Calculado uma vez para todos os testes
+def malhas() -> list: # Níveis 0..3 (20, 80, 320 e 1280 faces)
+    return SubdivisaoLoopEsfera(3, normalizar_cada_passo=True, instrumentacao=Instrumentacao(silencioso=True)).malhas # Esferas
+
+@pytest.fixture # Uma figura nova por teste
+def ax(): # Eixo 3D no backend Agg
+    figura = plt.figure() # Figura sem janela
+    yield figura.add_subplot(111, projection='3d') # Eixo de desenho
+    plt.close(figura) # Libera a figura
+
+def desenhadas(ax, tipo) -> list: # Número de elementos de cada coleção do tipo pedido, após o desenho
+    ax.figure.canvas.draw() # Projeta as coleções 3D (polígonos e segmentos 2D)
+    return [len(c.get_paths()) if tipo is Poly3DCollection else len(c.get_segments()) # Polígonos ou segmentos
+            for c in ax.collections if type(c) is tipo] # Na ordem de criação
+
+@pytest.mark.parametrize("wireframe", [False, True]) # Bordas pretas ou sem bordas
+def test_superficie_e_sombra(ax, malhas, wireframe): # Um polígono por face na superfície e na sombra
+    malha = malhas[2] # 320 faces
+    Visualizador.plotar_malha(malha, ax=ax, mostrar_wireframe=wireframe, mostrar_superficie=True) # Superfície iluminada
+    assert desenhadas(ax, Poly3DCollection) == [len(malha.faces), len(malha.faces)] # Superfície e sombra
+    assert desenhadas(ax, Line3DCollection) == [] # Arestas desenhadas como bordas dos polígonos
+
+def test_somente_wireframe(ax, malhas, monkeypatch): # Um segmento por aresta e nenhum sombreamento por face
+    malha = malhas[2] # 320 faces, 480 arestas
+    falhar = lambda *argumentos, **opcoes: pytest.fail("sombreamento calculado sem superfície") # Não pode ser chamado
+    monkeypatch.setattr(Visualizador, "preparar_render", staticmethod(falhar)) # Caminho da superfície
+    monkeypatch.setattr(iluminacao, "intensidades_faces", falhar) # Iluminação por face
+    Visualizador.plotar_malha(malha, ax=ax, mostrar_wireframe=True, mostrar_superficie=False) # Só o esqueleto
+    assert desenhadas(ax, Line3DCollection) == [malha.topologia.num_arestas] # Cada aresta única uma vez
+    assert desenhadas(ax, Poly3DCollection) == [len(malha.faces)] # Apenas a sombra
+
+def superficie_visivel(ax) -> list: # Superfícies (coleções com bordas) visíveis no momento
+    return [c for c in ax.collections[::2] if c.get_visible()] # Cada nível cria (superfície, sombra), nessa ordem
+
+@pytest.fixture # Sem janela e sem bloquear
+def interativo(monkeypatch): # Abre 'plot_interativo' e fecha a figura ao final
+    monkeypatch.setattr(plt, "show", lambda: None) # Agg não tem laço de eventos
+    figuras = [] # Figuras abertas pelo teste
+    def abrir(*argumentos, **opcoes): # Mesma assinatura de 'plot_interativo'
+        figura, slider = Visualizador.plot_interativo(*argumentos, **opcoes) # Figura e controle
+        figuras.append(figura) # Fechada ao final
+        return figura.axes[0], slider # Eixo 3D principal e slider
+    yield abrir # Usado pelos testes
+    for figura in figuras: # Libera as figuras
+        plt.close(figura) # Sem vazamento entre testes
+
+def test_interativo_reaproveita_colecoes(interativo, malhas): # Voltar a um nível não reconstrói nada
+    ax, slider = interativo(malhas, max_faces=10 ** 6) # Orçamento folgado: cada nível é desenhado como é
+    assert len(ax.collections) == 2 # Nível 0: superfície e sombra
+    slider.set_val(1) # Primeira visita ao nível 1
+    slider.set_val(2) # Primeira visita ao nível 2
+    assert len(ax.collections) == 6 # Duas coleções por nível visitado
+    colecoes = list(ax.collections) # Objetos criados até aqui
+    slider.set_val(1) # Volta ao nível 1
+    assert list(ax.collections) == colecoes # Nenhuma coleção nova
+    assert superficie_visivel(ax) == [colecoes[2]] # A mesma superfície do nível 1, e só ela
+    assert colecoes[3].get_visible() and not colecoes[4].get_visible() and not colecoes[5].get_visible() # Sombra do nível 1
+    slider.set_val(0) # Volta ao nível inicial
+    assert list(ax.collections) == colecoes and superficie_visivel(ax) == [colecoes[0]] # Reaproveitado
+
+@pytest.mark.parametrize("max_faces,desenhado", [(80, 1), (319, 1), (320, 2), (5000, 3)]) # Orçamentos em torno de 20 * 4^k
+def test_interativo_limita_nivel_por_max_faces(interativo, malhas, max_faces, desenhado): # Nível de detalhe
+    ax, slider = interativo(malhas, max_faces=max_faces) # Orçamento explícito
+    slider.set_val(3) # Nível mais fino pedido
+    assert len(ax.collections) == 4 # Nível 0 e o nível efetivamente desenhado
+    assert desenhadas(ax, Poly3DCollection)[2] == len(malhas[desenhado].faces) # Superfície do nível dentro do orçamento
+    assert superficie_visivel(ax) == [ax.collections[2]] # Só ela está visível
+    sufixo = f" (exibindo nível {desenhado})" if desenhado != 3 else "" # Título deixa claro o que está na tela
+    assert ax.get_title() == f"Subdivisão de Loop - Nível 3{sufixo}" # Nível escolhido e nível desenhado
+
+def test_interativo_limita_nivel_por_area_de_tela(interativo, malhas): # Orçamento padrão: área do eixo / pixels por face
+    caixa = interativo(malhas, max_faces=1)[0].get_window_extent() # Área do eixo (mesma figura e margens)
+    pixels_por_face = caixa.width * caixa.height / 200 # Orçamento de 200 faces: cabe o nível 1 (80), não o 2 (320)
+    ax, slider = interativo(malhas, pixels_por_face=pixels_por_face) # Sem 'max_faces'
+    assert 80 <= Visualizador.orcamento_faces(ax, pixels_por_face) < 320 # Orçamento calculado pela área de tela (~200)
+    slider.set_val(3) # Nível mais fino pedido
+    assert desenhadas(ax, Poly3DCollection)[2] == len(malhas[1].faces) # Reduzido ao nível 1
+    assert ax.get_title() == "Subdivisão de Loop - Nível 3 (exibindo nível 1)" # Informado no título
@@ -0,0 +1,136 @@
+""" # Início da docstring
+Testes de equivalência entre os motores de subdivisão: 'esparso', 'paralelo' e 'referencia' contra o 'vetorizado'. # Objetivo principal
+Faces devem ser idênticas (mesma numeração e ordem) e vértices iguais dentro da tolerância de ponto flutuante. # Critério
+Em float32, todos os motores mantêm vértices float32 e faces int32 e ficam a poucos ulps do float64. # Precisão reduzida
+Uso: python -m pytest testes/test_subdivisao.py # Linha de comando
+""" # Fim da docstring
+import os # Caminho do pacote
+import sys # Ajuste do caminho de importação
+
+import numpy as np # Comparações
+import pytest # Executor dos testes
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')) # Mesmo ajuste de caminho dos exemplos
+
+from esferaloop.nucleo.instrumentacao import Instrumentacao # Sem mensagens de progresso
+from esferaloop.nucleo.malha import Malha # Malhas de entrada
+from esferaloop.nucleo import subdivisao_loop # Pool do motor paralelo
+from esferaloop.nucleo.subdivisao_loop import SubdivisaoLoopEsfera # Motores comparados
+
+NIVEIS = 3 # Níveis 0..3 em cada motor
+
+def grade_com_borda(n=5) -> Malha: # Quadrado triangulado n x n: exercita as regras de borda
+    x, y = np.meshgrid(np.arange(n, dtype=np.float64), np.arange(n, dtype=np.float64)) # Grade regular
+    vertices = np.stack([x.ravel(), y.ravel(), np.sin(x.ravel()) * np.cos(y.ravel())], axis=1) # Superfície ondulada
+    canto = (np.arange(n - 1)[:, np.newaxis] * n + np.arange(n - 1)).ravel() # Canto inferior de cada quadrado
+    faces = np.concatenate([np.stack([canto, canto + 1, canto + n + 1], axis=1), np.stack([canto, canto + n + 1, canto + n], axis=1)]) # 2 triângulos
+    return Malha(vertices, faces) # Malha aberta
+
+MALHAS_BASE = { # Malhas de partida
+    "icosaedro": Malha.gerar_icosaedro, # Fechada, todos os vértices de grau 5
+    "grade": grade_com_borda, # Aberta: bordas e cantos
+    "vincos": lambda: Malha(Malha.gerar_icosaedro().vertices, Malha.gerar_icosaedro().faces, vincos=[[0, 1], [1, 5], [5, 0], [0, 11]]), # Vincos e canto
+}
+
+def esfera(motor, base, precisao="float64") -> SubdivisaoLoopEsfera: # Subdivisão de uma malha de partida num motor
+    opcoes = {"num_processos": 2} if motor == "paralelo" else {} # Dois processos: exercita a divisão em blocos
+    return SubdivisaoLoopEsfera(NIVEIS, motor=motor, malha_base=MALHAS_BASE[base](), precisao=precisao, # Mesma malha de partida
+                                instrumentacao=Instrumentacao(silencioso=True), **opcoes) # Sem saída no console
+
+def niveis(motor, base, precisao="float64") -> list: # Malhas dos níveis 0..NIVEIS num motor
+    return esfera(motor, base, precisao).malhas # Todos os níveis
+
+@pytest.mark.parametrize("base", sorted(MALHAS_BASE)) # Cada malha de partida
+@pytest.mark.parametrize("motor", ["esparso", "paralelo", "referencia"]) # Cada motor comparado
+def test_motores_equivalentes(motor, base): # Mesmo resultado do motor vetorizado, nível a nível
+    if motor == "esparso": # Operador esparso
+        pytest.importorskip("scipy") # Dependência opcional
+    esperadas = niveis("vetorizado", base) # Motor padrão
+    obtidas = niveis(motor, base) # Motor comparado
+    assert len(obtidas) == len(esperadas) == NIVEIS + 1 # Níveis 0..3
+    for nivel, (esperada, obtida) in enumerate(zip(esperadas, obtidas)): # Nível a nível
+        assert np.array_equal(esperada.faces, obtida.faces), f"{motor}: faces diferentes no nível {nivel}" # Mesma topologia e ordem
+        assert np.allclose(esperada.vertices, obtida.vertices, rtol=0, atol=1e-12), f"{motor}: vértices diferentes no nível {nivel}" # Mesmas posições
+
+@pytest.mark.parametrize("base", sorted(MALHAS_BASE)) # Cada malha de partida
+@pytest.mark.parametrize("motor", SubdivisaoLoopEsfera.MOTORES) # Todos os motores, inclusive o vetorizado
+def test_motores_float32(motor, base): # Precisão reduzida mantida em todos os níveis e próxima do float64
+    if motor == "esparso": # Operador esparso
+        pytest.importorskip("scipy") # Dependência opcional
+    esperadas = niveis("vetorizado", base) # Referência em float64
+    obtidas = niveis(motor, base, "float32") # Motor comparado em float32
+    assert len(obtidas) == NIVEIS + 1 # Níveis 0..3
+    for nivel, (esperada, obtida) in enumerate(zip(esperadas, obtidas)): # Nível a nível
+        assert obtida.vertices.dtype == np.float32 and obtida.faces.dtype == np.int32, f"{motor}: dtypes no nível {nivel}" # Sem promoção
+        assert np.array_equal(esperada.faces, obtida.faces), f"{motor}: faces diferentes no nível {nivel}" # Mesma topologia
+        escala = np.abs(esperada.vertices).max() # Coordenadas da grade chegam a 4
+        assert np.allclose(obtida.vertices, esperada.vertices, rtol=0, atol=8 * np.finfo(np.float32).eps * escala), \
+            f"{motor}: vértices fora da tolerância de float32 no nível {nivel}" # Poucos ulps de float32
+
+def test_relatorio_erro_precisao(): # Valores do relatório conferidos contra a comparação direta com float64
+    reduzida = esfera("vetorizado", "icosaedro", "float32") # Níveis em float32
+    relatorio = reduzida.relatorio_erro_precisao() # Uma linha por nível
+    referencias = niveis("vetorizado", "icosaedro") # Mesmos níveis em float64
+    assert [linha["nivel"] for linha in relatorio] == list(range(NIVEIS + 1)) # Todos os níveis, em ordem
+    for linha, malha, referencia in zip(relatorio, reduzida.malhas, referencias): # Nível a nível
+        distancias = np.linalg.norm(malha.vertices.astype(np.float64) - referencia.vertices, axis=1) # Deslocamento de cada vértice
+        raios = np.abs(np.linalg.norm(malha.vertices.astype(np.float64), axis=1) - np.linalg.norm(referencia.vertices, axis=1)) # Diferença de raio
+        assert linha["precisao"] == "float32" and linha["num_vertices"] == len(referencia.vertices) # Identificação
+        assert linha["erro_max_posicao"] == pytest.approx(distancias.max(), rel=1e-12) # Maior deslocamento
+        assert linha["erro_medio_posicao"] == pytest.approx(distancias.mean(), rel=1e-12) # Deslocamento médio
+        assert linha["erro_max_raio"] == pytest.approx(raios.max(), rel=1e-12) # Maior diferença de raio
+        assert 0 < linha["erro_max_posicao"] < 1e-6 # Arredondamento de float32 (eps ~ 1.2e-7), não erro de algoritmo
+        assert linha["erro_medio_posicao"] <= linha["erro_max_posicao"] and linha["erro_max_raio"] <= linha["erro_max_posicao"] # Coerência
+    exata = esfera("vetorizado", "icosaedro").relatorio_erro_precisao() # float64 contra si mesmo
+    assert all(linha["erro_max_posicao"] == linha["erro_max_raio"] == 0.0 for linha in exata) # Sem erro
+
+@pytest.mark.parametrize("retencao", [True, False, -1, 1.5, "nenhum"]) # Valores que não são política nem limite em bytes
+def test_retencao_invalida(retencao): # bool é subclasse de int, mas não é um limite em bytes
+    with pytest.raises(ValueError): # Recusada já no construtor
+        SubdivisaoLoopEsfera(1, preguicoso=True, retencao=retencao) # Nada é calculado
+
+def lote_perturbado(base, num_malhas=3) -> np.ndarray: # B cópias da malha base com posições diferentes
+    deslocamentos = 0.1 * np.random.default_rng(1).standard_normal((num_malhas,) + base.vertices.shape) # Reprodutível
+    return base.vertices[np.newaxis] + deslocamentos # (B, N, 3)
+
+@pytest.mark.parametrize("normalizar", [False, True]) # Operador linear único ou projeção a cada passo
+@pytest.mark.parametrize("base", ["icosaedro", "grade"]) # Fechada e com borda
+def test_lote_equivale_a_cada_malha(base, normalizar): # Cada fatia (N, 3) do lote contra 'subdividir' malha a malha
+    pytest.importorskip("scipy") # O lote usa o operador esparso
+    malha = MALHAS_BASE[base]() # Conectividade comum
+    lote = lote_perturbado(malha) # (B, N, 3)
+    esfera = SubdivisaoLoopEsfera(NIVEIS, normalizar_cada_passo=normalizar, preguicoso=True) # Nada calculado no construtor
+    vertices, faces = esfera.subdividir_lote(lote, malha.faces) # Todas as malhas de uma vez
+    assert vertices.shape[0] == len(lote) # Uma saída por malha
+    for b, posicoes in enumerate(lote): # Malha a malha
+        individual = SubdivisaoLoopEsfera(NIVEIS, normalizar_cada_passo=normalizar, malha_base=Malha(posicoes, malha.faces), # Mesma conectividade
+                                          instrumentacao=Instrumentacao(silencioso=True)).obter_malha(NIVEIS) # Motor vetorizado
+        assert np.array_equal(faces, individual.faces) # Mesma topologia e ordem
+        assert np.allclose(vertices[b], individual.vertices, rtol=0, atol=1e-12), f"malha {b} diferente" # Mesmas posições
+
+@pytest.mark.parametrize("vertices,faces", [ # Entradas inconsistentes
+    (np.zeros((12, 3)), Malha.gerar_icosaedro().faces), # Sem a dimensão do lote
+    (np.zeros((2, 12, 2)), Malha.gerar_icosaedro().faces), # Duas coordenadas por vértice
+    (np.zeros((2, 12, 3)), Malha.gerar_icosaedro().faces.reshape(-1)), # Faces achatadas
+    (np.zeros((2, 10, 3)), Malha.gerar_icosaedro().faces), # Faces de uma malha com mais vértices
+    (np.zeros((2, 12, 3)), Malha.gerar_icosaedro().faces - 1), # Índice negativo
+])
+def test_lote_formatos_invalidos(vertices, faces): # Erro explícito antes de qualquer cálculo
+    with pytest.raises(ValueError, match="Esperado|referenciam"): # Mensagem da validação
+        SubdivisaoLoopEsfera(1, preguicoso=True).subdividir_lote(vertices, faces) # Nenhum operador construído
+
+@pytest.mark.parametrize("acesso", ["malhas", "obter_malha", "iterar_niveis"]) # Percursos fora e dentro de 'iterar_niveis'
+def test_paralelo_um_pool_por_percurso(monkeypatch, acesso): # Nenhum pool novo a cada nível
+    criados = [] # Pools abertos durante o percurso
+    class PoolContado(subdivisao_loop.ProcessPoolExecutor): # Mesmo pool, com contagem
+        def __init__(self, *argumentos, **opcoes): # Registra cada criação
+            criados.append(self) # Um item por pool
+            super().__init__(*argumentos, **opcoes) # Pool real
+    monkeypatch.setattr(subdivisao_loop, "ProcessPoolExecutor", PoolContado) # Usado por '_pool_paralelo'
+    objeto = SubdivisaoLoopEsfera(NIVEIS, motor="paralelo", num_processos=2, preguicoso=True, retencao="ultimo", # Níveis recalculados a cada acesso
+                                  instrumentacao=Instrumentacao(silencioso=True)) # Sem saída no console
+    malhas = {"malhas": lambda: objeto.malhas, "obter_malha": lambda: [objeto.obter_malha()], # Todos os níveis ou só o último
+              "iterar_niveis": lambda: list(objeto.iterar_niveis())}[acesso]() # Gerador consumido por inteiro
+    assert len(criados) == 1 and objeto._executor is None # Um pool para todo o percurso, encerrado ao final
+    esperada = esfera("vetorizado", "icosaedro").obter_malha() # Mesmo resultado do motor serial
+    assert np.allclose(malhas[-1].vertices, esperada.vertices, rtol=0, atol=1e-12) and np.array_equal(malhas[-1].faces, esperada.faces) # Último nível